@@ -0,0 +1 @@
+"""Benchmarks for the Marp slide generator pipeline."""
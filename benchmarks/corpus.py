@@ -0,0 +1,97 @@
+"""Deterministic synthetic markdown corpus for benchmarks.
+
+The generated content mimics decks like example/cursor_chat_history.md:
+mixed Japanese/English headings and bullets, fenced code, tables, Mermaid
+diagrams, images and explicit `---` page breaks.
+"""
+
+import random
+from typing import Callable, List
+
+CJK_WORDS = [
+    "桃太郎", "きびだんご", "鬼ヶ島", "システム", "設計", "要件定義", "非同期処理",
+    "パフォーマンス", "チーム", "リソース", "成功要因", "教訓", "拡張性", "宝物",
+]
+LATIN_WORDS = [
+    "system", "design", "microservices", "scalability", "pipeline", "latency",
+    "throughput", "resource", "strategy", "observer", "singleton", "deploy",
+]
+LANGUAGES = ["python", "javascript", "yaml"]
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    parts = []
+    for _ in range(words):
+        pool = CJK_WORDS if rng.random() < 0.5 else LATIN_WORDS
+        parts.append(rng.choice(pool))
+    return " ".join(parts)
+
+
+def _heading(rng: random.Random) -> List[str]:
+    return [f"# {_phrase(rng, 3)}", f"## {_phrase(rng, 2)}", ""]
+
+
+def _bullets(rng: random.Random) -> List[str]:
+    lines = [f"- **{_phrase(rng, 1)}**: {_phrase(rng, rng.randint(3, 8))}"
+             for _ in range(rng.randint(3, 6))]
+    return lines + [""]
+
+
+def _paragraph(rng: random.Random) -> List[str]:
+    return [_phrase(rng, rng.randint(8, 20)), ""]
+
+
+def _fence(rng: random.Random) -> List[str]:
+    language = rng.choice(LANGUAGES)
+    body = [f"    value_{i} = \"{_phrase(rng, 2)}\"" for i in range(rng.randint(3, 8))]
+    return [f"```{language}", f"def step_{rng.randint(1, 99)}():"] + body + ["```", ""]
+
+
+def _table(rng: random.Random) -> List[str]:
+    lines = ["| 項目 | Metric | Value |", "|------|--------|-------|"]
+    for _ in range(rng.randint(2, 5)):
+        lines.append(f"| {_phrase(rng, 1)} | {_phrase(rng, 1)} | {rng.randint(1, 1000)} |")
+    return lines + [""]
+
+
+def _mermaid(rng: random.Random) -> List[str]:
+    nodes = rng.randint(3, 6)
+    lines = ["```mermaid", "graph TD"]
+    for i in range(nodes - 1):
+        lines.append(f"    N{i}[\"{_phrase(rng, 1)}\"] --> N{i + 1}")
+    return lines + ["```", ""]
+
+
+def _image(rng: random.Random) -> List[str]:
+    return [f"![{_phrase(rng, 1)}](assets/figure{rng.randint(1, 20)}.png)", ""]
+
+
+def _page_break(rng: random.Random) -> List[str]:
+    return ["---", ""]
+
+
+# (weight, block builder) pairs; headings and page breaks keep pages realistic
+BLOCKS: List = [
+    (3, _heading),
+    (5, _bullets),
+    (3, _paragraph),
+    (2, _fence),
+    (2, _table),
+    (1, _mermaid),
+    (1, _image),
+    (2, _page_break),
+]
+
+
+def generate_corpus(lines: int, seed: int = 0) -> str:
+    """Return roughly `lines` lines of synthetic slide markdown (deterministic per seed)."""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in BLOCKS]
+    builders: List[Callable] = [builder for _, builder in BLOCKS]
+    
+    output = ["# Benchmark Deck", ""]
+    while len(output) < lines:
+        builder = rng.choices(builders, weights)[0]
+        output.extend(builder(rng))
+    
+    return "\n".join(output)
@@ -0,0 +1,127 @@
+"""Stdlib-only timing harness for the slide generator pipeline."""
+
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Make the package importable the same way the CLI scripts do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from marp_slide_generator import MarpFormatter, PageSplitter, SlideGenerator
+from marp_slide_generator.regenerator import SlideRegenerator
+from marp_slide_generator.tests.slide_validator import SlideValidator
+
+THEME = "gaia"
+
+
+def time_call(func: Callable[[], object], repeat: int = 3,
+              setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Run func `repeat` times and return min/mean/max wall time in seconds."""
+    # One untimed run so caches and lazy imports don't land in the first sample
+    if setup is not None:
+        setup()
+    func()
+    
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "mean": sum(timings) / len(timings),
+        "max": max(timings),
+    }
+
+
+def measure_peak_memory(func: Callable[[], object]) -> int:
+    """Peak bytes traced by tracemalloc while func runs."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return peak - baseline
+
+
+class PipelineBenchmarks:
+    """Benchmarks for one corpus, sharing a scratch directory."""
+    
+    def __init__(self, content: str, workdir: Path):
+        self.content = content
+        self.workdir = workdir
+        self.splitter = PageSplitter()
+        self.formatter = MarpFormatter()
+        self.pages = self.splitter.split_content(content)
+        # A generated deck that regenerate/validate benchmarks run against
+        self.deck_dir = workdir / "deck"
+        SlideGenerator(str(workdir), "deck").generate_slides(content, THEME)
+        self.page_paths = [str(p / "page.md") for p in SlideRegenerator().get_slide_folders(self.deck_dir)]
+    
+    def split_content(self):
+        self.splitter.split_content(self.content)
+    
+    def format_page(self):
+        total = len(self.pages)
+        for i, page in enumerate(self.pages, 1):
+            self.formatter.format_page(page, page_number=i, total_pages=total, theme=THEME)
+    
+    def format_master_slide(self):
+        self.formatter.format_master_slide(self.page_paths, THEME)
+    
+    def generate_slides(self):
+        SlideGenerator(str(self.workdir), "generated").generate_slides(self.content, THEME)
+    
+    def regenerate_all(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            SlideRegenerator().regenerate_all(str(self.deck_dir), THEME)
+    
+    def validate_all(self):
+        SlideValidator(str(self.deck_dir)).validate_all()
+    
+    def cases(self) -> Dict[str, Callable[[], None]]:
+        return {
+            "PageSplitter.split_content": self.split_content,
+            "MarpFormatter.format_page": self.format_page,
+            "MarpFormatter.format_master_slide": self.format_master_slide,
+            "SlideGenerator.generate_slides": self.generate_slides,
+            "SlideRegenerator.regenerate_all": self.regenerate_all,
+            "SlideValidator.validate_all": self.validate_all,
+        }
+
+
+def run_benchmarks(content: str, repeat: int = 3, only: Optional[List[str]] = None,
+                   memory: bool = False) -> Dict[str, Dict[str, float]]:
+    """Time every pipeline stage on content and return {benchmark: timings}.
+
+    With memory=True each benchmark also gets a `peak_bytes` entry from a
+    separate traced run, so tracing overhead does not skew the timings.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="marp-bench-"))
+    try:
+        bench = PipelineBenchmarks(content, workdir)
+        results = {}
+        for name, func in bench.cases().items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = time_call(func, repeat)
+            if memory:
+                results[name]["peak_bytes"] = measure_peak_memory(func)
+        results["_meta"] = {"pages": len(bench.pages), "bytes": len(content.encode("utf-8"))}
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
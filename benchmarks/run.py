@@ -0,0 +1,136 @@
+"""Run the benchmark suite and compare against a stored baseline.
+
+Usage:
+    python -m benchmarks.run                        # default sizes, compare to baseline
+    python -m benchmarks.run --sizes 1000 1000000   # 1K to 1M line corpora
+    python -m benchmarks.run --save-baseline        # refresh benchmarks/baseline.json
+    python -m benchmarks.run --memory               # also enforce memory ceilings
+"""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from .corpus import generate_corpus
+from .harness import run_benchmarks
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_CEILINGS = Path(__file__).resolve().parent / "memory_ceilings.json"
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a message for every benchmark slower than baseline by more than threshold."""
+    regressions = []
+    for size, benchmarks in results["sizes"].items():
+        baseline_benchmarks = baseline.get("sizes", {}).get(size, {})
+        for name, timings in benchmarks.items():
+            if name.startswith("_") or name not in baseline_benchmarks:
+                continue
+            base = baseline_benchmarks[name]["min"]
+            current = timings["min"]
+            if base > 0 and current > base * (1 + threshold):
+                regressions.append(
+                    f"{name} @ {size} lines: {current * 1000:.1f} ms "
+                    f"(baseline {base * 1000:.1f} ms, +{(current / base - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def check_memory(results: Dict, ceilings: Dict) -> List[str]:
+    """Return a message for every benchmark whose peak memory exceeds its ceiling."""
+    failures = []
+    floor = ceilings.get("floor_bytes", 0)
+    for size, benchmarks in results["sizes"].items():
+        input_bytes = benchmarks["_meta"]["bytes"]
+        for name, timings in benchmarks.items():
+            ratio = ceilings["ratios"].get(name)
+            if ratio is None or "peak_bytes" not in timings:
+                continue
+            limit = floor + ratio * input_bytes
+            if timings["peak_bytes"] > limit:
+                failures.append(
+                    f"{name} @ {size} lines: peak {timings['peak_bytes'] / 1024 / 1024:.1f} MB "
+                    f"exceeds ceiling {limit / 1024 / 1024:.1f} MB ({ratio}x input + floor)"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Marp slide generator pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Corpus sizes in lines (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per benchmark; the minimum is compared (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Corpus generator seed (default: %(default)s)")
+    parser.add_argument("--only", nargs="+",
+                        help="Only run benchmarks whose name contains one of these strings")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="Baseline JSON to compare against (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before failing, as a fraction (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure peak memory and enforce the ceilings file")
+    parser.add_argument("--ceilings", default=str(DEFAULT_CEILINGS),
+                        help="Memory ceilings JSON (default: %(default)s)")
+    args = parser.parse_args()
+    
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    
+    for size in args.sizes:
+        content = generate_corpus(size, seed=args.seed)
+        benchmarks = run_benchmarks(content, repeat=args.repeat, only=args.only, memory=args.memory)
+        results["sizes"][str(size)] = benchmarks
+        
+        meta = benchmarks["_meta"]
+        print(f"\n📏 {size} lines ({meta['bytes']} bytes, {meta['pages']} pages)")
+        for name, timings in benchmarks.items():
+            if not name.startswith("_"):
+                line = f"   {name:<36} {timings['min'] * 1000:>10.2f} ms"
+                if "peak_bytes" in timings:
+                    line += f"   peak {timings['peak_bytes'] / 1024 / 1024:>8.2f} MB"
+                print(line)
+    
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    
+    regressions = []
+    if args.memory:
+        ceilings = json.loads(Path(args.ceilings).read_text(encoding="utf-8"))
+        regressions.extend(check_memory(results, ceilings))
+    
+    if args.save_baseline:
+        Path(args.baseline).write_text(output + "\n", encoding="utf-8")
+        print(f"\n💾 Saved baseline to {args.baseline}")
+    else:
+        baseline_path = Path(args.baseline)
+        if baseline_path.exists():
+            regressions.extend(compare(results, json.loads(baseline_path.read_text(encoding="utf-8")),
+                                       args.threshold))
+        else:
+            print(f"\n⚠️  No baseline at {baseline_path}; run with --save-baseline to create one")
+    
+    if regressions:
+        print(f"\n❌ REGRESSIONS ({len(regressions)})")
+        for regression in regressions:
+            print(f"   • {regression}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,27 @@
 """Marp Slide Generator - A tool for creating well-organized Marp presentations"""
 
-from .page_splitter import PageSplitter
-from .marp_formatter import MarpFormatter
-from .slide_generator import SlideGenerator
+import importlib
 
 __version__ = "0.1.0"
-__all__ = ["PageSplitter", "MarpFormatter", "SlideGenerator"] 
\ No newline at end of file
+__all__ = ["PageSplitter", "MarpFormatter", "SlideGenerator"]
+
+# Public names are loaded on first access (PEP 562) so that importing the
+# package, e.g. from a CLI that only talks to marp-daemon, stays cheap
+_LAZY_ATTRIBUTES = {
+    "PageSplitter": ".page_splitter",
+    "MarpFormatter": ".marp_formatter",
+    "SlideGenerator": ".slide_generator",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
\ No newline at end of file
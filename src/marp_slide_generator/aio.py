@@ -0,0 +1,62 @@
+"""
+Async Support Module
+Shared I/O thread pool and deck concurrency limit for the *_async APIs
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+# File I/O from all async calls goes through one bounded pool
+IO_WORKERS = 8
+# Pages written per I/O task, so large decks don't flood the pool
+IO_BATCH = 16
+# Decks generated or regenerated at once per event loop
+MAX_CONCURRENT_BUILDS = 4
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_lock = threading.Lock()
+# One semaphore per event loop: asyncio primitives must not cross loops
+_build_slots: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+    weakref.WeakKeyDictionary()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """The shared bounded thread pool for file I/O"""
+    global _io_pool
+    with _io_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='marp-io')
+        return _io_pool
+
+
+def set_build_concurrency(limit: int):
+    """Change how many decks may build at once; applies to loops started afterwards"""
+    global MAX_CONCURRENT_BUILDS
+    if limit < 1:
+        raise ValueError("Build concurrency must be at least 1")
+    MAX_CONCURRENT_BUILDS = limit
+    _build_slots.clear()
+
+
+def build_slot() -> asyncio.Semaphore:
+    """Semaphore that caps concurrent deck builds on the running loop"""
+    loop = asyncio.get_running_loop()
+    slot = _build_slots.get(loop)
+    if slot is None:
+        slot = _build_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_BUILDS)
+    return slot
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Run a blocking file operation on the I/O pool"""
+    return await asyncio.get_running_loop().run_in_executor(io_executor(), func, *args)
+
+
+def batches(items: Sequence[T], size: int = IO_BATCH) -> List[Sequence[T]]:
+    """Split items into consecutive batches of at most size"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
\ No newline at end of file
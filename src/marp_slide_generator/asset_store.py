@@ -0,0 +1,233 @@
+"""
+Asset Store Module
+Content-addressed storage that deduplicates slide assets with hardlinks
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Union
+
+from .deck_layout import candidate_folders
+
+STORE_DIR = ".assets"
+INDEX_FILE = "assets.index.json"
+INDEX_VERSION = 1
+
+
+@dataclass
+class DedupeReport:
+    """What a dedupe pass found and changed"""
+    files: int = 0
+    stored: int = 0
+    linked: int = 0
+    symlinked: int = 0
+    bytes_saved: int = 0
+    replaced: int = 0   # stored blobs whose content no longer matched their digest
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """sha256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetStore:
+    """Shared blobs under <store>/<sha256>, linked from each slide's assets/
+
+    The deck keeps an index (assets.index.json) of every asset file with
+    its digest, size and mtime, plus the mtime of each assets/ directory,
+    so validators can list assets without re-walking unchanged folders.
+
+    Blobs are made read-only: a hardlinked asset shares its blob's inode,
+    so editing it in place would change every copy. A blob that changed
+    anyway is detected before anything is linked to it, and replaced.
+    """
+    
+    def __init__(self, presentation_dir: Union[str, Path], store_dir: Optional[Union[str, Path]] = None):
+        self.presentation_dir = Path(presentation_dir)
+        self.store_dir = Path(store_dir) if store_dir else self.presentation_dir / STORE_DIR
+        self.assets: Dict[str, dict] = {}
+        self.directories: Dict[str, int] = {}
+    
+    @classmethod
+    def open(cls, presentation_dir: Union[str, Path]) -> Optional['AssetStore']:
+        """Load a deck's store index, or None if the deck has never been deduplicated
+
+        An unreadable, corrupt or unsupported index also gives None, with a
+        warning, so callers fall back to scanning the deck.
+        """
+        presentation_dir = Path(presentation_dir)
+        index_file = presentation_dir / INDEX_FILE
+        if not index_file.exists():
+            return None
+        try:
+            data = json.loads(index_file.read_text(encoding='utf-8'))
+            if data.get('version') != INDEX_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            store = cls(presentation_dir, presentation_dir / data['store'])
+            store.assets = dict(data['assets'])
+            store.directories = dict(data['directories'])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            warnings.warn(f"Ignoring asset index {index_file}: {e}", RuntimeWarning)
+            return None
+        return store
+    
+    def save(self):
+        """Write the deck's asset index"""
+        store_path = os.path.relpath(self.store_dir, self.presentation_dir)
+        (self.presentation_dir / INDEX_FILE).write_text(json.dumps({
+            'version': INDEX_VERSION,
+            'store': store_path.replace('\\', '/'),
+            'directories': self.directories,
+            'assets': self.assets,
+        }, ensure_ascii=False, indent=1), encoding='utf-8')
+    
+    def asset_dirs(self) -> Iterator[Path]:
+        """Every assets/ directory in the deck, outside the store itself"""
+        for assets_dir in self.presentation_dir.rglob("assets"):
+            if assets_dir.is_dir() and self.store_dir not in assets_dir.parents:
+                yield assets_dir
+    
+    def _relative(self, path: Path) -> str:
+        return str(path.relative_to(self.presentation_dir)).replace('\\', '/')
+    
+    def _digest(self, path: Path, stat: os.stat_result) -> str:
+        """Digest of an asset, reusing the indexed one when size and mtime still match"""
+        entry = self.assets.get(self._relative(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        return file_digest(path)
+    
+    def dedupe(self, dry_run: bool = False) -> DedupeReport:
+        """Move every asset into the store and replace copies with links"""
+        report = DedupeReport()
+        if not dry_run:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+        assets = {}
+        seen: Set[str] = set()
+        intact: Dict[str, bool] = {}
+        # Linked assets share their blob's inode, so an unchanged blob still
+        # has the size and mtime recorded for them
+        known = {(entry['sha256'], entry['size'], entry['mtime_ns']) for entry in self.assets.values()}
+        
+        for assets_dir in sorted(self.asset_dirs()):
+            for asset in sorted(assets_dir.iterdir()):
+                if not asset.is_file():
+                    continue
+                report.files += 1
+                stat = asset.stat()
+                digest = self._digest(asset, stat)
+                blob = self.store_dir / digest
+                if digest not in intact:
+                    intact[digest] = self._intact(blob, digest, known)
+                    if not intact[digest] and blob.exists():
+                        # Edited through a link: never link more copies to it
+                        report.replaced += 1
+                        if not dry_run:
+                            blob.unlink()
+                
+                if not intact[digest] and digest not in seen:
+                    # First copy becomes the stored blob
+                    seen.add(digest)
+                    if not dry_run:
+                        self._store(asset, blob)
+                    report.stored += 1
+                elif asset.is_symlink() or (blob.exists() and os.path.samefile(asset, blob)):
+                    pass  # already linked to the store
+                else:
+                    report.bytes_saved += stat.st_size
+                    if dry_run:
+                        report.linked += 1
+                    elif self._link(blob, asset):
+                        report.linked += 1
+                    else:
+                        report.symlinked += 1
+                
+                if not dry_run:
+                    stat = asset.stat()
+                assets[self._relative(asset)] = {
+                    'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns
+                }
+        
+        if not dry_run:
+            self.assets = assets
+            # Directory mtimes are taken after linking, which replaces entries
+            self.directories = {self._relative(d): d.stat().st_mtime_ns for d in self.asset_dirs()}
+            self.save()
+        return report
+    
+    def _intact(self, blob: Path, digest: str, known: Set[tuple]) -> bool:
+        """Whether blob exists and still holds the content named by digest
+
+        A blob whose size and mtime match an indexed asset with that digest
+        is trusted; any other blob is hashed again.
+        """
+        try:
+            stat = blob.stat()
+        except FileNotFoundError:
+            return False
+        if (digest, stat.st_size, stat.st_mtime_ns) in known:
+            return True
+        return file_digest(blob) == digest
+    
+    def _store(self, asset: Path, blob: Path):
+        """Add an asset's content to the store without copying when possible
+
+        The blob is made read-only, and so is the asset when it is a hardlink.
+        """
+        try:
+            os.link(asset, blob)
+        except OSError:
+            shutil.copy2(asset, blob)
+        os.chmod(blob, 0o444)
+    
+    def _link(self, blob: Path, asset: Path) -> bool:
+        """Replace asset with a hardlink to blob; returns False if a symlink was used"""
+        tmp_path = asset.with_name(asset.name + '.tmp-link')
+        try:
+            os.link(blob, tmp_path)
+            hardlink = True
+        except OSError:
+            # Store on another filesystem: fall back to a relative symlink
+            os.symlink(os.path.relpath(blob, asset.parent), tmp_path)
+            hardlink = False
+        os.replace(tmp_path, asset)
+        return hardlink
+    
+    def asset_names(self) -> Set[str]:
+        """Asset paths relative to their slide folder (e.g. 'assets/logo.png')
+
+        Uses the index for assets/ directories whose mtime is unchanged and
+        lists only directories that changed or are new since the last dedupe.
+        """
+        indexed: Dict[str, list] = {}
+        for path in self.assets:
+            directory, _, name = path.rpartition('/')
+            indexed.setdefault(directory, []).append(name)
+        
+        # Indexed directories, plus slide folders that got assets/ since
+        candidates = dict.fromkeys(self.directories)
+        for child in candidate_folders(self.presentation_dir):
+            if child != self.store_dir and (child / "assets").is_dir():
+                candidates.setdefault(self._relative(child / "assets"))
+        
+        names = set()
+        for key in candidates:
+            assets_dir = self.presentation_dir / key
+            try:
+                mtime_ns = assets_dir.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if self.directories.get(key) == mtime_ns:
+                names.update(f"assets/{name}" for name in indexed.get(key, ()))
+            else:
+                names.update(f"assets/{asset.name}" for asset in assets_dir.iterdir() if asset.is_file())
+        return names
\ No newline at end of file
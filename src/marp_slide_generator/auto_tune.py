@@ -0,0 +1,389 @@
+"""
+Auto Tune Module
+Sweeps PageSplitter limits against the validator's slide-length checks without regenerating
+"""
+
+import re
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .limits import (
+    CODE_BLOCK_WEIGHT, HEADING_WEIGHT, IMAGE_WEIGHT, MAX_CHARS, MAX_CODE_CONTENT_LINES,
+    MAX_CONTENT_LINES, MAX_LINES, TABLE_WEIGHT,
+)
+from .marp_formatter import MarpFormatter
+from .page_splitter import CODE_BLOCK, TABLE, TABLE_HEADER_LINES, PageSplitter, Source, iter_lines
+
+if TYPE_CHECKING:
+    from .layout import LayoutEstimator
+
+DEFAULT_LINE_GRID = range(8, 21)
+DEFAULT_CHAR_GRID = range(400, 1001, 100)
+
+_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+_HEADING = re.compile(r'^#+\s')
+
+# How MarpFormatter._enhance_formatting treats a line when spacing a page
+_OTHER, _BLANK, _TITLE, _OPENER = range(4)
+
+
+def _spacing_kind(line: str) -> int:
+    """Title lines get a blank line after, openers one before, and blank runs collapse"""
+    if line.startswith('# '):
+        return _TITLE
+    if line.startswith('## ') or line.startswith('```'):
+        return _OPENER
+    return _OTHER if line.strip() else _BLANK
+
+
+@dataclass
+class TuneResult:
+    """Predicted outcome of splitting with one pair of page limits"""
+    max_lines_per_page: int
+    max_chars_per_page: int
+    pages: int = 0
+    errors: int = 0
+    warnings: int = 0
+
+
+class _PagePrefixes:
+    """Prefix sums of the validator's per-line measures over the whole input
+
+    The validator tracks code blocks per page, so a line's weight depends
+    on whether an odd number of fences precede it within its page. Two
+    weight sums are kept, one for pages that start with an even fence
+    count before them and one for odd, which makes any page's weight a
+    single subtraction.
+
+    The validator measures page.md as written, after _enhance_formatting
+    has spaced it. That spacing only ever depends on a line and the one
+    before it, so its effect on the character count is summed here as
+    well, and _EdgeRepairs corrects it at page edges. Edge lines are
+    classified as they appear in the input, before page() strips them, so
+    one that only starts or stops being a heading once stripped (an
+    indented '# ' or a bare '## ') is off by the blank line spacing gives it.
+    """
+    
+    def __init__(self, source: Source, layout: Optional['LayoutEstimator'] = None):
+        self.weights = (array('d', [0.0]), array('d', [0.0]))
+        self.content = (array('d', [0.0]), array('d', [0.0]))
+        self.fences = array('l', [0])
+        self.ticks = array('l', [0])
+        self.images = array('l', [0])
+        self.chars = array('q', [0])
+        self.spacing = array('q', [0])
+        # Per line: spacing kind, the blank line spacing puts before it, and the
+        # width page() strips off it when it is a page's first or last line
+        self.kinds = array('B')
+        self.gaps = array('B')
+        self.lead = array('q')
+        self.trail = array('q')
+        self.layout = layout
+        # Inserted blank lines add a newline, which a layout's widths leave out
+        self.spacer = 0 if layout else 1
+        
+        weight = [0.0, 0.0]
+        content = [0.0, 0.0]
+        fences = ticks = images = chars = spacing = 0
+        previous = None
+        for line in iter_lines(source):
+            outside, inside, plain, fence, tick, image = self.measure(line)
+            # Inside a code block for pages starting at even parity iff fences is odd
+            odd = fences & 1
+            weight[0] += inside if odd else outside
+            weight[1] += outside if odd else inside
+            content[0] += 0 if odd else plain
+            content[1] += plain if odd else 0
+            fences += fence
+            ticks += tick
+            images += image
+            step = layout.width(line) if layout else len(line) + 1
+            chars += step
+            kind = _spacing_kind(line)
+            gap = 0
+            if kind == _TITLE:
+                spacing += self.spacer
+            elif kind == _OPENER and previous in (_OTHER, _OPENER):
+                gap = self.spacer
+                spacing += gap
+            elif kind == _BLANK and previous in (_TITLE, _BLANK):
+                # Collapsed into the blank line before it
+                spacing -= step
+            previous = kind
+            self.kinds.append(kind)
+            self.gaps.append(gap)
+            self.lead.append(self.width(line[:len(line) - len(line.lstrip())]))
+            self.trail.append(self.width(line[len(line.rstrip()):]))
+            self.weights[0].append(weight[0])
+            self.weights[1].append(weight[1])
+            self.content[0].append(content[0])
+            self.content[1].append(content[1])
+            self.fences.append(fences)
+            self.ticks.append(ticks)
+            self.images.append(images)
+            self.chars.append(chars)
+            self.spacing.append(spacing)
+    
+    def width(self, text: str) -> int:
+        """Characters of text as the validator counts them"""
+        return self.layout.width(text) if self.layout else len(text)
+    
+    def measure(self, line: str):
+        """(weight outside code, weight inside code, content lines, fence, backtick runs, images) of a line
+
+        Like the validator, code blocks are counted from every ``` in the
+        text and images from every match, not from the lines holding them.
+        """
+        stripped = line.strip()
+        if not stripped:
+            return 0.0, 0.0, 0, 0, 0, 0
+        ticks = line.count('```')
+        images = len(_IMAGE.findall(line))
+        if stripped.startswith('```'):
+            return 0.5, 0.5, 0, 1, ticks, images
+        if _IMAGE.match(line):
+            return IMAGE_WEIGHT, CODE_BLOCK_WEIGHT, 0, 0, ticks, images
+        if '|' in line and line.count('|') >= 2:
+            return TABLE_WEIGHT, CODE_BLOCK_WEIGHT, 0, 0, ticks, images
+        wraps = self.layout.wrapped_lines(line) if self.layout else 1
+        if _HEADING.match(line):
+            return HEADING_WEIGHT * wraps, CODE_BLOCK_WEIGHT, 0, 0, ticks, images
+        return wraps, CODE_BLOCK_WEIGHT, wraps, 0, ticks, images
+
+
+class _EdgeRepairs:
+    """What page() adds and strips at page edges contributes, per block and per page
+
+    A page starting inside a table gains its header rows; one starting
+    inside a code block gains an opening fence and sees its first lines as
+    code, and one ending inside gains a closing fence. The page's outer
+    lines lose their surrounding whitespace, and its first line no longer
+    follows the line before it, which changes how it is spaced.
+    """
+    
+    def __init__(self, index, prefixes: _PagePrefixes):
+        self.index = index
+        self.prefixes = prefixes
+        self.head_weight, self.head_content, self.head_chars = array('d'), array('d'), array('q')
+        self.tail_weight, self.tail_chars = array('d'), array('q')
+        self.head_ticks, self.head_images = array('l'), array('l')
+        self.tail_ticks, self.tail_images = array('l'), array('l')
+        self.code, self.tail_opener = array('B'), array('B')
+        p = prefixes
+        for start, end, kind in zip(index.block_starts, index.block_ends, index.block_kinds):
+            # Blocks never follow an open fence, so prefixes at even parity measure them outside code
+            head = start + (TABLE_HEADER_LINES if kind == TABLE else 1)
+            self.head_weight.append(p.weights[0][head] - p.weights[0][start])
+            self.head_content.append(p.content[0][head] - p.content[0][start])
+            # Repeated rows open the page: the first is stripped and spaced as if nothing precedes it
+            self.head_chars.append(p.chars[head] - p.chars[start] + p.spacing[head] - p.spacing[start] -
+                                   p.gaps[start] - p.lead[start])
+            self.head_ticks.append(p.ticks[head] - p.ticks[start])
+            self.head_images.append(p.images[head] - p.images[start])
+            code = kind == CODE_BLOCK
+            closing = end - 1
+            self.tail_weight.append(p.weights[0][end] - p.weights[0][closing] if code else 0.0)
+            self.tail_chars.append(p.chars[end] - p.chars[closing] - p.trail[closing] if code else 0)
+            self.tail_ticks.append(p.ticks[end] - p.ticks[closing] if code else 0)
+            self.tail_images.append(p.images[end] - p.images[closing] if code else 0)
+            self.tail_opener.append(code and p.kinds[closing] == _OPENER)
+            self.code.append(code)
+    
+    def page(self, first: int, last: int, after_front_matter: bool = False):
+        """(starts in code, weight, content lines, chars, backtick runs, images) added to page [first, last)"""
+        p = self.prefixes
+        in_code = False
+        weight = content = 0.0
+        chars = ticks = images = 0
+        k = self.index.cut_block(first)
+        if k >= 0:
+            in_code = bool(self.code[k])
+            weight, content, chars = self.head_weight[k], self.head_content[k], self.head_chars[k]
+            ticks, images = self.head_ticks[k], self.head_images[k]
+            follows_line = True
+        else:
+            chars -= p.lead[first]
+            follows_line = after_front_matter
+        # Spacing of the first line against what really precedes it on the page
+        chars -= p.gaps[first]
+        if follows_line and p.kinds[first] == _OPENER:
+            chars += p.spacer
+        k = self.index.cut_block(last)
+        if k >= 0 and self.code[k]:
+            weight += self.tail_weight[k]
+            chars += self.tail_chars[k]
+            ticks += self.tail_ticks[k]
+            images += self.tail_images[k]
+            if self.tail_opener[k] and p.kinds[last - 1] != _TITLE:
+                chars += p.spacer
+        else:
+            chars -= p.trail[last - 1]
+        return in_code, weight, content, chars, ticks, images
+    
+    def pages_numpy(self, first, last):
+        """page() over arrays of page bounds, the first page following front matter"""
+        p = self.prefixes
+        count = len(first)
+        kinds = np.frombuffer(p.kinds, dtype=np.uint8)
+        gaps = np.frombuffer(p.gaps, dtype=np.uint8).astype(np.int64)
+        lead = np.frombuffer(p.lead, dtype=np.int64)
+        trail = np.frombuffer(p.trail, dtype=np.int64)
+        after_front_matter = np.arange(count) == 0
+        if not len(self.code):
+            zeros = np.zeros(count)
+            in_code = np.zeros(count, dtype=bool)
+            chars = (-lead[first] - gaps[first] - trail[last - 1] +
+                     np.where(after_front_matter & (kinds[first] == _OPENER), p.spacer, 0))
+            integers = zeros.astype(np.int64)
+            return in_code, zeros, zeros, chars, integers, integers
+        starts = np.array(self.index.block_starts, dtype=np.int64)
+        ends = np.array(self.index.block_ends, dtype=np.int64)
+        code = np.array(self.code, dtype=bool)
+        
+        def cut_block(bounds):
+            k = np.maximum(np.searchsorted(starts, bounds, side='right') - 1, 0)
+            return k, (bounds > starts[k]) & (bounds < ends[k])
+        
+        def per_block(values, k, where, dtype=np.int64):
+            return np.where(where, np.array(values, dtype=dtype)[k], 0)
+        
+        k, head = cut_block(first)
+        in_code = head & code[k]
+        weight = per_block(self.head_weight, k, head, np.float64)
+        content = per_block(self.head_content, k, head, np.float64)
+        chars = per_block(self.head_chars, k, head) - np.where(head, 0, lead[first]) - gaps[first]
+        chars = chars + np.where((head | after_front_matter) & (kinds[first] == _OPENER), p.spacer, 0)
+        ticks = per_block(self.head_ticks, k, head)
+        images = per_block(self.head_images, k, head)
+        k, cut = cut_block(last)
+        tail = cut & code[k]
+        weight = weight + per_block(self.tail_weight, k, tail, np.float64)
+        chars = chars + per_block(self.tail_chars, k, tail) - np.where(tail, 0, trail[last - 1])
+        chars = chars + np.where(tail & np.array(self.tail_opener, dtype=bool)[k] & (kinds[last - 1] != _TITLE),
+                                 p.spacer, 0)
+        ticks = ticks + per_block(self.tail_ticks, k, tail)
+        images = images + per_block(self.tail_images, k, tail)
+        return in_code, weight, content, chars, ticks, images
+
+
+class SplitterTuner:
+    """Picks page limits for one input by predicting the validator's verdict
+
+    The splitter's line index and the validator's per-line measures are
+    computed once. Each candidate then costs one integer split pass plus
+    prefix-sum arithmetic per page. Only the scoring is vectorized with
+    NumPy when installed: the split itself is a greedy walk whose every
+    cut depends on the one before, so it stays a Python pass per candidate.
+    """
+    
+    def __init__(self, content: Source, theme: str = 'default',
+                 layout: Optional['LayoutEstimator'] = None):
+        self.layout = layout
+        self.index = PageSplitter(layout=layout).build_index(content)
+        self.prefixes = _PagePrefixes(content, layout)
+        # Marp front matter that format_page puts on the first page only
+        front_matter = MarpFormatter().format_page('', 1, 1, theme)
+        self.front_weight = sum(self.prefixes.measure(line)[0] for line in front_matter.split('\n'))
+        self.front_content = sum(self.prefixes.measure(line)[2] for line in front_matter.split('\n'))
+        self.front_chars = layout.text_width(front_matter) if layout else len(front_matter)
+        self.repairs = _EdgeRepairs(self.index, self.prefixes)
+    
+    def evaluate(self, max_lines_per_page: int, max_chars_per_page: int) -> TuneResult:
+        """Predicted page count and validator errors/warnings for one pair of limits"""
+        splitter = PageSplitter(max_lines_per_page, max_chars_per_page, self.layout)
+        spans = splitter.split_index(self.index)
+        result = TuneResult(max_lines_per_page, max_chars_per_page, pages=len(spans) // 2)
+        if np is not None:
+            self._score_numpy(spans, result)
+        else:
+            self._score(spans, result)
+        return result
+    
+    def _score(self, spans: array, result: TuneResult):
+        p = self.prefixes
+        newline = 0 if self.layout else 1
+        for n, (first, last) in enumerate(zip(spans[0::2], spans[1::2])):
+            in_code, extra_weight, extra_content, extra_chars, extra_ticks, extra_images = \
+                self.repairs.page(first, last, after_front_matter=n == 0)
+            # A re-opened fence makes the page's first lines code, as at even parity
+            odd = 0 if in_code else p.fences[first] & 1
+            weight = p.weights[odd][last] - p.weights[odd][first] + extra_weight
+            content = p.content[odd][last] - p.content[odd][first] + extra_content
+            chars = (p.chars[last] - p.chars[first] - newline + p.spacing[last] - p.spacing[first] +
+                     extra_chars)
+            if n == 0:
+                weight += self.front_weight
+                content += self.front_content
+                chars += self.front_chars
+            code_blocks = (p.ticks[last] - p.ticks[first] + extra_ticks) // 2
+            images = p.images[last] - p.images[first] + extra_images
+            
+            if weight > MAX_LINES:
+                result.errors += 1
+            elif weight > MAX_LINES * 0.9:
+                result.warnings += 1
+            if code_blocks >= 1 and content > MAX_CODE_CONTENT_LINES:
+                result.errors += 1
+            result.warnings += ((content > MAX_CONTENT_LINES) + (chars > MAX_CHARS) + (code_blocks > 1) +
+                                (images > 1))
+    
+    def _score_numpy(self, spans: array, result: TuneResult):
+        p = self.prefixes
+        bounds = np.array(spans, dtype=np.intp)
+        first, last = bounds[0::2], bounds[1::2]
+        counts = np.int64 if p.fences.itemsize == 8 else np.int32
+        fences = np.frombuffer(p.fences, dtype=counts)
+        in_code, extra_weight, extra_content, extra_chars, extra_ticks, extra_images = \
+            self.repairs.pages_numpy(first, last)
+        # A re-opened fence makes the page's first lines code, as at even parity
+        odd = (fences[first] & 1).astype(bool) & ~in_code
+        
+        def page_sums(pair):
+            even_sums, odd_sums = (np.frombuffer(prefix, dtype=np.float64) for prefix in pair)
+            return np.where(odd, odd_sums[last] - odd_sums[first], even_sums[last] - even_sums[first])
+        
+        weight = page_sums(p.weights) + extra_weight
+        content = page_sums(p.content) + extra_content
+        if len(weight):
+            weight[0] += self.front_weight
+            content[0] += self.front_content
+        ticks = np.frombuffer(p.ticks, dtype=counts)
+        code_blocks = (ticks[last] - ticks[first] + extra_ticks) // 2
+        images = np.frombuffer(p.images, dtype=counts)
+        page_images = images[last] - images[first] + extra_images
+        chars = np.frombuffer(p.chars, dtype=np.int64)
+        spacing = np.frombuffer(p.spacing, dtype=np.int64)
+        page_chars = (chars[last] - chars[first] - (0 if self.layout else 1) + spacing[last] - spacing[first] +
+                      extra_chars)
+        if len(page_chars):
+            page_chars[0] += self.front_chars
+        
+        result.errors = int(np.count_nonzero(weight > MAX_LINES) +
+                            np.count_nonzero((code_blocks >= 1) & (content > MAX_CODE_CONTENT_LINES)))
+        result.warnings = int(np.count_nonzero((weight > MAX_LINES * 0.9) & (weight <= MAX_LINES)) +
+                              np.count_nonzero(content > MAX_CONTENT_LINES) +
+                              np.count_nonzero(page_chars > MAX_CHARS) +
+                              np.count_nonzero(code_blocks > 1) +
+                              np.count_nonzero(page_images > 1))
+    
+    def sweep(self, line_grid: Iterable[int] = DEFAULT_LINE_GRID,
+              char_grid: Iterable[int] = DEFAULT_CHAR_GRID) -> List[TuneResult]:
+        """Evaluate every (max_lines, max_chars) pair of the grid"""
+        char_grid = list(char_grid)
+        return [self.evaluate(max_lines, max_chars) for max_lines in line_grid for max_chars in char_grid]
+    
+    @staticmethod
+    def best(results: List[TuneResult]) -> TuneResult:
+        """Fewest predicted errors, then warnings, then pages; ties keep the defaults"""
+        defaults = PageSplitter()
+        return min(results, key=lambda r: (
+            r.errors, r.warnings, r.pages,
+            (r.max_lines_per_page, r.max_chars_per_page) != (defaults.max_lines_per_page,
+                                                              defaults.max_chars_per_page),
+        ))
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Build Cache Module
+Skips whole-deck generation when input and settings match a still-intact earlier build
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .result_cache import ResultCache, cache_key
+
+# Manifests are small; this keeps thousands of builds
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Build cache location: $MARP_BUILD_CACHE or a per-user cache directory"""
+    env_path = os.environ.get('MARP_BUILD_CACHE')
+    if env_path:
+        return Path(env_path)
+    return Path.home() / '.cache' / 'marp-slide-generator' / 'builds'
+
+
+def snapshot(output_dir: Union[str, Path]) -> Dict[str, List[int]]:
+    """[size, mtime_ns] of every file under output_dir, by relative path"""
+    files = {}
+    for root, _, names in os.walk(output_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, output_dir).replace('\\', '/')] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+class BuildCache:
+    """Manifests of finished builds, keyed by input content and settings
+
+    The key covers the input, theme, PageSplitter limits, output directory
+    and package version. A lookup only hits when the output directory still
+    holds exactly the files the build wrote, with the same sizes and mtimes.
+    """
+    
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.results = ResultCache(cache_dir or default_cache_dir(), max_bytes)
+    
+    def key(self, content, theme: str, splitter, output_dir: Union[str, Path], **params) -> str:
+        return cache_key(content, theme, splitter, output_dir=str(Path(output_dir).resolve()), **params)
+    
+    def lookup(self, key: str, output_dir: Union[str, Path]) -> Optional[dict]:
+        """The build's manifest if its output is intact, else None"""
+        manifest = self.results.get(key)
+        if manifest is None or not Path(output_dir).is_dir():
+            return None
+        if snapshot(output_dir) != manifest['files']:
+            return None
+        return manifest
+    
+    def record(self, key: str, output_dir: Union[str, Path], page_count: int):
+        """Store the manifest of a build that just finished"""
+        manifest = {'page_count': page_count, 'files': snapshot(output_dir)}
+        # Replace a manifest whose output was changed since
+        self.results.discard(key)
+        self.results.put(key, lambda scratch: manifest)
\ No newline at end of file
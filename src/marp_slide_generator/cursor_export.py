@@ -0,0 +1,201 @@
+"""
+Cursor Export Module
+Streams a Cursor chat export and extracts the slide decks the assistant wrote
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+USER_MARKER = "**User**"
+ASSISTANT_MARKER = "**Cursor**"
+# Fence info strings that mark a block as markdown (and so a deck candidate)
+DECK_LANGUAGES = ('markdown', 'md', 'marp')
+# Characters read from the export at a time
+CHUNK_SIZE = 1 << 20
+
+# The only lines the scanner stops at: code fences and turn markers
+_EVENT = re.compile(r'^(?: {0,3}(`{3,}|~{3,})[ \t]*([^`\s]*)[^\n]*|[ \t]*\*\*(User|Cursor)\*\*[ \t]*)$',
+                    re.MULTILINE)
+# Inside a finished block: code fences and slide separators
+_DECK_EVENT = re.compile(r'^(?: {0,3}(`{3,}|~{3,})[ \t]*([^`\s]*)[^\n]*|[ \t]*(---)[ \t]*)$', re.MULTILINE)
+
+
+@dataclass
+class ExportDeck:
+    """A markdown deck found in an assistant turn"""
+    text: str
+    turn: int   # 1-based count of assistant turns
+    line: int   # line of the opening fence in the export
+
+
+def _is_deck(text: str) -> bool:
+    """A deck has at least one slide separator outside nested code blocks"""
+    depth = 0
+    for match in _DECK_EVENT.finditer(text):
+        if match.group(3):
+            if not depth:
+                return True
+        elif match.group(2) or not depth:
+            # A bare fence at depth 0 opens an unlabeled block
+            depth += 1
+        else:
+            depth -= 1
+    return False
+
+
+class _Scanner:
+    """Fence and turn state of an export, fed complete lines in any number of pieces"""
+    
+    def __init__(self):
+        self.speaker = None
+        self.turn = 0
+        self.line = 1       # line number at the start of the next segment
+        self.block: Optional[List[str]] = None     # text of the open markdown block
+        self.pending: Optional[List[str]] = None   # text after a bare fence that may close it
+        self.pending_fence = ''
+        self.other = None   # (char, length) of an open non-markdown fence
+        self.outer = None   # (char, length) of the open markdown fence
+        self.depth = 0
+        self.start = 0
+    
+    def feed(self, segment: str) -> Iterator[ExportDeck]:
+        """Scan a segment that ends at a line boundary"""
+        pos = 0
+        for match in _EVENT.finditer(segment):
+            self._text(segment[pos:match.start()])
+            self.line += segment.count('\n', pos, match.start())
+            yield from self._event(match)
+            pos = match.end() + 1
+            self.line += 1
+        self._text(segment[pos:])
+        self.line += segment.count('\n', pos)
+    
+    def finish(self) -> Iterator[ExportDeck]:
+        """Resolve a deck whose closing fence was the last fence in the export"""
+        if self.pending is not None:
+            yield from self._close()
+    
+    def _text(self, text: str):
+        """Lines that are neither fences nor markers"""
+        if not text:
+            return
+        if self.pending is not None:
+            self.pending.append(text)
+        elif self.block is not None:
+            self.block.append(text)
+    
+    def _close(self) -> Iterator[ExportDeck]:
+        text = ''.join(self.block)[:-1]
+        if _is_deck(text):
+            yield ExportDeck(text, self.turn, self.start)
+        self.block = self.pending = None
+    
+    def _event(self, match) -> Iterator[ExportDeck]:
+        line = match.group(0)
+        speaker = match.group(3)
+        
+        if self.pending is not None:
+            fence, info = match.group(1), match.group(2)
+            if (not speaker and not info and fence[0] == self.outer[0] and
+                    len(fence) >= self.outer[1]):
+                # The pending fence opened an unlabeled block and this closes it
+                self.block.append(self.pending_fence)
+                self.block.extend(self.pending)
+                self.block.append(line + '\n')
+                self.pending = None
+                return
+            yield from self._close()
+        
+        if speaker:
+            self.speaker = speaker
+            if speaker == 'Cursor':
+                self.turn += 1
+            self.block, self.other, self.depth = None, None, 0
+            return
+        
+        char, length, info = match.group(1)[0], len(match.group(1)), match.group(2).lower()
+        if self.other is not None:
+            # Inside a non-markdown block: only its closing fence matters
+            if char == self.other[0] and length >= self.other[1] and not info:
+                self.other = None
+            return
+        
+        if self.block is None:
+            if info in DECK_LANGUAGES and self.speaker == 'Cursor':
+                self.block, self.depth, self.start = [], 0, self.line
+                self.outer = (char, length)
+            else:
+                self.other = (char, length)
+            return
+        
+        if char == self.outer[0] and length >= self.outer[1]:
+            if info:
+                self.depth += 1
+            elif self.depth:
+                self.depth -= 1
+            else:
+                self.pending, self.pending_fence = [], line + '\n'
+                return
+        self.block.append(line + '\n')
+
+
+def iter_decks(chunks: Iterable[str]) -> Iterator[ExportDeck]:
+    """Yield every deck in assistant turns, in order, from export text read piece by piece
+
+    chunks may be lines or arbitrary pieces of the export. Only the block
+    currently being read is held in memory, and the text between fences
+    is sliced out whole rather than examined line by line.
+
+    Decks usually nest code blocks inside a ```markdown fence that uses
+    the same number of backticks, so inside a deck block a fence with an
+    info string opens a nested block and a bare fence closes the innermost
+    open one. A bare fence at depth 0 either closes the deck or opens an
+    unlabeled block; it closes the deck unless the next fence after it is
+    bare as well. Longer outer fences are closed CommonMark-style by a
+    bare fence at least as long. A turn marker line abandons any
+    unterminated block.
+    """
+    scanner = _Scanner()
+    carry = ''
+    for chunk in chunks:
+        carry += chunk
+        cut = carry.rfind('\n') + 1
+        if cut:
+            yield from scanner.feed(carry[:cut])
+            carry = carry[cut:]
+    if carry:
+        yield from scanner.feed(carry + '\n')
+    yield from scanner.finish()
+
+
+def _read_chunks(path: Union[str, Path]) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter(lambda: f.read(CHUNK_SIZE), '')
+
+
+def extract_deck(path: Union[str, Path], select: Optional[int] = None) -> ExportDeck:
+    """The latest deck in an export, or deck number select (1-based, negative counts from the end)
+
+    Positive selections stop reading as soon as that deck is complete.
+    """
+    decks = iter_decks(_read_chunks(path))
+    if select is None:
+        select = -1
+    if select == 0:
+        raise ValueError("Deck numbers start at 1")
+    
+    if select > 0:
+        for count, deck in enumerate(decks, 1):
+            if count == select:
+                return deck
+        raise ValueError(f"Export has fewer than {select} decks: {path}")
+    
+    recent = deque(decks, maxlen=-select)
+    if len(recent) < -select:
+        if not recent:
+            raise ValueError(f"No markdown deck found in assistant turns: {path}")
+        raise ValueError(f"Export has fewer than {-select} decks: {path}")
+    return recent[0]
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Slide Daemon Module
+Keeps the generator loaded in a long-lived process behind a Unix socket
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+
+def default_socket_path() -> str:
+    """Socket path shared by the daemon and its clients"""
+    env_path = os.environ.get('MARP_DAEMON_SOCKET')
+    if env_path:
+        return env_path
+    import tempfile
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"marp-daemon-{uid}.sock")
+
+
+def _decode_buffer(value) -> str:
+    """json.dumps fallback: bytes-like values such as an mmap'd input are UTF-8 text"""
+    try:
+        return str(value, 'utf-8')
+    except TypeError:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _is_own_socket(path: str) -> bool:
+    """Whether path is a socket that only the current user owns and can use
+
+    The default path is in the shared temp directory, where another user
+    could create it first and read every request sent to it.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(info.st_mode) or info.st_mode & 0o077:
+        return False
+    return not hasattr(os, 'getuid') or info.st_uid == os.getuid()
+
+
+def request(message: dict, socket_path: Optional[str] = None, timeout: float = 300.0) -> Optional[dict]:
+    """Send one request to a running daemon
+
+    Returns the decoded response, or None when no daemon is listening, it
+    cannot be reached, its socket is not ours alone, or its reply is not
+    valid JSON, so callers can fall back to running in-process.
+    Bytes-like values in message are decoded only once connected, so a
+    caller with no daemon running never decodes its input.
+    """
+    path = socket_path or default_socket_path()
+    if not hasattr(socket, 'AF_UNIX') or not _is_own_socket(path):
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(message, default=_decode_buffer).encode('utf-8') + b'\n')
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        # Stale socket file left behind by a daemon that is gone, a socket
+        # we may not use, or a daemon that stopped answering
+        return None
+    
+    if not chunks:
+        return None
+    try:
+        return json.loads(b''.join(chunks))
+    except ValueError:
+        # Truncated or malformed reply
+        return None
+
+
+def generate_via_daemon(content: Union[str, bytes, 'mmap.mmap'], output_dir: str, presentation_name: Optional[str],
+                        theme: str, socket_path: Optional[str] = None,
+                        layout_aware: bool = False, use_cache: bool = False,
+                        cache_size: Optional[int] = None, shard_by: Optional[str] = None,
+                        chapter_size: Optional[int] = None, pipelined: bool = False) -> Optional[dict]:
+    """Ask a running daemon to generate slides; None if no daemon is running"""
+    return request({
+        'command': 'generate',
+        'content': content,
+        # Relative output paths are resolved against the client's directory
+        'output_dir': os.path.abspath(output_dir),
+        'presentation_name': presentation_name,
+        'theme': theme,
+        'layout_aware': layout_aware,
+        'use_cache': use_cache,
+        'cache_size': cache_size,
+        'shard_by': shard_by,
+        'chapter_size': chapter_size,
+        'pipelined': pipelined,
+    }, socket_path)
+
+
+def format_result(num_pages: int, output_dir: str, cache_hit: bool) -> str:
+    """Summary the CLIs print after a generate run, in a daemon or in-process"""
+    if cache_hit:
+        headline = f"✓ Up to date: {num_pages} slides in '{output_dir}' (build cache hit)"
+    else:
+        headline = f"✓ Successfully generated {num_pages} slides in '{output_dir}'"
+    return "\n".join([
+        headline,
+        f"  - Master slide: {output_dir}/master_slide.md",
+        f"  - Index: {output_dir}/index.md",
+        f"  - Slides: {output_dir}/",
+    ])
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Handles one newline-delimited JSON request per connection"""
+    
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line)
+            response = self.server.slide_daemon.dispatch(message)
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SlideDaemon:
+    """Serves generation requests with the package imported once"""
+    
+    def __init__(self, socket_path: Optional[str] = None):
+        # Import the heavy parts up front so requests never pay for them
+        from .slide_generator import SlideGenerator
+        from .page_splitter import PageSplitter
+        from .marp_formatter import MarpFormatter
+        from .layout import LayoutEstimator
+        from .build_cache import BuildCache
+        
+        self.socket_path = socket_path or default_socket_path()
+        self.splitter = PageSplitter()
+        self.formatter = MarpFormatter()
+        # Width-aware splitters per theme, for layout_aware requests
+        self.layout_splitters = {theme: PageSplitter(layout=LayoutEstimator.for_theme(theme))
+                                 for theme in self.formatter.themes}
+        self._generator_class = SlideGenerator
+        self._build_cache_class = BuildCache
+        # Builds that share an output directory must not interleave
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def dispatch(self, message: dict) -> dict:
+        command = message.get('command')
+        if command == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if command == 'shutdown':
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {'ok': True}
+        if command == 'generate':
+            return self._generate(message)
+        return {'ok': False, 'error': f"Unknown command: {command}"}
+    
+    def _generate(self, message: dict) -> dict:
+        generator = self._generator_class(message['output_dir'], message.get('presentation_name'))
+        # Reuse the already-constructed helpers instead of building new ones
+        theme = message.get('theme', 'default')
+        if message.get('layout_aware'):
+            generator.splitter = self.layout_splitters.get(theme, self.layout_splitters['default'])
+        else:
+            generator.splitter = self.splitter
+        generator.formatter = self.formatter
+        if message.get('shard_by'):
+            from .deck_layout import DEFAULT_CHAPTER_SIZE, Sharding
+            generator.sharding = Sharding(message['shard_by'], message.get('chapter_size') or DEFAULT_CHAPTER_SIZE)
+        generator.pipelined = bool(message.get('pipelined'))
+        if message.get('use_cache'):
+            cache_size = message.get('cache_size')
+            generator.build_cache = (self._build_cache_class(max_bytes=cache_size) if cache_size
+                                     else self._build_cache_class())
+        with self._lock:
+            report = generator.generate_slides_report(message['content'], theme)
+        return {'ok': True, 'num_pages': report.page_count, 'output_dir': str(generator.output_dir),
+                'report': report.to_dict()}
+    
+    def serve_forever(self):
+        """Listen on the socket until a shutdown request arrives"""
+        if request({'command': 'ping'}, self.socket_path, timeout=1.0):
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        # Create the socket owner-only: a chmod after bind() would leave it
+        # open to other users in between
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _DaemonServer(self.socket_path, _DaemonHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.slide_daemon = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
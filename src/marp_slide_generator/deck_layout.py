@@ -0,0 +1,97 @@
+"""
+Deck Layout Module
+Slide folder numbering and the optional chapter-NN/ sharded layout
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+# Slide and chapter numbers are zero-padded to at least this many digits
+MIN_WIDTH = 2
+SLIDE_FOLDER = re.compile(r'^(\d{2,})-')
+CHAPTER_FOLDER = re.compile(r'^chapter-\d{2,}$')
+DEFAULT_CHAPTER_SIZE = 100
+SHARD_MODES = ('headings', 'size')
+
+_TOP_HEADING = re.compile(r'#\s')
+
+
+def number_width(count: int) -> int:
+    """Digits that number count items with equal-width prefixes, so names sort in order"""
+    return max(MIN_WIDTH, len(str(count)))
+
+
+def slide_number(name: str) -> Optional[int]:
+    """The numeric prefix of a slide folder name, or None"""
+    match = SLIDE_FOLDER.match(name)
+    return int(match.group(1)) if match else None
+
+
+def candidate_folders(presentation_dir: Union[str, Path]) -> Iterator[Path]:
+    """Directories that may hold a slide: top-level ones and those one level inside chapter-NN/"""
+    for child in Path(presentation_dir).iterdir():
+        if not child.is_dir():
+            continue
+        if CHAPTER_FOLDER.match(child.name):
+            for folder in child.iterdir():
+                if folder.is_dir():
+                    yield folder
+        else:
+            yield child
+
+
+def slide_folders(presentation_dir: Union[str, Path]) -> List[Path]:
+    """NN-title slide folders in slide order, in a flat or sharded deck"""
+    folders = [folder for folder in candidate_folders(presentation_dir) if SLIDE_FOLDER.match(folder.name)]
+    folders.sort(key=lambda folder: slide_number(folder.name))
+    return folders
+
+
+def make_slide_folder(folder: Path) -> int:
+    """Create a slide folder with its assets/ directory; returns the number of directories made"""
+    folder.mkdir()
+    (folder / "assets").mkdir()
+    return 2
+
+
+def relative_folder(folder: Path, presentation_dir: Union[str, Path]) -> str:
+    """A slide folder as a '/'-separated path relative to its deck, e.g. 'chapter-01/003-intro'"""
+    return folder.relative_to(presentation_dir).as_posix()
+
+
+@dataclass
+class Sharding:
+    """Groups slide folders into chapter-NN/ directories
+
+    by='headings' starts a chapter at every page whose first line is a
+    top-level '# ' heading; by='size' puts each run of size slides in its
+    own chapter. Slide numbers stay global across chapters.
+    """
+    by: str = 'size'
+    size: int = DEFAULT_CHAPTER_SIZE
+    
+    def __post_init__(self):
+        if self.by not in SHARD_MODES:
+            raise ValueError(f"Unknown sharding mode: {self.by} (expected one of {', '.join(SHARD_MODES)})")
+        if self.size < 1:
+            raise ValueError("Chapter size must be at least 1")
+    
+    def chapters(self, pages: List[str]) -> List[int]:
+        """1-based chapter number of each page"""
+        if self.by == 'size':
+            return [i // self.size + 1 for i in range(len(pages))]
+        chapters = []
+        chapter = 0
+        for page in pages:
+            if not chapter or _TOP_HEADING.match(page.lstrip()):
+                chapter += 1
+            chapters.append(chapter)
+        return chapters
+    
+    def folder_names(self, names: List[str], pages: List[str]) -> List[str]:
+        """Slide folder names placed under their chapter directory"""
+        chapters = self.chapters(pages)
+        width = number_width(chapters[-1] if chapters else 1)
+        return [f"chapter-{chapter:0{width}d}/{name}" for chapter, name in zip(chapters, names)]
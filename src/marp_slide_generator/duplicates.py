@@ -0,0 +1,187 @@
+"""
+Duplicates Module
+SimHash index over normalized slide text for finding near-duplicate slides
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# Characters per shingle; character shingles also work for CJK text, which has no word breaks
+SHINGLE_SIZE = 4
+FINGERPRINT_BITS = 64
+# Fingerprints are cut into BANDS bands. Two that differ in at most
+# BANDS - 1 bits agree exactly on at least one band, so only slides that
+# share a band value are ever compared.
+BANDS = 8
+BAND_BITS = FINGERPRINT_BITS // BANDS
+MAX_DISTANCE = BANDS - 1
+# Slides with less normalized text than this are too short to compare
+MIN_CHARS = 24
+CACHE_VERSION = 1
+
+_FRONT_MATTER = re.compile(r'\A---\n.*?\n---\n', re.DOTALL)
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_NON_WORD = re.compile(r'[\W_]+')
+
+# Per-bit counters are packed into one integer, FIELD_BITS bits per counter,
+# so adding a shingle's bits to all 64 counters is a single addition
+_FIELD_BITS = 32
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+# _SPREAD[i][byte]: the counter increments for digest byte i having that value
+_SPREAD = [[sum(((byte >> bit) & 1) << (_FIELD_BITS * (8 * i + bit)) for bit in range(8)) for byte in range(256)]
+           for i in range(FINGERPRINT_BITS // 8)]
+
+
+def default_cache_dir() -> Path:
+    """Fingerprint cache location: $MARP_DUPLICATE_CACHE or a per-user cache directory"""
+    env_path = os.environ.get('MARP_DUPLICATE_CACHE')
+    if env_path:
+        return Path(env_path)
+    return Path.home() / '.cache' / 'marp-slide-generator' / 'duplicates'
+
+
+def normalize(text: str) -> str:
+    """Slide text without front matter, comments, markup, case or punctuation"""
+    text = _COMMENT.sub(' ', _FRONT_MATTER.sub('', text))
+    text = _LINK.sub(r'\1', unicodedata.normalize('NFKC', text))
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def fingerprint(text: str) -> Optional[int]:
+    """64-bit SimHash of the slide's character shingles, weighted by count; None if too short"""
+    text = normalize(text)
+    if len(text) < MIN_CHARS:
+        return None
+    shingles = Counter(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+    counters = 0
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=FINGERPRINT_BITS // 8).digest()
+        spread = 0
+        for table, byte in zip(_SPREAD, digest):
+            spread |= table[byte]
+        counters += spread * count
+    
+    total = sum(shingles.values())
+    result = 0
+    for bit in range(FINGERPRINT_BITS):
+        if ((counters >> (_FIELD_BITS * bit)) & _FIELD_MASK) * 2 > total:
+            result |= 1 << bit
+    return result
+
+
+def distance(a: int, b: int) -> int:
+    """Number of differing fingerprint bits"""
+    return bin(a ^ b).count('1')
+
+
+def similarity(a: int, b: int) -> float:
+    return 1 - distance(a, b) / FINGERPRINT_BITS
+
+
+@dataclass
+class DuplicateCluster:
+    """Slides linked by near-duplicate fingerprints, in deck order"""
+    slides: List[str]
+    similarity: List[float]   # of each slide to slides[0]
+
+
+class DuplicateFinder:
+    """Finds clusters of near-duplicate slides in a deck
+
+    Each slide is fingerprinted once with SimHash and the fingerprints are
+    bucketed by band, so a deck costs one pass plus the comparisons inside
+    shared buckets rather than every pair. Fingerprints are cached per deck
+    with the size and mtime of each page.md; later runs only rehash slides
+    whose page changed.
+    """
+    
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_distance: int = MAX_DISTANCE):
+        if max_distance > MAX_DISTANCE:
+            raise ValueError(f"max_distance can be at most {MAX_DISTANCE} with {BANDS} bands")
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_distance = max_distance
+        self.hashed = 0   # slides fingerprinted by the last call, rather than taken from the cache
+    
+    def cache_file(self, presentation_dir: Union[str, Path]) -> Path:
+        deck = str(Path(presentation_dir).resolve())
+        return self.cache_dir / f"{hashlib.sha256(deck.encode('utf-8')).hexdigest()[:32]}.json"
+    
+    def fingerprints(self, presentation_dir: Union[str, Path],
+                     folders: Iterable[Path]) -> Dict[str, Optional[int]]:
+        """Fingerprint of each folder's page.md by folder name, from the cache where it is current"""
+        cache_file = self.cache_file(presentation_dir)
+        try:
+            cached = json.loads(cache_file.read_text(encoding='utf-8'))
+            if cached.get('version') != CACHE_VERSION:
+                cached = {}
+        except (FileNotFoundError, ValueError):
+            cached = {}
+        slides = cached.get('slides', {})
+        
+        self.hashed = 0
+        entries = {}
+        for folder in folders:
+            page_file = folder / "page.md"
+            try:
+                stat = page_file.stat()
+            except FileNotFoundError:
+                continue
+            entry = slides.get(folder.name)
+            if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+                entry = [stat.st_size, stat.st_mtime_ns, fingerprint(page_file.read_text(encoding='utf-8'))]
+                self.hashed += 1
+            entries[folder.name] = entry
+        
+        if entries != slides:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            scratch = cache_file.with_name(f".tmp-{uuid.uuid4().hex}")
+            scratch.write_text(json.dumps({'version': CACHE_VERSION, 'slides': entries}), encoding='utf-8')
+            os.replace(scratch, cache_file)
+        return {name: entry[2] for name, entry in entries.items()}
+    
+    def find(self, presentation_dir: Union[str, Path], folders: Iterable[Path]) -> List[DuplicateCluster]:
+        """Clusters of slides within max_distance bits of another slide in the cluster"""
+        prints = {name: value for name, value in self.fingerprints(presentation_dir, folders).items()
+                  if value is not None}
+        
+        buckets: Dict[tuple, List[str]] = {}
+        for name, value in prints.items():
+            for band in range(BANDS):
+                key = (band, (value >> (band * BAND_BITS)) & ((1 << BAND_BITS) - 1))
+                buckets.setdefault(key, []).append(name)
+        
+        order = {name: i for i, name in enumerate(prints)}
+        parent = {}
+        
+        def root(name: str) -> str:
+            while parent.get(name, name) != name:
+                name = parent[name]
+            return name
+        
+        for members in buckets.values():
+            for a, b in combinations(members, 2):
+                if distance(prints[a], prints[b]) <= self.max_distance:
+                    ra, rb = root(a), root(b)
+                    if ra != rb:
+                        first, later = sorted((ra, rb), key=order.get)
+                        parent[later] = first
+        
+        linked = set(parent) | set(parent.values())
+        groups: Dict[str, List[str]] = {}
+        for name in prints:
+            if name in linked:
+                groups.setdefault(root(name), []).append(name)
+        clusters = []
+        for first, slides in groups.items():
+            clusters.append(DuplicateCluster(slides, [similarity(prints[first], prints[name]) for name in slides]))
+        return clusters
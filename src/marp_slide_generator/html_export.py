@@ -0,0 +1,201 @@
+"""
+HTML Export Module
+Renders a presentation to a single HTML deck on a process pool, with a disk cache
+"""
+
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import markdown
+
+from .html_renderer import SlideRenderer
+from .mmap_reader import read_body
+from .regenerator import SlideRegenerator
+
+# URL attributes as the markdown library writes them
+_URL_ATTRIBUTE = re.compile(r'\b(src|href)="([^"]*)"')
+
+
+EXPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+{css}
+@media print {{ body {{ background: none; }} section.slide {{ margin: 0; box-shadow: none; page-break-after: always; }} }}
+</style>
+</head>
+<body>
+{sections}
+</body>
+</html>
+"""
+
+
+@dataclass
+class ExportReport:
+    """What an export run rendered and reused"""
+    slides: int = 0
+    rendered: int = 0
+    cached: int = 0
+    output_path: str = ""
+
+
+def default_cache_dir() -> Path:
+    """Render cache location: $MARP_EXPORT_CACHE or a per-user cache directory"""
+    env_path = os.environ.get('MARP_EXPORT_CACHE')
+    if env_path:
+        return Path(env_path)
+    return Path.home() / '.cache' / 'marp-slide-generator' / 'exports'
+
+
+def default_output_path(presentation_dir: Union[str, Path]) -> Path:
+    """PRESENTATION.html next to the presentation directory"""
+    deck = Path(presentation_dir).resolve()
+    return deck.with_name(f"{deck.name}.html")
+
+
+def rebase_urls(body_html: str, base: str) -> str:
+    """Prefix the relative URLs in rendered slide HTML with base
+
+    Slides link their assets relative to their own folder (assets/x.png);
+    base is that folder relative to the exported file. Absolute URLs,
+    root-relative paths and fragments are left alone.
+    """
+    if base in ('', '.'):
+        return body_html
+    
+    def rebase(match):
+        url = match.group(2)
+        parts = urlsplit(html.unescape(url))
+        if parts.scheme or parts.netloc or not parts.path or parts.path.startswith('/'):
+            return match.group(0)
+        return f'{match.group(1)}="{html.escape(posixpath.join(base, html.unescape(url)), quote=True)}"'
+    
+    return _URL_ATTRIBUTE.sub(rebase, body_html)
+
+
+def _render_markdown(args: Tuple[str, List[str]]) -> str:
+    """Process pool worker: render one slide body"""
+    text, extensions = args
+    return markdown.markdown(text, extensions=extensions)
+
+
+class HtmlExporter:
+    """Exports a presentation directory to one HTML file
+
+    Each slide's HTML is cached on disk under a key made from its content
+    hash, the markdown extensions and the markdown library version, so
+    re-exporting after an edit only re-renders the slides that changed.
+    Misses are rendered on a process pool. Cached HTML keeps each slide's
+    own relative URLs; they are rebased onto the output file on export.
+
+    The cache and the default output file live outside the presentation
+    directory: anything written inside it would make the build manifest
+    see the deck as modified and the next marp-gen rebuild it.
+    """
+    
+    def __init__(self, presentation_dir: Union[str, Path], theme: str = 'gaia',
+                 jobs: Optional[int] = None, cache_dir: Optional[Union[str, Path]] = None,
+                 use_cache: bool = True):
+        self.presentation_dir = Path(presentation_dir)
+        self.theme = theme
+        self.jobs = jobs or os.cpu_count() or 1
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            # One directory per deck, so pruning never touches another deck's slides
+            deck = str(self.presentation_dir.resolve())
+            self.cache_dir = default_cache_dir() / hashlib.sha256(deck.encode('utf-8')).hexdigest()[:32]
+        self.use_cache = use_cache
+        self.renderer = SlideRenderer()
+        self.regenerator = SlideRegenerator()
+        # Everything besides the slide text that changes the rendered HTML;
+        # the theme only affects the page stylesheet
+        renderer_settings = json.dumps({'markdown': markdown.__version__, 'extensions': self.renderer.extensions})
+        self._variant = hashlib.sha256(renderer_settings.encode('utf-8')).hexdigest()[:16]
+    
+    def _cache_file(self, digest: str) -> Path:
+        return self.cache_dir / f"{self._variant}-{digest}.html"
+    
+    def render_slides(self, bodies: List[str], report: ExportReport) -> List[str]:
+        """Render slide bodies to HTML, using the disk cache where possible"""
+        digests = [self.renderer.content_hash(body) for body in bodies]
+        rendered: List[Optional[str]] = [None] * len(bodies)
+        misses = []
+        for i, digest in enumerate(digests):
+            cache_file = self._cache_file(digest)
+            if self.use_cache and cache_file.exists():
+                rendered[i] = cache_file.read_text(encoding='utf-8')
+                report.cached += 1
+            else:
+                misses.append(i)
+        
+        # Identical slides are rendered once
+        unique = list({digests[i]: i for i in misses}.values())
+        work = [(bodies[i], self.renderer.extensions) for i in unique]
+        if len(work) > 1 and self.jobs > 1:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(work))) as pool:
+                results = list(pool.map(_render_markdown, work, chunksize=max(1, len(work) // (self.jobs * 4))))
+        else:
+            results = [_render_markdown(item) for item in work]
+        report.rendered += len(work)
+        
+        by_digest = {}
+        for i, body_html in zip(unique, results):
+            by_digest[digests[i]] = body_html
+            if self.use_cache:
+                self._store(digests[i], body_html)
+        for i in misses:
+            rendered[i] = by_digest[digests[i]]
+        
+        if self.use_cache:
+            self._prune(set(digests))
+        return rendered
+    
+    def _store(self, digest: str, body_html: str):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = self._cache_file(digest)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(body_html, encoding='utf-8')
+        os.replace(tmp_file, cache_file)
+    
+    def _prune(self, live: set):
+        """Drop cached slides that no longer belong to the deck or were rendered with other settings"""
+        if not self.cache_dir.is_dir():
+            return
+        keep = {self._cache_file(digest).name for digest in live}
+        for cache_file in self.cache_dir.glob("*.html"):
+            if cache_file.name not in keep:
+                cache_file.unlink()
+    
+    def export(self, output_path: Optional[Union[str, Path]] = None) -> ExportReport:
+        """Render every slide and write the assembled deck"""
+        output = Path(output_path) if output_path else default_output_path(self.presentation_dir)
+        folders = self.regenerator.get_slide_folders(self.presentation_dir)
+        bodies = [read_body(folder / "page.md") for folder in folders]
+        
+        report = ExportReport(slides=len(folders), output_path=str(output))
+        rendered = self.render_slides(bodies, report)
+        # Asset URLs are relative to each slide folder, not to the output file
+        output_dir = output.resolve().parent
+        sections = '\n'.join(
+            self.renderer.section(folder.name, rebase_urls(
+                body_html, os.path.relpath(folder.resolve(), output_dir).replace('\\', '/')))
+            for folder, body_html in zip(folders, rendered))
+        output.write_text(EXPORT_TEMPLATE.format(
+            title=html.escape(self.presentation_dir.name),
+            css=self.renderer.theme_css(self.theme),
+            sections=sections
+        ), encoding='utf-8')
+        return report
\ No newline at end of file
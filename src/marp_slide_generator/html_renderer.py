@@ -0,0 +1,65 @@
+"""
+HTML Renderer Module
+Renders slide markdown to HTML sections for previews and exports
+"""
+
+import hashlib
+import html
+from typing import Dict, Iterable, Optional, Tuple
+
+import markdown
+
+from .marp_formatter import MarpFormatter
+
+
+class SlideRenderer:
+    """Renders slide markdown to HTML, caching results by content hash"""
+    
+    def __init__(self, extensions: Optional[Iterable[str]] = None):
+        self.extensions = list(extensions) if extensions is not None else ['tables', 'fenced_code']
+        self.formatter = MarpFormatter()
+        self._cache: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash used to key rendered slides"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def render(self, text: str) -> Tuple[str, str]:
+        """Render slide markdown and return (content hash, HTML)"""
+        digest = self.content_hash(text)
+        rendered = self._cache.get(digest)
+        if rendered is None:
+            rendered = markdown.markdown(text, extensions=self.extensions)
+            self._cache[digest] = rendered
+            self.misses += 1
+        else:
+            self.hits += 1
+        return digest, rendered
+    
+    def prune(self, live_hashes: Iterable[str]):
+        """Drop cached renders that no longer belong to any slide"""
+        live = set(live_hashes)
+        for digest in [d for d in self._cache if d not in live]:
+            del self._cache[digest]
+    
+    def section(self, slide_id: str, body_html: str) -> str:
+        """Wrap rendered slide HTML in its <section> element"""
+        return f'<section class="slide" id="{html.escape(slide_id, quote=True)}">\n{body_html}\n</section>'
+    
+    def theme_css(self, theme: str = 'default') -> str:
+        """Stylesheet approximating a MarpFormatter theme"""
+        theme_settings = self.formatter.themes.get(theme, self.formatter.themes['default'])
+        background = theme_settings.get('backgroundColor', '#fff')
+        color = theme_settings.get('color', '#000')
+        return (
+            "body { margin: 0; background: #e5e5e5; font-family: sans-serif; }\n"
+            "section.slide { box-sizing: border-box; width: 960px; min-height: 540px; "
+            "margin: 24px auto; padding: 48px 64px; box-shadow: 0 2px 8px rgba(0,0,0,.2); "
+            f"background: {background}; color: {color}; overflow: hidden; }}\n"
+            "section.slide pre { background: rgba(0,0,0,.05); padding: 8px; overflow-x: auto; }\n"
+            "section.slide table { border-collapse: collapse; }\n"
+            "section.slide th, section.slide td { border: 1px solid #ccc; padding: 4px 8px; }\n"
+        )
@@ -0,0 +1,260 @@
+"""
+HTTP Service Module
+Local HTTP generation service backed by pre-warmed worker processes and a result cache
+"""
+
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from urllib.parse import unquote
+
+from .result_cache import DEFAULT_MAX_BYTES, ResultCache, cache_key
+
+THEMES = ('default', 'gaia', 'uncover')
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+# Per-process helpers, built once by _init_worker
+_worker = {}
+
+
+def _init_worker():
+    """Import the package and build the shared helpers once per worker"""
+    from .slide_generator import SlideGenerator
+    from .page_splitter import PageSplitter
+    from .marp_formatter import MarpFormatter
+    from .layout import LayoutEstimator
+    from .tests.slide_validator import SlideValidator
+    
+    _worker['generator_class'] = SlideGenerator
+    _worker['validator_class'] = SlideValidator
+    _worker['splitter'] = PageSplitter()
+    _worker['formatter'] = MarpFormatter()
+    _worker['layout_splitters'] = {theme: PageSplitter(layout=LayoutEstimator.for_theme(theme))
+                                   for theme in THEMES}
+
+
+def _ping() -> int:
+    # Held briefly so that concurrent pings land on different workers
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _generate(content: str, theme: str, presentation_name: Optional[str], layout_aware: bool,
+              output_dir: str) -> dict:
+    """Worker: generate a deck under output_dir and describe it"""
+    generator = _worker['generator_class'](output_dir, presentation_name)
+    generator.splitter = _worker['layout_splitters'][theme] if layout_aware else _worker['splitter']
+    generator.formatter = _worker['formatter']
+    report = generator.generate_slides_report(content, theme)
+    # The scratch directory is renamed once cached; report the deck's own name
+    report.output_dir = generator.output_dir.name
+    return {'deck': generator.output_dir.name, 'num_pages': report.page_count, 'report': report.to_dict()}
+
+
+def _validate(deck_dir: str) -> dict:
+    """Worker: validate a generated deck"""
+    return _worker['validator_class'](deck_dir).validate_all()
+
+
+class RequestError(Exception):
+    """A request the service rejects, with the HTTP status to answer"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class GenerationService:
+    """Generates and validates decks on a process pool, caching results by content
+
+    Results are keyed by SHA-256 of (input, theme, splitter parameters,
+    presentation name, package version). Identical requests that arrive
+    while the first is still building wait for it instead of building twice.
+    """
+    
+    def __init__(self, cache_dir: Union[str, Path], workers: Optional[int] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        from .page_splitter import PageSplitter
+        from .layout import LayoutEstimator
+        
+        self.cache = ResultCache(cache_dir, max_bytes)
+        self.workers = workers or os.cpu_count() or 1
+        # Splitters mirror the workers' ones; here they only feed the cache key
+        self.splitter = PageSplitter()
+        self.layout_splitters = {theme: PageSplitter(layout=LayoutEstimator.for_theme(theme))
+                                 for theme in THEMES}
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._inflight = {}
+        self._lock = threading.Lock()
+    
+    def warm(self) -> int:
+        """Start every worker process now; returns how many are running"""
+        futures = [self.pool.submit(_ping) for _ in range(self.workers)]
+        return len({future.result() for future in futures})
+    
+    def generate(self, content: str, theme: str = 'gaia', presentation_name: Optional[str] = None,
+                 layout_aware: bool = False) -> Tuple[str, dict, bool]:
+        """Return (deck id, metadata, whether it came from the cache)"""
+        if theme not in THEMES:
+            raise RequestError(400, f"Unknown theme: {theme}")
+        if presentation_name and (presentation_name in ('.', '..') or '/' in presentation_name
+                                  or '\\' in presentation_name):
+            raise RequestError(400, f"Invalid presentation name: {presentation_name}")
+        splitter = self.layout_splitters[theme] if layout_aware else self.splitter
+        key = cache_key(content, theme, splitter, name=presentation_name)
+        
+        meta = self.cache.get(key)
+        if meta is not None:
+            return key, meta, True
+        
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            return key, pending.result(), True
+        
+        try:
+            meta = self.cache.put(key, lambda scratch: self.pool.submit(
+                _generate, content, theme, presentation_name, layout_aware, str(scratch)).result())
+            pending.set_result(meta)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return key, meta, False
+    
+    def deck_dir(self, key: str) -> Path:
+        """Directory holding a cached deck's files"""
+        is_key = isinstance(key, str) and len(key) == 64 and all(c in '0123456789abcdef' for c in key)
+        meta = self.cache.get(key) if is_key else None
+        if meta is None:
+            raise RequestError(404, f"Unknown deck: {key}")
+        return self.cache.entry_dir(key) / meta['deck']
+    
+    def validate(self, key: str) -> dict:
+        """Validation errors and warnings of a cached deck"""
+        deck_dir = self.deck_dir(key)
+        return self.pool.submit(_validate, str(deck_dir)).result()
+    
+    def deck_file(self, key: str, relative: str) -> Path:
+        """A file inside a cached deck, refusing paths that leave it"""
+        deck_dir = self.deck_dir(key).resolve()
+        path = (deck_dir / relative).resolve()
+        if deck_dir not in path.parents or not path.is_file():
+            raise RequestError(404, f"Not found: {relative}")
+        return path
+    
+    def close(self):
+        self.pool.shutdown()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /generate, POST /validate, GET /deck/<id>/[path]"""
+    
+    service: GenerationService = None
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        try:
+            message = self._read_json()
+            if path == '/generate':
+                self._send_json(200, self._generate(message))
+            elif path == '/validate':
+                self._send_json(200, self._validate(message))
+            else:
+                raise RequestError(404, f"Not found: {path}")
+        except RequestError as e:
+            self._send_json(e.status, {'ok': False, 'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'ok': False, 'error': str(e)})
+    
+    def do_GET(self):
+        path = unquote(self.path.split('?', 1)[0])
+        try:
+            if not path.startswith('/deck/'):
+                raise RequestError(404, f"Not found: {path}")
+            key, _, relative = path[len('/deck/'):].partition('/')
+            if relative:
+                file_path = self.service.deck_file(key, relative)
+                content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+                if file_path.suffix == '.md':
+                    content_type = 'text/markdown'
+                if content_type.startswith('text/'):
+                    content_type += '; charset=utf-8'
+                self._send(200, content_type, file_path.read_bytes())
+            else:
+                deck_dir = self.service.deck_dir(key)
+                files = sorted(str(p.relative_to(deck_dir)).replace('\\', '/')
+                               for p in deck_dir.rglob('*') if p.is_file())
+                self._send_json(200, {'ok': True, 'id': key, 'files': files})
+        except RequestError as e:
+            self._send_json(e.status, {'ok': False, 'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'ok': False, 'error': str(e)})
+    
+    def _generate(self, message: dict) -> dict:
+        content = message.get('content')
+        if not isinstance(content, str) or not content.strip():
+            raise RequestError(400, "Field 'content' must be non-empty text")
+        name = message.get('name')
+        if name is not None and not isinstance(name, str):
+            raise RequestError(400, "Field 'name' must be text")
+        theme = message.get('theme', 'gaia')
+        if not isinstance(theme, str):
+            raise RequestError(400, "Field 'theme' must be text")
+        key, meta, cached = self.service.generate(content, theme, name, bool(message.get('layout_aware')))
+        return {'ok': True, 'id': key, 'cached': cached, 'deck': meta['deck'],
+                'num_pages': meta['num_pages'], 'report': meta['report']}
+    
+    def _validate(self, message: dict) -> dict:
+        # Validate a deck by id, or generate it first from the same fields as /generate
+        key = message.get('id')
+        if key is not None and not isinstance(key, str):
+            raise RequestError(400, "Field 'id' must be a deck id string")
+        key = key or self._generate(message)['id']
+        results = self.service.validate(key)
+        return {'ok': not results['errors'], 'id': key, **results}
+    
+    def _read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_BYTES:
+            raise RequestError(413, f"Request body over {MAX_REQUEST_BYTES} bytes")
+        try:
+            message = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise RequestError(400, "Request body must be JSON")
+        if not isinstance(message, dict):
+            raise RequestError(400, "Request body must be a JSON object")
+        return message
+    
+    def _send_json(self, status: int, payload: dict):
+        self._send(status, 'application/json', json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    
+    def _send(self, status: int, content_type: str, data: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(service: GenerationService, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server bound to host:port that answers from service"""
+    handler = type('BoundServiceHandler', (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
\ No newline at end of file
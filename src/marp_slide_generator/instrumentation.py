@@ -0,0 +1,168 @@
+"""
+Instrumentation Module
+Per-stage timing reports and hooks for the generation pipeline
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class GenerationReport:
+    """Summary of a single generate_slides_report run"""
+    
+    page_count: int = 0
+    output_dir: str = ""
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    bytes_written: int = 0
+    files_created: int = 0
+    dirs_created: int = 0
+    cache_hits: int = 0
+    
+    @property
+    def total_time(self) -> float:
+        return sum(self.stage_times.values())
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+    
+    def format_timings(self) -> str:
+        """Human-readable breakdown for --timings"""
+        lines = ["⏱  Stage timings:"]
+        for stage, seconds in self.stage_times.items():
+            lines.append(f"   {stage:<10} {seconds * 1000:>9.2f} ms")
+        lines.append(f"   {'total':<10} {self.total_time * 1000:>9.2f} ms")
+        lines.append(
+            f"   {self.page_count} pages, {self.files_created} files, {self.dirs_created} dirs, "
+            f"{self.bytes_written} bytes written, {self.cache_hits} cache hits"
+        )
+        return '\n'.join(lines)
+
+
+class StageHooks:
+    """Callbacks fired when a pipeline stage starts and ends
+
+    on_start receives the stage name; on_end receives the stage name and
+    its wall time in seconds. Use this to feed an external metrics system.
+    """
+    
+    def __init__(self):
+        self._on_start: List[Callable[[str], None]] = []
+        self._on_end: List[Callable[[str, float], None]] = []
+    
+    def add(self, on_start: Optional[Callable[[str], None]] = None,
+            on_end: Optional[Callable[[str, float], None]] = None):
+        """Register stage callbacks"""
+        if on_start is not None:
+            self._on_start.append(on_start)
+        if on_end is not None:
+            self._on_end.append(on_end)
+    
+    @contextmanager
+    def stage(self, name: str, report: Optional[GenerationReport] = None):
+        """Time the enclosed block as stage `name`"""
+        for callback in self._on_start:
+            callback(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if report is not None:
+                report.stage_times[name] = report.stage_times.get(name, 0.0) + elapsed
+            for callback in self._on_end:
+                callback(name, elapsed)
+
+
+class MemoryProfiler:
+    """tracemalloc-based peak and retained memory per pipeline stage
+
+    Register with ``hooks.add(profiler.on_start, profiler.on_end)`` or wrap
+    code in ``profiler.stage(name)``. Peak is the highest traced memory
+    while the stage ran; retained is how much more is held when it ends.
+    """
+    
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.stages: Dict[str, Dict[str, int]] = {}
+        self._stage_start: Dict[str, int] = {}
+        self._high_water = -1
+        self._snapshot = None
+    
+    def start(self):
+        import tracemalloc
+        tracemalloc.start()
+    
+    def stop(self):
+        import tracemalloc
+        tracemalloc.stop()
+    
+    def on_start(self, name: str):
+        import tracemalloc
+        current, _ = tracemalloc.get_traced_memory()
+        self._stage_start[name] = current
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+    
+    def on_end(self, name: str, elapsed: float = 0.0):
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        stats = self.stages.setdefault(name, {'peak': 0, 'retained': 0})
+        stats['peak'] = max(stats['peak'], peak)
+        stats['retained'] += current - self._stage_start.pop(name, current)
+        # Keep the allocation sites from the point where the most memory was held
+        if current > self._high_water:
+            self._high_water = current
+            self._snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ])
+    
+    @contextmanager
+    def stage(self, name: str):
+        self.on_start(name)
+        try:
+            yield
+        finally:
+            self.on_end(name)
+    
+    def top_allocations(self) -> List[Tuple[str, int, int]]:
+        """(site, bytes, blocks) for the largest allocation sites"""
+        if self._snapshot is None:
+            return []
+        results = []
+        for stat in self._snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            results.append((f"{frame.filename}:{frame.lineno}", stat.size, stat.count))
+        return results
+    
+    def format_report(self) -> str:
+        """Human-readable breakdown for --memory-profile"""
+        lines = ["🧠 Memory by stage:"]
+        for stage, stats in self.stages.items():
+            lines.append(
+                f"   {stage:<28} peak {_mb(stats['peak']):>9}   retained {stats['retained'] / 1024 / 1024:>+8.2f} MB"
+            )
+        allocations = self.top_allocations()
+        if allocations:
+            lines.append("   Top allocation sites:")
+            for site, size, count in allocations:
+                lines.append(f"   • {site}: {_mb(size)} ({count} blocks)")
+        return '\n'.join(lines)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+def run_with_profile(profile_path: str, func: Callable, *args, **kwargs):
+    """Run func under cProfile and dump the stats to profile_path"""
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(profile_path)
\ No newline at end of file
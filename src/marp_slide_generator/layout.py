@@ -0,0 +1,85 @@
+"""
+Layout Module
+Estimates rendered slide width and line wraps for mixed CJK and Latin text
+"""
+
+import unicodedata
+from typing import Optional
+
+# Approximate content width of a slide line in half-width cells per theme
+# (a CJK character takes two cells, a Latin letter one)
+THEME_COLUMNS = {
+    'default': 64,
+    'gaia': 60,
+    'uncover': 56,
+}
+
+# Width in half-width cells of every code point below _TABLE_SIZE
+# (0 for combining/format characters, 2 for wide/fullwidth), built from
+# unicodedata on first use
+_TABLE_SIZE = 0x20000
+_table: Optional[bytes] = None
+
+
+def _build_table() -> bytes:
+    """Scan the BMP and SMP once into a code point -> width table"""
+    table = bytearray(b'\x01') * _TABLE_SIZE
+    for code in range(0xA0, _TABLE_SIZE):
+        char = chr(code)
+        if unicodedata.east_asian_width(char) in ('W', 'F'):
+            table[code] = 2
+        elif unicodedata.combining(char) or unicodedata.category(char) in ('Me', 'Cf'):
+            table[code] = 0
+    return bytes(table)
+
+
+def _width_table() -> bytes:
+    global _table
+    if _table is None:
+        _table = _build_table()
+    return _table
+
+
+def _char_width(table: bytes, char: str) -> int:
+    code = ord(char)
+    if code < _TABLE_SIZE:
+        return table[code]
+    # CJK Extension B onwards (planes 2 and 3) is wide throughout
+    return 2 if code <= 0x3FFFD else 1
+
+
+class LayoutEstimator:
+    """Estimates how wide a line renders and how many lines it wraps to
+
+    Widths are in half-width cells: ASCII and other narrow characters
+    count 1, East Asian wide/fullwidth characters count 2 and combining
+    marks count 0. ASCII lines skip the table lookup entirely.
+    """
+    
+    def __init__(self, columns: int = THEME_COLUMNS['default']):
+        self.columns = columns
+    
+    @classmethod
+    def for_theme(cls, theme: str = 'default') -> 'LayoutEstimator':
+        """Estimator using a theme's approximate column width"""
+        return cls(THEME_COLUMNS.get(theme, THEME_COLUMNS['default']))
+    
+    def width(self, line: str) -> int:
+        """Display width of a line in half-width cells"""
+        if line.isascii():
+            return len(line)
+        table = _width_table()
+        if ord(max(line)) < _TABLE_SIZE:
+            return sum(table[ord(char)] for char in line)
+        return sum(_char_width(table, char) for char in line)
+    
+    def wrapped_lines(self, line: str) -> int:
+        """Number of rendered lines a source line wraps to (at least 1)"""
+        width = self.width(line)
+        if width <= self.columns:
+            return 1
+        return -(-width // self.columns)
+    
+    def text_width(self, text: str) -> int:
+        """Total display width of a block of text, newlines excluded"""
+        return sum(self.width(line) for line in text.split('\n'))
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Limits Module
+Slide-length limits and content weights shared by the validator and auto-tune
+"""
+
+# More realistic limits for Marp slides
+MAX_LINES = 20  # Typical Marp slide shows ~15-20 lines comfortably
+MAX_CONTENT_LINES = 15  # Content lines (excluding code blocks)
+MAX_CHARS = 1000  # Reduced character limit
+MAX_CODE_CONTENT_LINES = 10  # Content lines next to a code block
+
+# Weight factors for different content types
+CODE_BLOCK_WEIGHT = 1.5  # Code blocks take more vertical space
+TABLE_WEIGHT = 1.3       # Tables take more space
+IMAGE_WEIGHT = 3.0       # Images take significant space
+HEADING_WEIGHT = 1.2     # Headings have larger font
\ No newline at end of file
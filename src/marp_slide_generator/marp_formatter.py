@@ -4,7 +4,8 @@ Formats content for Marp slide presentation
 """
 
 from typing import List
-from pathlib import Path
+
+from .mmap_reader import read_body
 
 
 class MarpFormatter:
@@ -67,6 +68,13 @@ class MarpFormatter:
         
     def format_master_slide(self, page_paths: List[str], theme: str = 'default') -> str:
         """Format the master slide by combining all page contents"""
+        # Front matter is skipped in bytes; only the page bodies are decoded
+        page_bodies = [read_body(page_path) for page_path in page_paths]
+        
+        return self.combine_master(page_bodies, theme)
+    
+    def master_header(self, theme: str = 'default') -> str:
+        """Build the Marp front matter that opens the master slide"""
         theme_settings = self.themes.get(theme, self.themes['default'])
         
         # Build master slide header
@@ -88,40 +96,29 @@ class MarpFormatter:
             '---',
             ''
         ])
+        return '\n'.join(lines)
         
-        # Read and combine all page contents
-        master_content = '\n'.join(lines)
+    def strip_front_matter(self, page_content: str) -> str:
+        """Remove Marp front matter from a page and return its stripped body"""
+        if page_content.startswith('---'):
+            # Find the end of front matter
+            lines = page_content.split('\n')
+            front_matter_end = 0
+            for j, line in enumerate(lines[1:], 1):
+                if line.strip() == '---':
+                    front_matter_end = j + 1
+                    break
+            # Skip empty lines after front matter
+            while front_matter_end < len(lines) and not lines[front_matter_end].strip():
+                front_matter_end += 1
+            page_content = '\n'.join(lines[front_matter_end:])
         
-        for i, page_path in enumerate(page_paths):
-            # Read page content
-            full_path = Path(page_path)
-            if full_path.exists():
-                page_content = full_path.read_text(encoding='utf-8')
-            else:
-                # Try relative to current directory
-                page_content = Path(page_path).read_text(encoding='utf-8')
-            
-            # Remove Marp front matter from all individual pages
-            if page_content.startswith('---'):
-                # Find the end of front matter
-                lines = page_content.split('\n')
-                front_matter_end = 0
-                for j, line in enumerate(lines[1:], 1):
-                    if line.strip() == '---':
-                        front_matter_end = j + 1
-                        break
-                # Skip empty lines after front matter
-                while front_matter_end < len(lines) and not lines[front_matter_end].strip():
-                    front_matter_end += 1
-                page_content = '\n'.join(lines[front_matter_end:])
-            
-            # Add page separator for all pages after the first
-            if i > 0:
-                master_content += '\n\n---\n\n'
-                
-            master_content += page_content.strip()
+        return page_content.strip()
             
-        return master_content
+    def combine_master(self, page_bodies: List[str], theme: str = 'default') -> str:
+        """Join already-stripped page bodies into the master slide"""
+        # Add page separator between pages
+        return self.master_header(theme) + '\n\n---\n\n'.join(page_bodies)
         
     def _enhance_formatting(self, content: str) -> str:
         """Enhance content formatting for better slide presentation"""
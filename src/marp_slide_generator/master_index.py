@@ -0,0 +1,98 @@
+"""
+Master Index Module
+Sidecar index of slide byte offsets for random access into master_slide.md
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Union
+
+MASTER_FILE = "master_slide.md"
+INDEX_FILE = "master_slide.index.json"
+INDEX_VERSION = 1
+
+# combine_master joins page bodies with this separator
+SEPARATOR = b'\n\n---\n\n'
+
+
+@dataclass
+class SlideEntry:
+    """Location and identity of one slide body inside master_slide.md"""
+    offset: int
+    length: int
+    sha256: str
+    title: str
+    folder: str
+
+
+class MasterIndex:
+    """Byte-offset index over master_slide.md
+
+    ``MasterIndex.open(presentation_dir)[n]`` seeks straight to slide n
+    instead of re-splitting the master on '---', which is both O(deck)
+    and wrong for slides that contain a literal '---' line.
+    """
+    
+    def __init__(self, presentation_dir: Union[str, Path], entries: List[SlideEntry],
+                 master_size: int = 0, master_mtime_ns: int = 0):
+        self.presentation_dir = Path(presentation_dir)
+        self.entries = entries
+        self.master_size = master_size
+        self.master_mtime_ns = master_mtime_ns
+    
+    @classmethod
+    def build(cls, presentation_dir: Union[str, Path], header: str, bodies: List[str],
+              titles: List[str], folders: List[str]) -> 'MasterIndex':
+        """Compute entries for the master that combine_master(bodies) produces"""
+        entries = []
+        offset = len(header.encode('utf-8'))
+        for body, title, folder in zip(bodies, titles, folders):
+            data = body.encode('utf-8')
+            entries.append(SlideEntry(offset, len(data), hashlib.sha256(data).hexdigest(), title, folder))
+            offset += len(data) + len(SEPARATOR)
+        return cls(presentation_dir, entries)
+    
+    @classmethod
+    def open(cls, presentation_dir: Union[str, Path]) -> 'MasterIndex':
+        """Load the sidecar index of a presentation"""
+        presentation_dir = Path(presentation_dir)
+        data = json.loads((presentation_dir / INDEX_FILE).read_text(encoding='utf-8'))
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported master index version: {data.get('version')}")
+        entries = [SlideEntry(*slide) for slide in data['slides']]
+        return cls(presentation_dir, entries, data['master_size'], data['master_mtime_ns'])
+    
+    def dumps(self) -> str:
+        """Serialize the index, stamped with the current master file's size and mtime"""
+        stat = (self.presentation_dir / MASTER_FILE).stat()
+        self.master_size, self.master_mtime_ns = stat.st_size, stat.st_mtime_ns
+        return json.dumps({
+            'version': INDEX_VERSION,
+            'master_size': self.master_size,
+            'master_mtime_ns': self.master_mtime_ns,
+            'slides': [[e.offset, e.length, e.sha256, e.title, e.folder] for e in self.entries],
+        }, ensure_ascii=False)
+    
+    def is_current(self) -> bool:
+        """Whether master_slide.md is unchanged since the index was written"""
+        try:
+            stat = (self.presentation_dir / MASTER_FILE).stat()
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (self.master_size, self.master_mtime_ns)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __getitem__(self, n: int) -> str:
+        """Read the body of slide n (0-based) from master_slide.md"""
+        entry = self.entries[n]
+        with open(self.presentation_dir / MASTER_FILE, 'rb') as f:
+            f.seek(entry.offset)
+            return f.read(entry.length).decode('utf-8')
+    
+    def __iter__(self) -> Iterator[str]:
+        for n in range(len(self.entries)):
+            yield self[n]
\ No newline at end of file
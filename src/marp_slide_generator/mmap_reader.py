@@ -0,0 +1,133 @@
+"""
+Mmap Reader Module
+Reads slide files as bytes, decoding only the parts that are needed
+"""
+
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+# Smaller files are read into bytes: mapping them costs more than reading
+MMAP_THRESHOLD = 64 * 1024
+
+# Line endings recognised by text-mode reads (universal newlines)
+_NEWLINE = re.compile(rb'\r\n|\r|\n')
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def open_buffer(path: Union[str, Path]) -> Iterator[Buffer]:
+    """Open a file as a bytes-like buffer, memory-mapped when it is large"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size or size < MMAP_THRESHOLD:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_lines(buffer: Buffer, pos: int = 0) -> Iterator[Tuple[str, int, int]]:
+    """Yield (line, start, next_start) for each line, decoding one line at a time
+
+    Lines are split the way text-mode reads split them, so results match
+    str.split('\\n') on the output of Path.read_text().
+    """
+    length = len(buffer)
+    while True:
+        match = _NEWLINE.search(buffer, pos)
+        end = match.start() if match else length
+        yield str(buffer[pos:end], 'utf-8'), pos, match.end() if match else length
+        if not match:
+            return
+        pos = match.end()
+
+
+def decode(buffer: Buffer, start: int = 0) -> str:
+    """Decode buffer from start with text-mode newline translation"""
+    text = str(buffer[start:], 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def body_offset(buffer: Buffer) -> int:
+    """Byte offset where a page body starts, after front matter and blank lines
+
+    Mirrors MarpFormatter.strip_front_matter.
+    """
+    if buffer[:3] != b'---':
+        return 0
+    
+    lines = iter_lines(buffer)
+    next(lines)
+    for line, start, _ in lines:
+        if line.strip() == '---':
+            break
+    else:
+        # Unterminated front matter: the whole page is the body
+        return 0
+    
+    # Skip empty lines after front matter
+    for line, start, _ in lines:
+        if line.strip():
+            return start
+    return len(buffer)
+
+
+def find_title(buffer: Buffer) -> str:
+    """First '# ' or '## ' heading outside front matter, or "Untitled"
+
+    Mirrors SlideRegenerator.extract_title but stops reading at the heading.
+    """
+    in_frontmatter = False
+    for line, _, _ in iter_lines(buffer):
+        stripped = line.strip()
+        if stripped == '---':
+            in_frontmatter = not in_frontmatter
+            continue
+        if not in_frontmatter:
+            if stripped.startswith('# '):
+                return stripped[2:].strip()
+            elif stripped.startswith('## '):
+                return stripped[3:].strip()
+    
+    return "Untitled"
+
+
+def read_body(path: Union[str, Path]) -> str:
+    """Read a page and return its stripped body without the front matter"""
+    with open_buffer(path) as buffer:
+        return decode(buffer, body_offset(buffer)).strip()
+
+
+def read_title(path: Union[str, Path]) -> str:
+    """Read just enough of a page to find its title"""
+    with open_buffer(path) as buffer:
+        return find_title(buffer)
+
+
+def read_page(path: Union[str, Path]) -> Tuple[str, str]:
+    """Read a page once and return (stripped body, title)"""
+    with open_buffer(path) as buffer:
+        return decode(buffer, body_offset(buffer)).strip(), find_title(buffer)
+
+
+def read_input(path: Union[str, Path]) -> Union[mmap.mmap, str]:
+    """Memory-map a generator input file, falling back to text for CR line endings
+
+    The splitter works on the mapped bytes directly, so the file is never
+    copied into a str. Text mode would translate CRLF endings, so such files
+    are read as text to keep the output unchanged. The caller closes the map.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped.find(b'\r') == -1:
+                return mapped
+            mapped.close()
+    return Path(path).read_text(encoding='utf-8')
\ No newline at end of file
@@ -4,195 +4,558 @@ Intelligently splits content into pages for Marp slides
 """
 
 import re
-from typing import List, Tuple
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .layout import LayoutEstimator
+
+# Per-line classification bits, computed once per line by _LineIndex
+BLANK = 1           # whitespace only
+MAJOR_HEADING = 2   # '# ' or '## '
+HEADING = 4         # '# ', '## ' or '### '
+FENCE = 8           # code block delimiter
+BULLET = 16         # '- ' or '* '
+NUMBERED = 32       # '1. '
+PAGE_BREAK = 64     # a line that is exactly '---'
+TABLE_RULE = 128    # a table's header separator row, e.g. '|---|:--:|'
+
+# Kinds of atomic blocks: a page boundary never falls inside one, except
+# where an oversized block is split at its safe points
+CODE_BLOCK = 1      # fenced code; split between lines, re-opening the fence
+DIAGRAM = 2         # fenced diagram; never split, gets a slide of its own
+TABLE = 3           # table; split between body rows, repeating the header
+# Fence info strings whose blocks render as one picture
+DIAGRAM_LANGUAGES = ('mermaid',)
+# Header row plus separator row
+TABLE_HEADER_LINES = 2
+
+_TABLE_RULE = re.compile(r'\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?')
+_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+# Flag bytes of fence and table separator lines, found in flags.tobytes()
+_BLOCK_MARK = re.compile(rb'[\x08\x80]')
+
+# str, or a UTF-8 bytes-like buffer with .find() such as bytes or mmap
+Source = Union[str, bytes, bytearray, 'mmap.mmap']
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """Yield the lines of a str or UTF-8 bytes-like source one at a time"""
+    is_text = isinstance(source, str)
+    newline = '\n' if is_text else b'\n'
+    length = len(source)
+    pos = 0
+    while True:
+        end = source.find(newline, pos)
+        if end == -1:
+            end = length
+        line = source[pos:end]
+        yield line if is_text else str(line, 'utf-8')
+        if end == length:
+            return
+        pos = end + 1
+
+
+class _LineIndex:
+    """Line offsets, flags and weights over a single source buffer
+
+    The source is held once; line i spans starts[i] to starts[i + 1] - 1.
+    Each line is decoded only transiently while it is classified, so the
+    split passes work on integer offsets instead of per-line strings.
+    """
+    
+    def __init__(self, source: Source, weigh: Callable[[str], float],
+                 measure: Optional[Callable[[str], int]] = None):
+        self.source = source
+        self.is_text = isinstance(source, str)
+        self.starts = array('L', [0])
+        self.flags = array('B')
+        self.weights = array('d')
+        # Offsets double as character counts only for str sources measured by
+        # len(); otherwise keep prefix sums of the per-line measure
+        self.chars = None if self.is_text and measure is None else array('Q', [0])
+        measure = measure or len
+        
+        classify = self._classify
+        add_flags, add_weight, add_start = self.flags.append, self.weights.append, self.starts.append
+        add_chars = self.chars.append if self.chars is not None else None
+        is_text = self.is_text
+        newline = '\n' if is_text else b'\n'
+        length = len(source)
+        pos = 0
+        chars = 0
+        # Offsets come from the newline positions in the source itself, so a
+        # bytes line is decoded once and never re-encoded to find its length
+        while True:
+            end = source.find(newline, pos)
+            if end == -1:
+                end = length
+            line = source[pos:end] if is_text else str(source[pos:end], 'utf-8')
+            add_flags(classify(line))
+            add_weight(weigh(line))
+            if add_chars is not None:
+                chars += measure(line)
+                add_chars(chars)
+            add_start(end + 1)
+            if end == length:
+                break
+            pos = end + 1
+        self._find_blocks()
+    
+    def _find_blocks(self):
+        """Locate fenced blocks and tables, the units a page boundary must not cut
+
+        Fences pair up in order, the way the validator counts them; an
+        unpaired last fence opens no block. A table is a separator row with
+        a header row above it, plus the non-blank rows with '|' below it.
+        """
+        self.block_starts = array('L')
+        self.block_ends = array('L')
+        self.block_kinds = array('B')
+        flags = self.flags
+        opening = None
+        covered = 0   # lines before this are in a block already
+        for match in _BLOCK_MARK.finditer(flags.tobytes()):
+            i = match.start()
+            if i < covered:
+                continue
+            if flags[i] == FENCE:
+                if opening is None:
+                    opening = i
+                    continue
+                info = self.text(opening, opening + 1).strip().lstrip('`').split()
+                diagram = bool(info) and info[0].lower() in DIAGRAM_LANGUAGES
+                self._add_block(opening, i + 1, DIAGRAM if diagram else CODE_BLOCK)
+                opening = None
+                covered = i + 1
+            elif opening is None and i > covered and not flags[i - 1] & BLANK and '|' in self.text(i - 1, i):
+                end = i + 1
+                while end < len(flags) and not flags[end] & BLANK and '|' in self.text(end, end + 1):
+                    end += 1
+                self._add_block(i - 1, end, TABLE)
+                covered = end
+    
+    def _add_block(self, first: int, last: int, kind: int):
+        self.block_starts.append(first)
+        self.block_ends.append(last)
+        self.block_kinds.append(kind)
+    
+    def block_at(self, line: int) -> int:
+        """Number of the block that holds line, or -1"""
+        k = bisect_right(self.block_starts, line) - 1
+        return k if k >= 0 and line < self.block_ends[k] else -1
+    
+    def cut_block(self, boundary: int) -> int:
+        """Number of the block that a page boundary before line boundary cuts through, or -1"""
+        k = self.block_at(boundary)
+        return k if k >= 0 and boundary > self.block_starts[k] else -1
+    
+    def __len__(self) -> int:
+        return len(self.flags)
+    
+    @staticmethod
+    def _classify(line: str) -> int:
+        stripped = line.strip()
+        if not stripped:
+            return BLANK
+        # Every marker is decided by the first character, so test that first
+        lead = stripped[0]
+        if lead == '#':
+            if stripped.startswith(('# ', '## ')):
+                return MAJOR_HEADING | HEADING
+            return HEADING if stripped.startswith('### ') else 0
+        if lead == '`':
+            return FENCE if stripped.startswith('```') else 0
+        if lead == '|' or lead == ':':
+            return TABLE_RULE if _TABLE_RULE.fullmatch(stripped) and '|' in stripped else 0
+        if lead == '-' or lead == '*':
+            if line == '---':
+                return PAGE_BREAK
+            if lead == '-' and '|' in stripped and _TABLE_RULE.fullmatch(stripped):
+                return TABLE_RULE
+            return BULLET if stripped.startswith(('- ', '* ')) else 0
+        if lead == '1':
+            return NUMBERED if stripped.startswith('1. ') else 0
+        return 0
+    
+    def char_length(self, first: int, last: int) -> int:
+        """Length of lines [first, last) joined with newlines, in characters
+
+        With a measure, each line counts as its measured width instead.
+        """
+        if last <= first:
+            return 0
+        if self.chars is None:
+            return self.starts[last] - 1 - self.starts[first]
+        return self.chars[last] - self.chars[first] + (last - first - 1)
+    
+    def text(self, first: int, last: int) -> str:
+        """Materialize lines [first, last) as a single string"""
+        if last <= first:
+            return ''
+        chunk = self.source[self.starts[first]:self.starts[last] - 1]
+        return chunk if self.is_text else str(chunk, 'utf-8')
+    
+    def page(self, first: int, last: int) -> str:
+        """Materialize lines [first, last) as a stripped page, repairing blocks cut at its edges
+
+        A page that starts inside a table repeats the table's header rows.
+        One that starts or ends inside a fenced code block re-opens the
+        fence with its info string, or closes it.
+        """
+        text = self.text(first, last)
+        k = self.cut_block(first)
+        if k >= 0:
+            start = self.block_starts[k]
+            header = TABLE_HEADER_LINES if self.block_kinds[k] == TABLE else 1
+            text = self.text(start, start + header) + '\n' + text
+        k = self.cut_block(last)
+        if k >= 0 and self.block_kinds[k] != TABLE:
+            end = self.block_ends[k]
+            text += '\n' + self.text(end - 1, end)
+        return text.strip()
+
+
+def _pairs(spans: array) -> Iterator[Tuple[int, int]]:
+    """Iterate (first, last) line ranges stored flat in an array"""
+    it = iter(spans)
+    return zip(it, it)
 
 
 class PageSplitter:
     """Splits content into appropriately sized pages"""
     
-    def __init__(self, max_lines_per_page: int = 12, max_chars_per_page: int = 600):
+    def __init__(self, max_lines_per_page: int = 12, max_chars_per_page: int = 600,
+                 layout: Optional['LayoutEstimator'] = None):
         # Reduced limits for better vertical space management
         self.max_lines_per_page = max_lines_per_page
         self.max_chars_per_page = max_chars_per_page
-        
-    def split_content(self, content: str) -> List[str]:
+        # Optional width-based measure: page length is counted in display
+        # cells and each line weighs as many rows as it wraps to
+        self.layout = layout
+    
+    def split_content(self, content: Source) -> List[str]:
         """Split content into pages based on various heuristics"""
+        return list(self.iter_pages(content))
+    
+    def iter_pages(self, content: Source) -> Iterator[str]:
+        """Yield page strings; each page is materialized only when reached"""
+        index, spans = self.split_spans(content)
+        for first, last in _pairs(spans):
+            yield index.page(first, last)
+    
+    def split_spans(self, content: Source) -> Tuple[_LineIndex, array]:
+        """Split content into pages as (first, last) line ranges
+
+        Returns the line index over content and a flat array('L') of
+        page ranges, already trimmed of blank leading/trailing lines.
+        """
+        index = self.build_index(content)
+        return index, self.split_index(index)
+    
+    def build_index(self, content: Source) -> _LineIndex:
+        """Classify and weigh every line of content once"""
+        if self.layout is None:
+            return _LineIndex(content, self._calculate_line_weight)
+        return _LineIndex(content, self._layout_line_weight, self.layout.width)
+    
+    def split_index(self, index: _LineIndex) -> array:
+        """Page ranges for an already built line index
+
+        The index only depends on the layout, so one index can be split
+        under many different page limits.
+        """
         # Always use smart splitting regardless of --- presence
         # This ensures vertical space constraints are respected
-        if '---' in content:
+        if index.source.find('---' if index.is_text else b'---') != -1:
             # First split by explicit breaks, then intelligently re-split if needed
-            initial_pages = self._split_by_breaks(content)
-            pages = []
-            for page in initial_pages:
-                if self._is_page_too_long(page):
-                    sub_pages = self._smart_split_single_page(page)
-                    pages.extend(sub_pages)
+            pages = array('L')
+            for first, last in _pairs(self._split_by_breaks(index)):
+                if self._is_page_too_long(index, first, last):
+                    pages.extend(self._smart_split_single_page(index, first, last))
                 else:
-                    pages.append(page)
+                    pages.extend((first, last))
         else:
             # Smart split from the beginning
-            pages = self._smart_split(content)
-            
+            pages = self._smart_split(index, 0, len(index))
+        
         # Final pass: ensure no page exceeds limits with weighted line counting
-        final_pages = []
-        for page in pages:
-            if self._is_page_too_long_weighted(page):
-                sub_pages = self._split_long_page_smart(page)
-                final_pages.extend(sub_pages)
+        final_pages = array('L')
+        for first, last in _pairs(pages):
+            if self._is_page_too_long_weighted(index, first, last):
+                final_pages.extend(self._split_long_page_smart(index, first, last))
             else:
-                final_pages.append(page)
-                
-        return [page.strip() for page in final_pages if page.strip()]
+                final_pages.extend((first, last))
         
-    def _split_by_breaks(self, content: str) -> List[str]:
+        return self._trim(index, final_pages)
+    
+    def _trim(self, index: _LineIndex, spans: array) -> array:
+        """Drop blank lines at page edges and pages that are entirely blank"""
+        flags = index.flags
+        trimmed = array('L')
+        for first, last in _pairs(spans):
+            while first < last and flags[first] & BLANK:
+                first += 1
+            while last > first and flags[last - 1] & BLANK:
+                last -= 1
+            if first < last:
+                trimmed.extend((first, last))
+        return trimmed
+    
+    def _split_by_breaks(self, index: _LineIndex) -> array:
         """Split content by explicit page breaks (---)"""
-        # Split by --- but preserve it for Marp
-        pages = re.split(r'\n---\n', content)
+        # Same pages as re.split(r'\n---\n', content): a '---' line needs a
+        # newline on both sides, and the newline consumed by one break
+        # cannot start the next. Breaks inside a fenced block are left to it.
+        flags = index.flags
+        last_line = len(index) - 1
+        pages = array('L')
+        start = 0
+        previous_was_break = False
+        for i in range(len(index)):
+            if (flags[i] & PAGE_BREAK and 0 < i < last_line and not previous_was_break and
+                    index.block_at(i) < 0):
+                pages.extend((start, i))
+                start = i + 1
+                previous_was_break = True
+            else:
+                previous_was_break = False
+        pages.extend((start, len(index)))
         return pages
+    
+    def _has_content(self, index: _LineIndex, first: int, last: int) -> bool:
+        flags = index.flags
+        return any(not flags[i] & BLANK for i in range(first, last))
+    
+    def _units(self, index: _LineIndex, first: int, last: int) -> Iterator[Tuple[int, int, bool]]:
+        """Yield (start, end, is_block) for each unit of lines [first, last)
+
+        A unit is a whole fenced block or table, clipped to the range, or
+        else a single line. Splitting only ever cuts between units.
+        """
+        starts, ends = index.block_starts, index.block_ends
+        k = bisect_right(starts, first) - 1
+        i = first
+        if k >= 0 and first < ends[k]:
+            i = min(ends[k], last)
+            yield first, i, True
+        k += 1
+        while i < last:
+            block_start = min(starts[k], last) if k < len(starts) else last
+            for line in range(i, block_start):
+                yield line, line + 1, False
+            if block_start == last:
+                return
+            i = min(ends[k], last)
+            yield block_start, i, True
+            k += 1
+    
+    def _split_block(self, index: _LineIndex, first: int, last: int) -> array:
+        """Pages for lines [first, last) of one block that is too long for a page
+
+        Diagrams stay whole on a slide of their own. Tables are cut between
+        body rows and code blocks between lines, each cut leaving room for
+        the header rows or fences that page() adds back.
+        """
+        k = index.block_at(first)
+        kind = index.block_kinds[k]
+        if kind == DIAGRAM:
+            return array('L', (first, last))
         
-    def _smart_split_single_page(self, content: str) -> List[str]:
+        weights = index.weights
+        start, end = index.block_starts[k], index.block_ends[k]
+        if kind == TABLE:
+            # Cut only below the header; continuation pages repeat it
+            lowest, highest = start + TABLE_HEADER_LINES, end
+            head, tail = sum(weights[start:lowest]), 0.0
+        else:
+            # Keep a line on each side of a cut between the fences
+            lowest, highest = start + 1, end - 1
+            head, tail = weights[start], weights[end - 1]
+        
+        pages = array('L')
+        page_start = first
+        page_weight = 0.0 if first == start else head
+        for i in range(first, last):
+            if (max(page_start, lowest) < i < highest and
+                    page_weight + weights[i] + tail > self.max_lines_per_page):
+                pages.extend((page_start, i))
+                page_start, page_weight = i, head
+            page_weight += weights[i]
+        pages.extend((page_start, last))
+        return pages
+    
+    def _smart_split_single_page(self, index: _LineIndex, first: int, last: int) -> array:
         """Intelligently split a single page that might be too long"""
-        lines = content.split('\n')
+        flags = index.flags
         
         # Look for natural breakpoints
         breakpoints = []
-        for i, line in enumerate(lines):
+        for i, end, block in self._units(index, first, last):
+            if block:
+                # Code block boundaries: before the opening fence and after the closing one
+                if flags[i] & FENCE:
+                    breakpoints.append(i)
+                    if end < last:
+                        breakpoints.append(end)
             # Major headings (# ##)
-            if line.strip().startswith(('# ', '## ')):
-                breakpoints.append(i)
-            # Code block boundaries
-            elif line.strip().startswith('```'):
+            elif flags[i] & MAJOR_HEADING:
                 breakpoints.append(i)
             # List items after a gap
-            elif (line.strip().startswith(('- ', '* ', '1. ')) and 
-                  i > 0 and not lines[i-1].strip()):
+            elif (flags[i] & (BULLET | NUMBERED) and
+                  i > first and flags[i - 1] & BLANK):
                 breakpoints.append(i)
-                
+        
         # If no natural breakpoints, fall back to line-based splitting
         if not breakpoints:
-            return self._split_long_page_smart(content)
-            
+            return self._split_long_page_smart(index, first, last)
+        
         # Create pages using breakpoints
-        pages = []
-        start = 0
+        pages = array('L')
+        start = first
         for bp in breakpoints:
             if bp > start:
-                candidate_page = '\n'.join(lines[start:bp])
-                if candidate_page.strip():
-                    pages.append(candidate_page)
+                if self._has_content(index, start, bp):
+                    pages.extend((start, bp))
                 start = bp
-                
+        
         # Add remaining content
-        if start < len(lines):
-            remaining = '\n'.join(lines[start:])
-            if remaining.strip():
-                pages.append(remaining)
-                
-        return pages
+        if start < last and self._has_content(index, start, last):
+            pages.extend((start, last))
         
-    def _smart_split(self, content: str) -> List[str]:
+        return pages
+    
+    def _smart_split(self, index: _LineIndex, first: int, last: int) -> array:
         """Intelligently split content based on structure"""
-        lines = content.split('\n')
-        pages = []
-        current_page = []
+        flags = index.flags
+        weights = index.weights
+        pages = array('L')
+        current_start = first
+        current_lines = 0
         current_weighted_lines = 0
         
-        for line in lines:
-            # Calculate weighted line value
-            line_weight = self._calculate_line_weight(line)
+        for i, end, block in self._units(index, first, last):
+            # Calculate weighted line value; a block weighs as much as its lines
+            line_weight = sum(weights[i:end]) if block else weights[i]
+            
+            # Blocks too long for any page get slides of their own
+            if block and line_weight > self.max_lines_per_page:
+                if current_lines:
+                    pages.extend((current_start, i))
+                pages.extend(self._split_block(index, i, end))
+                current_start, current_lines = end, 0
+                current_weighted_lines = 0
+                continue
             
             # Check if this is a major heading (# or ##)
-            is_major_heading = line.strip().startswith(('# ', '## '))
+            is_major_heading = flags[i] & MAJOR_HEADING
             
             # Start new page on major headings if current page has content
-            if is_major_heading and current_page and current_weighted_lines > 3:
-                pages.append('\n'.join(current_page))
-                current_page = [line]
+            if is_major_heading and current_lines and current_weighted_lines > 3:
+                pages.extend((current_start, i))
+                current_start, current_lines = i, end - i
                 current_weighted_lines = line_weight
             # Check if adding this line would exceed weighted limits
             elif current_weighted_lines + line_weight > self.max_lines_per_page:
                 # Start new page
-                if current_page:  # Only if we have content
-                    pages.append('\n'.join(current_page))
-                current_page = [line]
+                if current_lines:  # Only if we have content
+                    pages.extend((current_start, i))
+                current_start, current_lines = i, end - i
                 current_weighted_lines = line_weight
             else:
                 # Add to current page
-                current_page.append(line)
+                current_lines += end - i
                 current_weighted_lines += line_weight
-                
+        
         # Don't forget the last page
-        if current_page:
-            pages.append('\n'.join(current_page))
-            
-        return pages
+        if current_lines:
+            pages.extend((current_start, current_start + current_lines))
         
+        return pages
+    
     def _calculate_line_weight(self, line: str) -> float:
         """Calculate weighted line value based on content type"""
-        if not line.strip():
+        stripped = line.strip()
+        if not stripped:
             return 0.1  # Empty lines take minimal space
-        elif line.strip().startswith('```'):
+        elif stripped.startswith('```'):
             return 0.5  # Code block delimiters
         elif '|' in line and line.count('|') >= 2:
             return 1.3  # Table rows take more space
-        elif re.match(r'!\[.*?\]\(.*?\)', line):
+        elif line.startswith('![') and _IMAGE.match(line):
             return 3.0  # Images take significant space
-        elif line.strip().startswith('#'):
+        elif stripped.startswith('#'):
             return 1.2  # Headings are larger
         else:
             return 1.0  # Regular content
-            
-    def _is_page_too_long_weighted(self, page: str) -> bool:
+    
+    def _layout_line_weight(self, line: str) -> float:
+        """Line weight scaled by the number of rendered lines it wraps to"""
+        return self._calculate_line_weight(line) * self.layout.wrapped_lines(line)
+    
+    def _is_page_too_long_weighted(self, index: _LineIndex, first: int, last: int) -> bool:
         """Check if a page exceeds limits using weighted line counting"""
-        lines = page.split('\n')
-        weighted_lines = sum(self._calculate_line_weight(line) for line in lines)
+        weighted_lines = sum(index.weights[first:last])
         
         # Check both weighted lines and character count
-        return (weighted_lines > self.max_lines_per_page or 
-                len(page) > self.max_chars_per_page)
-        
-    def _is_page_too_long(self, page: str) -> bool:
+        return (weighted_lines > self.max_lines_per_page or
+                index.char_length(first, last) > self.max_chars_per_page)
+    
+    def _is_page_too_long(self, index: _LineIndex, first: int, last: int) -> bool:
         """Check if a page exceeds the limits"""
-        lines = page.split('\n')
-        non_empty_lines = [line for line in lines if line.strip()]
-        return (len(non_empty_lines) > self.max_lines_per_page or 
-                len(page) > self.max_chars_per_page)
-        
-    def _split_long_page_smart(self, page: str) -> List[str]:
+        flags = index.flags
+        non_empty_lines = sum(1 for i in range(first, last) if not flags[i] & BLANK)
+        return (non_empty_lines > self.max_lines_per_page or
+                index.char_length(first, last) > self.max_chars_per_page)
+    
+    def _split_long_page_smart(self, index: _LineIndex, first: int, last: int) -> array:
         """Split a long page into smaller chunks with smart breakpoints"""
-        lines = page.split('\n')
-        sub_pages = []
-        current_sub = []
+        flags = index.flags
+        weights = index.weights
+        sub_pages = array('L')
+        current_start = first
+        current_lines = 0
         current_weighted_lines = 0
         
-        for i, line in enumerate(lines):
-            line_weight = self._calculate_line_weight(line)
+        for i, end, block in self._units(index, first, last):
+            line_weight = sum(weights[i:end]) if block else weights[i]
+            line_flags = flags[i]
+            
+            # Blocks too long for any page get slides of their own
+            if block and line_weight > self.max_lines_per_page:
+                if current_lines:
+                    sub_pages.extend((current_start, i))
+                sub_pages.extend(self._split_block(index, i, end))
+                current_start, current_lines = end, 0
+                current_weighted_lines = 0
+                continue
             
             # Look for good breakpoint opportunities
             is_good_breakpoint = (
-                line.strip().startswith(('# ', '## ', '### ')) or  # Headers
-                line.strip().startswith('```') or  # Code blocks
-                (line.strip().startswith(('- ', '* ')) and i > 0 and not lines[i-1].strip()) or  # List starts
-                line.strip() == '' and i > 0 and lines[i-1].strip()  # Natural paragraph breaks
+                line_flags & HEADING or  # Headers
+                line_flags & FENCE or  # Code blocks
+                (line_flags & BULLET and i > first and flags[i - 1] & BLANK) or  # List starts
+                line_flags & BLANK and i > first and not flags[i - 1] & BLANK  # Natural paragraph breaks
             )
             
             # If we're near the limit and find a good breakpoint, split here
-            if (current_weighted_lines + line_weight > self.max_lines_per_page * 0.8 and 
-                is_good_breakpoint and current_sub):
-                sub_pages.append('\n'.join(current_sub))
-                current_sub = [line]
+            if (current_weighted_lines + line_weight > self.max_lines_per_page * 0.8 and
+                is_good_breakpoint and current_lines):
+                sub_pages.extend((current_start, i))
+                current_start, current_lines = i, end - i
                 current_weighted_lines = line_weight
             # Hard limit: must split even without good breakpoint
             elif current_weighted_lines + line_weight > self.max_lines_per_page:
-                if current_sub:
-                    sub_pages.append('\n'.join(current_sub))
-                current_sub = [line]
+                if current_lines:
+                    sub_pages.extend((current_start, i))
+                current_start, current_lines = i, end - i
                 current_weighted_lines = line_weight
             else:
-                current_sub.append(line)
+                current_lines += end - i
                 current_weighted_lines += line_weight
-                
-        if current_sub:
-            sub_pages.append('\n'.join(current_sub))
-            
-        return sub_pages 
\ No newline at end of file
+        
+        if current_lines:
+            sub_pages.extend((current_start, current_start + current_lines))
+        
+        return sub_pages
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Pipeline Module
+Bounded producer/consumer runner that overlaps page formatting with page writes
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from .aio import io_executor
+
+T = TypeVar('T')
+R = TypeVar('R')
+P = TypeVar('P')
+
+# Pages waiting between the producer and the formatters
+PIPELINE_DEPTH = 64
+# Formatter threads; formatting is pure Python, so more mostly adds contention
+FORMAT_WORKERS = 2
+# Formatted pages waiting for, or being written by, the I/O pool
+MAX_PENDING_WRITES = 64
+
+_DONE = object()
+
+
+def run_pipeline(items: Iterable[T], transform: Callable[[int, T], Tuple[R, P]],
+                 write: Callable[[P], None], depth: int = PIPELINE_DEPTH,
+                 workers: int = FORMAT_WORKERS) -> List[R]:
+    """Transform items on worker threads and write each result on the I/O pool
+
+    The calling thread produces: it draws items (numbered from 1) into a
+    queue of at most depth entries, so a lazy iterable is consumed only as
+    fast as the workers keep up. transform(n, item) returns (kept, payload);
+    payload is handed to write() on the shared I/O pool while later items
+    are still being transformed, and kept is returned in item order.
+
+    The first exception from any stage stops the producer and is re-raised
+    once every thread has finished.
+    """
+    pending: 'queue.Queue' = queue.Queue(maxsize=depth)
+    writes_slots = threading.BoundedSemaphore(MAX_PENDING_WRITES)
+    failed = threading.Event()
+    errors: List[BaseException] = []
+    results = {}
+    writes = []
+    writes_lock = threading.Lock()
+    
+    def fail(error: BaseException):
+        errors.append(error)
+        failed.set()
+    
+    def written(future):
+        writes_slots.release()
+        if future.exception() is not None:
+            failed.set()
+    
+    def work():
+        while True:
+            job = pending.get()
+            if job is _DONE:
+                return
+            if failed.is_set():
+                continue   # keep draining so the producer never blocks
+            n, item = job
+            try:
+                kept, payload = transform(n, item)
+                results[n] = kept
+                writes_slots.acquire()
+                future = io_executor().submit(write, payload)
+                with writes_lock:
+                    writes.append(future)
+                future.add_done_callback(written)
+            except BaseException as e:
+                fail(e)
+    
+    threads = [threading.Thread(target=work, name=f'marp-format-{i}', daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for n, item in enumerate(items, 1):
+            if failed.is_set():
+                break
+            pending.put((n, item))
+    except BaseException as e:
+        fail(e)
+    finally:
+        for _ in threads:
+            pending.put(_DONE)
+        for thread in threads:
+            thread.join()
+        # Waits for every write, keeping the first failure
+        errors.extend(error for error in (future.exception() for future in writes) if error is not None)
+    
+    if errors:
+        raise errors[0]
+    return [results[n] for n in sorted(results)]
\ No newline at end of file
@@ -1,8 +1,14 @@
 """Regenerate master and index files from existing slide structure"""
 
+import hashlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from .marp_formatter import MarpFormatter
+from .master_index import INDEX_FILE, MASTER_FILE, SEPARATOR, MasterIndex, SlideEntry
+from .mmap_reader import read_page, read_title
+from .instrumentation import StageHooks
+from .deck_layout import candidate_folders, make_slide_folder, number_width, relative_folder, slide_number
+from .renumber import apply_renames, numbered
 
 
 class SlideRegenerator:
@@ -10,16 +16,24 @@ class SlideRegenerator:
     
     def __init__(self):
         self.formatter = MarpFormatter()
+        self.hooks = StageHooks()
+        # Per-folder (stat signature, stripped body, title) for incremental runs
+        self._page_cache: Dict[Path, Tuple[Tuple[int, int], str, str]] = {}
+        # Per-output (content, stat signature) as of this regenerator's last write
+        self._written: Dict[Path, Tuple[str, Tuple[int, int]]] = {}
     
     def get_slide_folders(self, presentation_dir: Path) -> List[Path]:
-        """Get all folders containing page.md files, sorted by numeric prefix"""
+        """Get all folders containing page.md files, sorted by numeric prefix
+
+        Folders inside chapter-NN/ directories of a sharded deck are included.
+        """
         folders = []
-        for item in presentation_dir.iterdir():
-            if item.is_dir() and (item / "page.md").exists():
+        for item in candidate_folders(presentation_dir):
+            if (item / "page.md").exists():
                 folders.append(item)
         
-        # Sort folders by their numeric prefix
-        folders.sort(key=lambda x: int(x.name.split('-')[0]) if x.name.split('-')[0].isdigit() else 999)
+        # Sort folders by their numeric prefix; unnumbered ones go last
+        folders.sort(key=lambda x: (slide_number(x.name) is None, slide_number(x.name) or 0))
         return folders
     
     def extract_title(self, page_content: str) -> str:
@@ -43,42 +57,125 @@ class SlideRegenerator:
         """Regenerate master_slide.md from existing slides"""
         folders = self.get_slide_folders(presentation_dir)
         
-        # Get absolute paths for all page.md files
-        page_paths = []
+        # Read every page body, with its title for the offset index
+        bodies = []
+        titles = []
         for folder in folders:
-            page_path = folder / "page.md"
-            page_paths.append(str(page_path.absolute()))
+            body, title = read_page(folder / "page.md")
+            bodies.append(body)
+            titles.append(title)
         
         # Generate master slide content
-        master_content = self.formatter.format_master_slide(page_paths, theme)
+        master_content = self.formatter.combine_master(bodies, theme)
         master_file = presentation_dir / "master_slide.md"
         master_file.write_text(master_content, encoding='utf-8')
         
-        return len(page_paths)
+        index_file = presentation_dir / INDEX_FILE
+        index_file.write_text(self._master_index(presentation_dir, folders, bodies, titles, theme).dumps(),
+                              encoding='utf-8')
+        
+        return len(folders)
+    
+    def _master_index(self, presentation_dir: Path, folders: List[Path], bodies: List[str],
+                      titles: List[str], theme: str) -> MasterIndex:
+        """Offset index for the master built from bodies"""
+        return MasterIndex.build(presentation_dir, self.formatter.master_header(theme), bodies, titles,
+                                 [relative_folder(folder, presentation_dir) for folder in folders])
     
     def regenerate_index(self, presentation_dir: Path) -> int:
         """Regenerate index.md from existing slides"""
         folders = self.get_slide_folders(presentation_dir)
         
+        titles = []
+        for folder in folders:
+            # Read only as far as the title
+            titles.append(read_title(folder / "page.md"))
+        
+        # Write index file
+        index_file = presentation_dir / "index.md"
+        index_file.write_text(self._format_index(presentation_dir, folders, titles), encoding='utf-8')
+        
+        return len(folders)
+    
+    def _format_index(self, presentation_dir: Path, folders: List[Path], titles: List[str]) -> str:
+        """Build index.md content from folders and their titles"""
         # Generate presentation name from directory
         presentation_name = presentation_dir.name.replace('-', ' ').title()
         index_content = [f"# {presentation_name} - Slide Index", ""]
         
-        for i, folder in enumerate(folders, 1):
-            # Read page content to extract title
-            page_file = folder / "page.md"
-            content = page_file.read_text(encoding='utf-8')
-            title = self.extract_title(content)
-            
+        for i, (folder, title) in enumerate(zip(folders, titles), 1):
             # Get relative path for index
             relative_path = folder.relative_to(presentation_dir)
             index_content.append(f"{i}. **{title}** - `{relative_path}/page.md`")
         
-        # Write index file
-        index_file = presentation_dir / "index.md"
-        index_file.write_text('\n'.join(index_content), encoding='utf-8')
+        return '\n'.join(index_content)
+    
+    def regenerate_incremental(self, presentation_dir: Path, theme: str = "gaia",
+                               changed: Optional[Iterable[Path]] = None) -> Tuple[int, int]:
+        """Patch master_slide.md and index.md, re-reading only changed pages
+
+        Pages are cached between calls. Folders listed in ``changed`` and
+        folders not seen before are re-read; when ``changed`` is None, a
+        page is re-read if its mtime or size differs from the cached one.
+        Files are only rewritten when their content actually changes or
+        the copy on disk was edited or removed since the last write.
+        Returns (number of slides, number of pages re-read).
+        """
+        presentation_dir = Path(presentation_dir)
+        folders = self.get_slide_folders(presentation_dir)
+        changed = None if changed is None else {Path(p) for p in changed}
         
-        return len(folders)
+        reread = 0
+        bodies = []
+        titles = []
+        for folder in folders:
+            page_file = folder / "page.md"
+            cached = self._page_cache.get(folder)
+            if cached is None:
+                stale = True
+            elif changed is not None:
+                stale = folder in changed
+            else:
+                stale = cached[0] != self._signature(page_file)
+            
+            if stale:
+                cached = (self._signature(page_file),) + read_page(page_file)
+                self._page_cache[folder] = cached
+                reread += 1
+            
+            bodies.append(cached[1])
+            titles.append(cached[2])
+        
+        # Forget folders that were removed or renamed
+        live = set(folders)
+        for folder in [f for f in self._page_cache if presentation_dir in f.parents and f not in live]:
+            del self._page_cache[folder]
+        
+        self._write_if_changed(presentation_dir / "master_slide.md",
+                               self.formatter.combine_master(bodies, theme))
+        self._write_if_changed(presentation_dir / INDEX_FILE,
+                               self._master_index(presentation_dir, folders, bodies, titles, theme).dumps())
+        self._write_if_changed(presentation_dir / "index.md",
+                               self._format_index(presentation_dir, folders, titles))
+        
+        return len(folders), reread
+    
+    def _signature(self, page_file: Path) -> Tuple[int, int]:
+        stat = page_file.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _write_if_changed(self, path: Path, content: str):
+        # Skip only if the file on disk is still the one written last time;
+        # an edited or deleted output is rewritten
+        written = self._written.get(path)
+        if written is not None and written[0] == content:
+            try:
+                if self._signature(path) == written[1]:
+                    return
+            except OSError:
+                pass
+        path.write_text(content, encoding='utf-8')
+        self._written[path] = (content, self._signature(path))
     
     def regenerate_all(self, presentation_dir: str, theme: str = "gaia") -> None:
         """Regenerate both master_slide.md and index.md"""
@@ -88,9 +185,198 @@ class SlideRegenerator:
             raise ValueError(f"Presentation directory not found: {presentation_dir}")
         
         # Regenerate master slide
-        num_slides = self.regenerate_master(presentation_path, theme)
+        with self.hooks.stage("master"):
+            num_slides = self.regenerate_master(presentation_path, theme)
         print(f"✓ Regenerated master_slide.md with {num_slides} slides")
         
         # Regenerate index
-        num_indexed = self.regenerate_index(presentation_path)
-        print(f"✓ Regenerated index.md with {num_indexed} entries") 
\ No newline at end of file
+        with self.hooks.stage("index"):
+            num_indexed = self.regenerate_index(presentation_path)
+        print(f"✓ Regenerated index.md with {num_indexed} entries")
+    
+    async def regenerate_all_async(self, presentation_dir: str, theme: str = "gaia") -> None:
+        """Async regenerate_all: pages are read in concurrent batches on the I/O pool
+
+        Each page.md is read once for both its body and its title.
+        """
+        # Only async callers pay for importing asyncio
+        import asyncio
+        from .aio import batches, build_slot, run_io
+        
+        presentation_path = Path(presentation_dir)
+        
+        async with build_slot():
+            if not await run_io(presentation_path.exists):
+                raise ValueError(f"Presentation directory not found: {presentation_dir}")
+            
+            folders = await run_io(self.get_slide_folders, presentation_path)
+            results = await asyncio.gather(*(run_io(self._read_pages, batch) for batch in batches(folders)))
+            pages = [page for batch in results for page in batch]
+            bodies = [body for body, _ in pages]
+            titles = [title for _, title in pages]
+            
+            with self.hooks.stage("master"):
+                master_content = self.formatter.combine_master(bodies, theme)
+                await run_io(self._write_text, presentation_path / "master_slide.md", master_content)
+                master_index = self._master_index(presentation_path, folders, bodies, titles, theme)
+                # dumps() stamps the master's stat, so it runs after the write
+                await run_io(lambda: self._write_text(presentation_path / INDEX_FILE, master_index.dumps()))
+            print(f"✓ Regenerated master_slide.md with {len(folders)} slides")
+            
+            with self.hooks.stage("index"):
+                await run_io(self._write_text, presentation_path / "index.md",
+                             self._format_index(presentation_path, folders, titles))
+            print(f"✓ Regenerated index.md with {len(folders)} entries")
+    
+    def insert_slide(self, presentation_dir: str, position: int, content: str,
+                     theme: str = "gaia") -> Tuple[str, int]:
+        """Add a slide at position (1-based), shifting the ones after it
+
+        Returns (new folder name, number of folders renamed).
+        """
+        from .slide_generator import SlideGenerator
+        
+        presentation_path = Path(presentation_dir)
+        order, index = self._current_order(presentation_path)
+        if not 1 <= position <= len(order) + 1:
+            raise ValueError(f"Position must be between 1 and {len(order) + 1}")
+        
+        sources = list(range(len(order)))
+        sources.insert(position - 1, None)
+        name = numbered(SlideGenerator(presentation_dir)._extract_title(content, position), position,
+                        number_width(len(sources)), self._chapter_at(order, sources, position))
+        page = self.formatter.format_page(content, position, len(order) + 1, theme)
+        renamed = self._restructure(presentation_path, theme, order, index, sources, new_page=(name, page))
+        return name, renamed
+    
+    def move_slide(self, presentation_dir: str, source: int, target: int, theme: str = "gaia") -> int:
+        """Move the slide at position source to position target (1-based); returns folders renamed"""
+        presentation_path = Path(presentation_dir)
+        order, index = self._current_order(presentation_path)
+        for position in (source, target):
+            if not 1 <= position <= len(order):
+                raise ValueError(f"Position must be between 1 and {len(order)}")
+        
+        sources = list(range(len(order)))
+        moved = sources.pop(source - 1)
+        sources.insert(target - 1, None)
+        chapter = self._chapter_at(order, sources, target)
+        sources[target - 1] = moved
+        return self._restructure(presentation_path, theme, order, index, sources, chapters={moved: chapter})
+    
+    def delete_slide(self, presentation_dir: str, position: int, theme: str = "gaia") -> Tuple[str, int]:
+        """Delete the slide at position (1-based) with its folder
+
+        Returns (deleted folder name, number of folders renamed).
+        """
+        presentation_path = Path(presentation_dir)
+        order, index = self._current_order(presentation_path)
+        if not 1 <= position <= len(order):
+            raise ValueError(f"Position must be between 1 and {len(order)}")
+        
+        sources = list(range(len(order)))
+        del sources[position - 1]
+        return order[position - 1], self._restructure(presentation_path, theme, order, index, sources,
+                                                      remove=order[position - 1])
+    
+    def _current_order(self, presentation_dir: Path) -> Tuple[List[str], Optional[MasterIndex]]:
+        """Slide folder paths in slide order, with the master offset index when it is current
+
+        The index already lists every folder in order, so a structural edit
+        does not have to list the presentation directory.
+        """
+        if not presentation_dir.exists():
+            raise ValueError(f"Presentation directory not found: {presentation_dir}")
+        try:
+            index = MasterIndex.open(presentation_dir)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            index = None
+        if index is not None and index.is_current():
+            return [entry.folder for entry in index.entries], index
+        folders = self.get_slide_folders(presentation_dir)
+        return [relative_folder(folder, presentation_dir) for folder in folders], None
+    
+    def _chapter_at(self, order: List[str], sources: List[Optional[int]], position: int) -> str:
+        """Chapter for a slide placed at position: that of the slide before it, or after it when first"""
+        neighbours = sources[position - 2::-1] if position > 1 else sources[position:]
+        for source in neighbours:
+            if source is not None:
+                return order[source].rpartition('/')[0]
+        return ''
+    
+    def _restructure(self, presentation_dir: Path, theme: str, order: List[str], index: Optional[MasterIndex],
+                     sources: List[Optional[int]], new_page: Optional[Tuple[str, str]] = None,
+                     remove: Optional[str] = None, chapters: Optional[Dict[int, str]] = None) -> int:
+        """Put slides in a new order and patch master_slide.md and index.md to match
+
+        sources[i] is the current position of the slide that ends up at
+        position i, or None for the new page; chapters moves slides (by
+        current position) into another chapter directory. Only folders
+        whose path changes are renamed, all of them when the number width
+        changes. With a current offset index, the master is spliced from its
+        own bytes and no page.md is read; otherwise the master and index
+        are regenerated incrementally.
+        Returns the number of folders renamed.
+        """
+        chapters = chapters or {}
+        renames = []
+        names = []
+        width = number_width(len(sources))
+        for number, source in enumerate(sources, 1):
+            if source is None:
+                names.append(new_page[0])
+                continue
+            name = numbered(order[source], number, width, chapters.get(source))
+            if name != order[source]:
+                renames.append((order[source], name))
+            names.append(name)
+        
+        apply_renames(presentation_dir, renames, remove)
+        new_body = new_title = None
+        if new_page is not None:
+            page_file = presentation_dir / new_page[0] / "page.md"
+            # Same layout as generated slides, so asset checks find assets/
+            make_slide_folder(page_file.parent)
+            page_file.write_text(new_page[1], encoding='utf-8')
+            new_body, new_title = read_page(page_file)
+        
+        if index is None:
+            self.regenerate_incremental(presentation_dir, theme)
+            return len(renames)
+        
+        master = (presentation_dir / MASTER_FILE).read_bytes()
+        if index.entries:
+            header = master[:index.entries[0].offset]
+        else:
+            header = self.formatter.master_header(theme).encode('utf-8')
+        
+        parts = [header]
+        entries = []
+        offset = len(header)
+        for name, source in zip(names, sources):
+            if source is None:
+                data = new_body.encode('utf-8')
+                entry = SlideEntry(offset, len(data), hashlib.sha256(data).hexdigest(), new_title, name)
+            else:
+                old = index.entries[source]
+                data = master[old.offset:old.offset + old.length]
+                entry = SlideEntry(offset, old.length, old.sha256, old.title, name)
+            if entries:
+                parts.append(SEPARATOR)
+            parts.append(data)
+            entries.append(entry)
+            offset += len(data) + len(SEPARATOR)
+        
+        self._write_if_changed(presentation_dir / MASTER_FILE, b''.join(parts).decode('utf-8'))
+        self._write_if_changed(presentation_dir / INDEX_FILE, MasterIndex(presentation_dir, entries).dumps())
+        self._write_if_changed(presentation_dir / "index.md",
+                               self._format_index(presentation_dir, [presentation_dir / name for name in names],
+                                                  [entry.title for entry in entries]))
+        return len(renames)
+    
+    def _read_pages(self, folders: List[Path]) -> List[Tuple[str, str]]:
+        """(body, title) of each folder's page.md"""
+        return [read_page(folder / "page.md") for folder in folders]
+    
+    def _write_text(self, path: Path, content: str):
+        path.write_text(content, encoding='utf-8') 
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Renumber Module
+Applies the folder renames that keep NN- prefixes in slide order
+"""
+
+import os
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+from .deck_layout import MIN_WIDTH
+
+_PREFIX = re.compile(r'^\d+-')
+
+
+def numbered(folder: str, number: int, width: int = MIN_WIDTH, chapter: Optional[str] = None) -> str:
+    """A slide folder path with its numeric prefix replaced, optionally moved to another chapter"""
+    parent, _, name = folder.rpartition('/')
+    if chapter is not None:
+        parent = chapter
+    name = f"{number:0{width}d}-{_PREFIX.sub('', name, count=1)}"
+    return f"{parent}/{name}" if parent else name
+
+
+def _sibling(folder: str, name: str) -> str:
+    """name in the same directory as folder, so renames stay within one directory when they can"""
+    parent = folder.rpartition('/')[0]
+    return f"{parent}/{name}" if parent else name
+
+
+def apply_renames(presentation_dir: Union[str, Path], renames: Iterable[Tuple[str, str]],
+                  remove: Optional[str] = None):
+    """Rename folders (paths relative to the deck) in two phases through temporary names, then remove one folder
+
+    Every source first moves to a unique temporary name and then to its
+    target, so swaps and shifts never collide. If any rename fails, the
+    ones already done are undone in reverse order. The removed folder is
+    parked under a temporary name too and only deleted once all renames
+    succeeded. Chapter directories left empty are removed.
+    """
+    presentation_dir = Path(presentation_dir)
+    renames = list(renames)
+    sources = {old for old, _ in renames} | ({remove} if remove else set())
+    for _, new in renames:
+        if new not in sources and (presentation_dir / new).exists():
+            raise ValueError(f"Cannot rename to {new}: a folder with that name already exists")
+    
+    token = uuid.uuid4().hex[:8]
+    moves = [(old, _sibling(old, f".renumber-{token}-{i}")) for i, (old, _) in enumerate(renames)]
+    moves += [(temp, new) for (_, temp), (_, new) in zip(moves, renames)]
+    parked = _sibling(remove, f".renumber-{token}-removed") if remove else None
+    if remove:
+        moves.insert(0, (remove, parked))
+    
+    done = []
+    try:
+        for old, new in moves:
+            os.rename(presentation_dir / old, presentation_dir / new)
+            done.append((old, new))
+    except OSError:
+        for old, new in reversed(done):
+            os.rename(presentation_dir / new, presentation_dir / old)
+        raise
+    if remove:
+        shutil.rmtree(presentation_dir / parked)
+    for chapter in {source.rpartition('/')[0] for source in sources} - {''}:
+        try:
+            os.rmdir(presentation_dir / chapter)
+        except OSError:
+            pass  # still holds slides
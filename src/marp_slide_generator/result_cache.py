@@ -0,0 +1,152 @@
+"""
+Result Cache Module
+Content-addressed, size-bounded LRU cache of generation results on disk
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+from . import __version__
+
+# Total bytes kept under a cache root before least recently used entries go
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+META_FILE = "entry.json"
+# Revision of the generated output for a given input. __version__ is not
+# bumped between releases, so bump this whenever a change alters how
+# content is split into pages or how pages are formatted; cached results
+# from an older revision then stop matching.
+# 2: fenced code, diagrams and tables are no longer split across pages
+OUTPUT_REVISION = 2
+
+
+def splitter_params(splitter) -> dict:
+    """The PageSplitter settings that change how content is split"""
+    return {
+        'max_lines_per_page': splitter.max_lines_per_page,
+        'max_chars_per_page': splitter.max_chars_per_page,
+        'layout_columns': splitter.layout.columns if splitter.layout else None,
+    }
+
+
+def cache_key(content, theme: str, splitter, **params) -> str:
+    """SHA-256 of the input, theme, splitter parameters, extra params, package version and output revision
+
+    content may be a str or any bytes-like buffer, such as an mmap.
+    """
+    header = json.dumps({
+        'version': __version__,
+        'revision': OUTPUT_REVISION,
+        'theme': theme,
+        'splitter': splitter_params(splitter),
+        'params': params,
+    }, sort_keys=True)
+    digest = hashlib.sha256(header.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content.encode('utf-8') if isinstance(content, str) else content)
+    return digest.hexdigest()
+
+
+def tree_size(path: Path) -> int:
+    """Total size in bytes of the files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class ResultCache:
+    """Entries under <root>/<key>/ with their metadata in entry.json
+
+    Entries are built in a scratch directory and published with a rename,
+    so readers never see a half-written one. Every hit touches entry.json;
+    once the entries together exceed max_bytes, the ones touched longest
+    ago are removed.
+    """
+    
+    def __init__(self, root: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+    
+    def entry_dir(self, key: str) -> Path:
+        return self.root / key
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Metadata of a cached entry, marking it recently used; None on a miss"""
+        meta_file = self.entry_dir(key) / META_FILE
+        try:
+            meta = json.loads(meta_file.read_text(encoding='utf-8'))
+            os.utime(meta_file)
+        except (FileNotFoundError, ValueError):
+            return None
+        return meta
+    
+    def put(self, key: str, build: Callable[[Path], dict]) -> dict:
+        """Run build(scratch_dir), store its files and returned metadata under key"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        scratch = self.root / f".tmp-{uuid.uuid4().hex}"
+        scratch.mkdir()
+        try:
+            meta = build(scratch)
+            # Count entry.json too, so metadata-only entries still take up room
+            meta['size'] = tree_size(scratch) + len(json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+            (scratch / META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+            os.rename(scratch, self.entry_dir(key))
+        except OSError:
+            shutil.rmtree(scratch, ignore_errors=True)
+            # Another process published the same key first
+            existing = self.get(key)
+            if existing is None:
+                raise
+            return existing
+        except BaseException:
+            shutil.rmtree(scratch, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+        return meta
+    
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(last used, size, key) of every published entry"""
+        found = []
+        if not self.root.is_dir():
+            return found
+        for entry in self.root.iterdir():
+            if entry.name.startswith('.'):
+                continue
+            meta_file = entry / META_FILE
+            try:
+                last_used = meta_file.stat().st_mtime
+                size = json.loads(meta_file.read_text(encoding='utf-8')).get('size', 0)
+            except (FileNotFoundError, NotADirectoryError, ValueError):
+                continue
+            found.append((last_used, size, entry.name))
+        return found
+    
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used entries until the cache fits; returns how many went"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+    
+    def discard(self, key: str):
+        """Remove one entry if it exists"""
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+    
+    def clear(self):
+        """Remove every entry"""
+        if self.root.is_dir():
+            shutil.rmtree(self.root)
\ No newline at end of file
@@ -4,38 +4,55 @@ Marp Slide Generator
 Automatically splits content into well-organized Marp slides
 """
 
-import os
 import re
-import shutil
-import click
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from .page_splitter import PageSplitter
+from .page_splitter import PageSplitter, Source, iter_lines
 from .marp_formatter import MarpFormatter
+from .deck_layout import MIN_WIDTH, Sharding, make_slide_folder, number_width
+from .instrumentation import GenerationReport, StageHooks
+from .layout import LayoutEstimator
+from .master_index import INDEX_FILE, MasterIndex
+from .mmap_reader import read_body
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .build_cache import BuildCache
 
 
 class SlideGenerator:
     """Main class for generating Marp slides from content"""
     
-    def __init__(self, output_dir: str = "output", presentation_name: str = None):
+    def __init__(self, output_dir: str = "output", presentation_name: str = None,
+                 layout: Optional[LayoutEstimator] = None):
         self.base_output_dir = Path(output_dir)
         self.presentation_name = presentation_name
         if presentation_name:
             self.output_dir = self.base_output_dir / presentation_name
         else:
             self.output_dir = self.base_output_dir
-        self.splitter = PageSplitter()
+        # A LayoutEstimator makes page limits width-aware (CJK counts double)
+        self.splitter = PageSplitter(layout=layout)
         self.formatter = MarpFormatter()
-        
+        # Stage start/end callbacks, e.g. generator.hooks.add(on_end=record)
+        self.hooks = StageHooks()
+        # Optional BuildCache: skip runs whose identical output is still on disk
+        self.build_cache: Optional['BuildCache'] = None
+        # Optional Sharding: put slide folders under chapter-NN/ directories
+        self.sharding: Optional[Sharding] = None
+        # Format and write pages concurrently instead of stage by stage
+        self.pipelined = False
+    
     def setup_directories(self):
         """Create the necessary directory structure"""
         # Clean and create output directory
         if self.output_dir.exists():
+            import shutil
             shutil.rmtree(self.output_dir)
         self.output_dir.mkdir(parents=True)
-        
-    def _extract_title(self, content: str, page_number: int) -> str:
+    
+    def _extract_title(self, content: str, page_number: int, width: int = MIN_WIDTH) -> str:
         """Extract title from page content for folder naming"""
         lines = content.strip().split('\n')
         
@@ -50,7 +67,7 @@ class SlideGenerator:
         else:
             # No header found, use default
             title = f"page{page_number}"
-            
+        
         # Clean title for filesystem use
         # Remove special characters and replace spaces with hyphens
         clean_title = re.sub(r'[^\w\s-]', '', title.lower())
@@ -60,18 +77,16 @@ class SlideGenerator:
         # Ensure title is not empty
         if not clean_title:
             clean_title = f"page{page_number}"
-            
-        # Add page number prefix to ensure uniqueness
-        folder_name = f"{page_number:02d}-{clean_title}"
         
-        return folder_name
+        # Add page number prefix to ensure uniqueness, padded so names sort in order
+        folder_name = f"{page_number:0{width}d}-{clean_title}"
         
-    def _extract_presentation_name(self, content: str) -> str:
+        return folder_name
+    
+    def _extract_presentation_name(self, content: Source) -> str:
         """Extract presentation name from the first title in content"""
-        lines = content.strip().split('\n')
-        
-        # Look for the first main header
-        for line in lines:
+        # Look for the first main header, reading no further than needed
+        for line in iter_lines(content):
             if line.strip().startswith('# '):
                 title = line.strip()[2:].strip()
                 # Clean for filesystem
@@ -79,122 +94,368 @@ class SlideGenerator:
                 clean_name = re.sub(r'[-\s]+', '-', clean_name)
                 clean_name = clean_name.strip('-')
                 return clean_name if clean_name else "presentation"
-                
+        
         return "presentation"
+    
+    def generate_slides(self, content: Source, theme: str = "default") -> int:
+        """Generate slides from content and return the number of pages
+
+        content may be a str or a UTF-8 buffer such as an mmap of the input.
+        Use generate_slides_report for timings and write statistics.
+        """
+        return self.generate_slides_report(content, theme).page_count
+    
+    def generate_slides_report(self, content: Source, theme: str = "default") -> GenerationReport:
+        """Generate slides from content and report what the run did"""
+        report = self._start_report(content)
+        stage = self.hooks.stage
+        
+        # Skip everything when an identical build's output is still intact
+        build_key = None
+        if self.build_cache is not None:
+            with stage("cache", report):
+                build_key, hit = self._lookup_build(content, theme, report)
+            if hit:
+                return report
+        
+        # Setup directories
+        with stage("setup", report):
+            self.setup_directories()
+            report.dirs_created += 1
+        
+        if self.pipelined:
+            folder_names, bodies, titles = self._generate_pipelined(content, theme, report)
+            with stage("master", report):
+                self._write_master(bodies, theme, report, titles, folder_names)
+            with stage("index", report):
+                self._generate_index_file(folder_names, titles, report)
+            if build_key is not None:
+                self.build_cache.record(build_key, self.output_dir, report.page_count)
+            return report
+        
+        # Split content into pages
+        with stage("split", report):
+            pages = self.splitter.split_content(content)
+        report.page_count = len(pages)
+        
+        # Format individual pages
+        with stage("format", report):
+            folder_names, formatted_pages = self._format_pages(pages, theme)
+        
+        # Write individual page files
+        with stage("write", report):
+            self._make_chapters(folder_names, report)
+            page_paths = self._write_pages(folder_names, formatted_pages, report)
+        
+        titles = [self._page_title(page_content, i) for i, page_content in enumerate(pages, 1)]
+        
+        # Generate master slide file
+        with stage("master", report):
+            self._generate_master_slide(page_paths, theme, report, titles, folder_names)
+        
+        # Generate index file for easy navigation
+        with stage("index", report):
+            self._generate_index_file(folder_names, titles, report)
+        
+        if build_key is not None:
+            self.build_cache.record(build_key, self.output_dir, report.page_count)
+        
+        return report
+    
+    async def generate_slides_async(self, content: Source, theme: str = "default",
+                                    executor: Optional['Executor'] = None) -> int:
+        """Async generate_slides; returns the number of pages"""
+        return (await self.generate_slides_report_async(content, theme, executor)).page_count
+    
+    async def generate_slides_report_async(self, content: Source, theme: str = "default",
+                                           executor: Optional['Executor'] = None) -> GenerationReport:
+        """Async generate_slides_report that never blocks the event loop
+
+        Splitting and formatting run on executor (the loop's default when
+        None); directory setup, page writes and the master/index files go
+        through the shared bounded I/O pool, with page writes batched.
+        A pipelined generator runs its pipeline on executor instead.
+        At most aio.MAX_CONCURRENT_BUILDS decks build at once per loop.
+        """
+        # Only async callers pay for importing asyncio
+        import asyncio
+        from .aio import batches, build_slot, run_io
+        
+        loop = asyncio.get_running_loop()
+        async with build_slot():
+            report = self._start_report(content)
+            stage = self.hooks.stage
+            
+            build_key = None
+            if self.build_cache is not None:
+                with stage("cache", report):
+                    build_key, hit = await run_io(self._lookup_build, content, theme, report)
+                if hit:
+                    return report
+            
+            with stage("setup", report):
+                await run_io(self.setup_directories)
+                report.dirs_created += 1
+            
+            if self.pipelined:
+                folder_names, bodies, titles = await loop.run_in_executor(
+                    executor, self._generate_pipelined, content, theme, report)
+                with stage("master", report):
+                    await run_io(self._write_master, bodies, theme, report, titles, folder_names)
+                with stage("index", report):
+                    await run_io(self._generate_index_file, folder_names, titles, report)
+                if build_key is not None:
+                    await run_io(self.build_cache.record, build_key, self.output_dir, report.page_count)
+                return report
+            
+            with stage("split", report):
+                pages = await loop.run_in_executor(executor, self.splitter.split_content, content)
+            report.page_count = len(pages)
+            
+            with stage("format", report):
+                folder_names, formatted_pages = await loop.run_in_executor(
+                    executor, self._format_pages, pages, theme)
+            
+            with stage("write", report):
+                await run_io(self._make_chapters, folder_names, report)
+                # Each batch counts into its own report so threads never share counters
+                jobs = [(names, contents, GenerationReport()) for names, contents in
+                        zip(batches(folder_names), batches(formatted_pages))]
+                results = await asyncio.gather(*(run_io(self._write_pages, *job) for job in jobs))
+                page_paths = [path for paths in results for path in paths]
+                for _, _, partial in jobs:
+                    report.dirs_created += partial.dirs_created
+                    report.files_created += partial.files_created
+                    report.bytes_written += partial.bytes_written
+            
+            titles = [self._page_title(page_content, i) for i, page_content in enumerate(pages, 1)]
+            
+            with stage("master", report):
+                await run_io(self._generate_master_slide, page_paths, theme, report, titles, folder_names)
+            
+            with stage("index", report):
+                await run_io(self._generate_index_file, folder_names, titles, report)
+            
+            if build_key is not None:
+                await run_io(self.build_cache.record, build_key, self.output_dir, report.page_count)
+        
+        return report
+    
+    def _lookup_build(self, content: Source, theme: str, report: GenerationReport) -> Tuple[str, bool]:
+        """Build cache key for this run, and whether its output is already intact"""
+        sharding = None if self.sharding is None else [self.sharding.by, self.sharding.size]
+        key = self.build_cache.key(content, theme, self.splitter, self.output_dir, sharding=sharding)
+        manifest = self.build_cache.lookup(key, self.output_dir)
+        if manifest is None:
+            return key, False
+        report.page_count = manifest['page_count']
+        report.cache_hits += 1
+        return key, True
+    
+    def _start_report(self, content: Source) -> GenerationReport:
+        """Resolve the output directory and start the run's report"""
+        report = GenerationReport()
         
-    def generate_slides(self, content: str, theme: str = "default"):
-        """Generate slides from content"""
         # If no presentation name was provided, extract from content
         if not self.presentation_name:
             self.presentation_name = self._extract_presentation_name(content)
             self.output_dir = self.base_output_dir / self.presentation_name
-            
-        # Setup directories
-        self.setup_directories()
-        
-        # Split content into pages
-        pages = self.splitter.split_content(content)
+        report.output_dir = str(self.output_dir)
+        return report
+    
+    def _generate_pipelined(self, content: Source, theme: str,
+                            report: GenerationReport) -> Tuple[List[str], List[str], List[str]]:
+        """Split, format and write with the stages overlapping; returns (folder names, bodies, titles)
+
+        Only the page boundaries are computed up front, since folder names
+        are padded to the page count. Page texts are then materialized one
+        at a time into a bounded queue, formatter threads turn them into
+        page.md contents, and the shared I/O pool creates folders and writes
+        files while later pages are still being formatted. Master bodies and
+        index titles are kept from the stream, so nothing is read back.
+        """
+        # The pipeline uses the shared I/O pool, which imports asyncio
+        from .pipeline import run_pipeline
         
-        # Generate individual page files
-        page_paths = []
-        folder_names = []
+        stage = self.hooks.stage
+        with stage("split", report):
+            index, spans = self.splitter.split_spans(content)
+        bounds = list(zip(spans[0::2], spans[1::2]))
+        count = report.page_count = len(bounds)
         
-        for i, page_content in enumerate(pages, 1):
-            # Extract title and create folder name
-            folder_name = self._extract_title(page_content, i)
-            folder_names.append(folder_name)
+        with stage("pipeline", report):
+            width = number_width(count)
+            prefixes = [''] * count
+            if self.sharding is not None:
+                heads = [self._page_head(index, first, last) for first, last in bounds]
+                prefixes = self.sharding.folder_names(prefixes, heads)
+                self._make_chapters(prefixes, report)
             
-            page_dir = self.output_dir / folder_name
-            page_dir.mkdir()
+            def format_page(n: int, page_content: str):
+                folder_name = prefixes[n - 1] + self._extract_title(page_content, n, width)
+                formatted = self.formatter.format_page(page_content, page_number=n, total_pages=count, theme=theme)
+                partial = GenerationReport()
+                kept = (folder_name, self._page_body(formatted), self._page_title(page_content, n), partial)
+                return kept, (folder_name, formatted, partial)
             
-            # Create assets directory for the page
-            assets_dir = page_dir / "assets"
-            assets_dir.mkdir()
+            def write_page(payload):
+                folder_name, formatted, partial = payload
+                self._write_pages([folder_name], [formatted], partial)
             
-            # Format and write page content
-            formatted_content = self.formatter.format_page(
+            pages = (index.page(first, last) for first, last in bounds)
+            results = run_pipeline(pages, format_page, write_page)
+        
+        # Each page counts into its own report so threads never share counters
+        for _, _, _, partial in results:
+            report.dirs_created += partial.dirs_created
+            report.files_created += partial.files_created
+            report.bytes_written += partial.bytes_written
+        return ([name for name, _, _, _ in results], [body for _, body, _, _ in results],
+                [title for _, _, title, _ in results])
+    
+    @staticmethod
+    def _page_head(index, first: int, last: int) -> str:
+        """Enough of a page's start for Sharding to tell whether it opens with a top-level heading"""
+        if index.cut_block(first) >= 0:
+            # Starts with a repeated table header or a re-opened fence
+            return index.page(first, last)
+        line = index.text(first, first + 1)
+        # The character after the first line is a newline exactly when more lines follow
+        return line.lstrip() + '\n' if last - first > 1 else line.strip()
+    
+    def _page_body(self, formatted: str) -> str:
+        """The body read_body() returns for a page once formatted is written"""
+        if '\r' in formatted:
+            formatted = formatted.replace('\r\n', '\n').replace('\r', '\n')
+        return self.formatter.strip_front_matter(formatted)
+    
+    def _format_pages(self, pages: List[str], theme: str) -> Tuple[List[str], List[str]]:
+        """Return (folder names, formatted page contents)"""
+        folder_names = []
+        formatted_pages = []
+        width = number_width(len(pages))
+        for i, page_content in enumerate(pages, 1):
+            # Extract title and create folder name
+            folder_names.append(self._extract_title(page_content, i, width))
+            formatted_pages.append(self.formatter.format_page(
                 page_content, 
                 page_number=i, 
                 total_pages=len(pages),
                 theme=theme
-            )
+            ))
+        if self.sharding is not None:
+            folder_names = self.sharding.folder_names(folder_names, pages)
+        return folder_names, formatted_pages
+    
+    def _make_chapters(self, folder_names: List[str], report: GenerationReport):
+        """Create the chapter directories of a sharded deck"""
+        for chapter in dict.fromkeys(name.rpartition('/')[0] for name in folder_names):
+            if chapter:
+                (self.output_dir / chapter).mkdir()
+                report.dirs_created += 1
+    
+    def _write_pages(self, folder_names: List[str], formatted_pages: List[str],
+                     report: GenerationReport) -> List[str]:
+        """Create page folders and write page.md files; returns their paths"""
+        page_paths = []
+        for folder_name, formatted_content in zip(folder_names, formatted_pages):
+            page_dir = self.output_dir / folder_name
+            # Create the page folder with its assets directory
+            report.dirs_created += make_slide_folder(page_dir)
             
             page_file = page_dir / "page.md"
-            page_file.write_text(formatted_content, encoding='utf-8')
+            self._write(page_file, formatted_content, report)
             # Store relative path from output dir for master slide generation
             page_paths.append(str(page_file.relative_to(self.base_output_dir)))
-            
-        # Generate master slide file
-        self._generate_master_slide(page_paths, theme)
-        
-        # Generate index file for easy navigation
-        self._generate_index_file(folder_names, pages)
-        
-        return len(pages)
-        
-    def _generate_master_slide(self, page_paths: List[str], theme: str):
-        """Generate the master slide file that includes all pages"""
+        return page_paths
+    
+    def _write(self, path: Path, text: str, report: GenerationReport):
+        """Write a UTF-8 file and account for it in the report"""
+        path.write_text(text, encoding='utf-8')
+        report.files_created += 1
+        report.bytes_written += len(text.encode('utf-8'))
+    
+    def _generate_master_slide(self, page_paths: List[str], theme: str, report: GenerationReport,
+                               titles: List[str], folder_names: List[str]):
+        """Generate the master slide file that includes all pages, plus its offset index"""
         # Adjust paths to be absolute from base output dir
         full_paths = [str(self.base_output_dir / path) for path in page_paths]
-        master_content = self.formatter.format_master_slide(full_paths, theme)
+        bodies = [read_body(path) for path in full_paths]
+        self._write_master(bodies, theme, report, titles, folder_names)
+    
+    def _write_master(self, bodies: List[str], theme: str, report: GenerationReport,
+                      titles: List[str], folder_names: List[str]):
+        """Write the master slide from page bodies, plus its offset index"""
+        master_content = self.formatter.combine_master(bodies, theme)
         master_file = self.output_dir / "master_slide.md"
-        master_file.write_text(master_content, encoding='utf-8')
+        self._write(master_file, master_content, report)
         
-    def _generate_index_file(self, folder_names: List[str], pages: List[str]):
+        index = MasterIndex.build(self.output_dir, self.formatter.master_header(theme),
+                                  bodies, titles, folder_names)
+        self._write(self.output_dir / INDEX_FILE, index.dumps(), report)
+    
+    def _page_title(self, page_content: str, page_number: int) -> str:
+        """Extract the display title of a page, falling back to its number"""
+        for line in page_content.strip().split('\n'):
+            if line.strip().startswith('# '):
+                return line.strip()[2:].strip()
+            elif line.strip().startswith('## '):
+                return line.strip()[3:].strip()
+        return f"Page {page_number}"
+    
+    def _generate_index_file(self, folder_names: List[str], titles: List[str], report: GenerationReport):
         """Generate an index file listing all slides with their titles"""
         index_content = [f"# {self.presentation_name.replace('-', ' ').title()} - Slide Index", ""]
         
-        for i, (folder_name, page_content) in enumerate(zip(folder_names, pages), 1):
-            # Extract the actual title from content
-            lines = page_content.strip().split('\n')
-            title = f"Page {i}"
-            
-            for line in lines:
-                if line.strip().startswith('# '):
-                    title = line.strip()[2:].strip()
-                    break
-                elif line.strip().startswith('## '):
-                    title = line.strip()[3:].strip()
-                    break
-                    
+        for i, (folder_name, title) in enumerate(zip(folder_names, titles), 1):
             index_content.append(f"{i}. **{title}** - `{folder_name}/page.md`")
-            
+        
         index_file = self.output_dir / "index.md"
-        index_file.write_text('\n'.join(index_content), encoding='utf-8')
+        self._write(index_file, '\n'.join(index_content), report)
 
 
-@click.command()
-@click.option('--input', '-i', 'input_file', required=True, 
-              help='Input file containing slide content')
-@click.option('--output', '-o', 'output_dir', default='output',
-              help='Output directory for generated slides')
-@click.option('--name', '-n', 'presentation_name',
-              help='Presentation name (defaults to first title in content)')
-@click.option('--theme', '-t', default='default',
-              type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
-              help='Marp theme to use')
-def main(input_file: str, output_dir: str, presentation_name: str, theme: str):
-    """Generate Marp slides from input content"""
-    # Read input content
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        click.echo(f"Error: Input file '{input_file}' not found.", err=True)
-        return
-        
-    # Generate slides
-    generator = SlideGenerator(output_dir, presentation_name)
-    try:
-        num_pages = generator.generate_slides(content, theme)
-        actual_output = generator.output_dir
-        click.echo(f"✓ Successfully generated {num_pages} slides in '{actual_output}'")
-        click.echo(f"  - Master slide: {actual_output}/master_slide.md")
-        click.echo(f"  - Index: {actual_output}/index.md")
-        click.echo(f"  - Slides: {actual_output}/")
-    except Exception as e:
-        click.echo(f"Error generating slides: {e}", err=True)
-        raise
+def main():
+    """Command-line entry point; click is only imported when the CLI runs"""
+    _build_cli()()
+
+
+def _build_cli():
+    import click
+    
+    @click.command()
+    @click.option('--input', '-i', 'input_file', required=True, 
+                  help='Input file containing slide content')
+    @click.option('--output', '-o', 'output_dir', default='output',
+                  help='Output directory for generated slides')
+    @click.option('--name', '-n', 'presentation_name',
+                  help='Presentation name (defaults to first title in content)')
+    @click.option('--theme', '-t', default='default',
+                  type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
+                  help='Marp theme to use')
+    def cli(input_file: str, output_dir: str, presentation_name: str, theme: str):
+        """Generate Marp slides from input content"""
+        # Read input content
+        try:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            click.echo(f"Error: Input file '{input_file}' not found.", err=True)
+            return
+        
+        # Generate slides
+        generator = SlideGenerator(output_dir, presentation_name)
+        try:
+            num_pages = generator.generate_slides(content, theme)
+            actual_output = generator.output_dir
+            click.echo(f"✓ Successfully generated {num_pages} slides in '{actual_output}'")
+            click.echo(f"  - Master slide: {actual_output}/master_slide.md")
+            click.echo(f"  - Index: {actual_output}/index.md")
+            click.echo(f"  - Slides: {actual_output}/")
+        except Exception as e:
+            click.echo(f"Error generating slides: {e}", err=True)
+            raise
+    
+    return cli
 
 
 if __name__ == "__main__":
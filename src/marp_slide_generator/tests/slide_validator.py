@@ -1,43 +1,124 @@
 """Slide validation tests for Marp presentations."""
 
+import copy
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
 import json
 
+from ..asset_store import AssetStore
+from ..deck_layout import SLIDE_FOLDER, relative_folder, slide_folders
+from ..instrumentation import StageHooks
+from ..layout import LayoutEstimator
+from ..limits import (
+    CODE_BLOCK_WEIGHT, HEADING_WEIGHT, IMAGE_WEIGHT, MAX_CHARS, MAX_CODE_CONTENT_LINES,
+    MAX_CONTENT_LINES, MAX_LINES, TABLE_WEIGHT,
+)
+from ..master_index import INDEX_FILE, MasterIndex
+
+if TYPE_CHECKING:
+    from ..duplicates import DuplicateFinder
+
 
 class SlideValidator:
     """Validates Marp slide quality and structure."""
     
-    def __init__(self, presentation_dir: str):
+    def __init__(self, presentation_dir: str, layout: Optional[LayoutEstimator] = None):
         self.presentation_dir = Path(presentation_dir)
         self.errors: List[str] = []
         self.warnings: List[str] = []
-        
+        self.hooks = StageHooks()
+        # Optional width-based measure: wrapped text counts as several lines
+        # and the character limit applies to display cells
+        self.layout = layout
+        # Optional near-duplicate slide check, off by default
+        self.duplicates: Optional['DuplicateFinder'] = None
+        # Directory listings shared by the checks of one run
+        self._folders: Optional[List[Path]] = None
+        self._md_files: Optional[List[Path]] = None
+    
     def validate_all(self) -> Dict[str, List[str]]:
         """Run all validation checks."""
         self.errors.clear()
         self.warnings.clear()
+        self._folders = self._md_files = None
         
         if not self.presentation_dir.exists():
             self.errors.append(f"Presentation directory does not exist: {self.presentation_dir}")
             return {"errors": self.errors, "warnings": self.warnings}
         
         # Run all validations
-        self.validate_master_slide()
-        self.validate_index_file()
-        self.validate_slide_folders()
-        self.validate_individual_slides()
-        self.validate_code_blocks()
-        self.validate_mermaid_diagrams()
-        self.validate_slide_lengths()
-        self.validate_markdown_syntax()
-        self.validate_assets()
-        self.validate_consistency()
+        for check in self._checks():
+            with self.hooks.stage(check.__name__):
+                check()
+        
+        return {"errors": self.errors, "warnings": self.warnings}
+    
+    async def validate_all_async(self) -> Dict[str, List[str]]:
+        """Run all validation checks concurrently on the I/O pool.
+
+        Each check records into its own copy of the validator; results are
+        merged in check order, so the output matches validate_all.
+        """
+        # Only async callers pay for importing asyncio
+        import asyncio
+        from ..aio import run_io
+        
+        self.errors.clear()
+        self.warnings.clear()
+        self._folders = self._md_files = None
+        
+        if not await run_io(self.presentation_dir.exists):
+            self.errors.append(f"Presentation directory does not exist: {self.presentation_dir}")
+            return {"errors": self.errors, "warnings": self.warnings}
+        # List once before the checks fan out, so every copy shares the listings
+        await run_io(self._slide_folders)
+        await run_io(self._markdown_files)
+        
+        async def run(name: str) -> 'SlideValidator':
+            clone = copy.copy(self)
+            clone.errors, clone.warnings = [], []
+            with self.hooks.stage(name):
+                await run_io(getattr(clone, name))
+            return clone
+        
+        clones = await asyncio.gather(*(run(check.__name__) for check in self._checks()))
+        for clone in clones:
+            self.errors.extend(clone.errors)
+            self.warnings.extend(clone.warnings)
         
         return {"errors": self.errors, "warnings": self.warnings}
     
+    def _checks(self) -> list:
+        checks = [
+            self.validate_master_slide,
+            self.validate_index_file,
+            self.validate_slide_folders,
+            self.validate_individual_slides,
+            self.validate_code_blocks,
+            self.validate_mermaid_diagrams,
+            self.validate_slide_lengths,
+            self.validate_markdown_syntax,
+            self.validate_assets,
+            self.validate_consistency,
+        ]
+        if self.duplicates is not None:
+            checks.append(self.validate_duplicates)
+        return checks
+    
+    def _slide_folders(self) -> List[Path]:
+        """NN-title slide folders in slide order, including those under chapter-NN/."""
+        if self._folders is None:
+            self._folders = slide_folders(self.presentation_dir)
+        return self._folders
+    
+    def _markdown_files(self) -> List[Path]:
+        """Every .md file in the presentation."""
+        if self._md_files is None:
+            self._md_files = list(self.presentation_dir.rglob("*.md"))
+        return self._md_files
+    
     def validate_master_slide(self):
         """Validate master_slide.md structure."""
         master_file = self.presentation_dir / "master_slide.md"
@@ -45,7 +126,7 @@ class SlideValidator:
         if not master_file.exists():
             self.errors.append("master_slide.md is missing")
             return
-            
+        
         content = master_file.read_text(encoding='utf-8')
         
         # Check Marp frontmatter
@@ -69,7 +150,7 @@ class SlideValidator:
         if not index_file.exists():
             self.errors.append("index.md is missing")
             return
-            
+        
         content = index_file.read_text(encoding='utf-8')
         
         # Check if index has proper structure
@@ -84,8 +165,7 @@ class SlideValidator:
     
     def validate_slide_folders(self):
         """Validate slide folder structure."""
-        folders = [f for f in self.presentation_dir.iterdir() if f.is_dir()]
-        slide_folders = [f for f in folders if re.match(r'^\d{2}-', f.name)]
+        slide_folders = self._slide_folders()
         
         if not slide_folders:
             self.errors.append("No slide folders found (format: NN-title)")
@@ -93,16 +173,25 @@ class SlideValidator:
         
         # Check sequential numbering
         numbers = []
+        widths = set()
         for folder in slide_folders:
-            match = re.match(r'^(\d{2})-', folder.name)
+            match = SLIDE_FOLDER.match(folder.name)
             if match:
                 numbers.append(int(match.group(1)))
+                widths.add(len(match.group(1)))
         
         numbers.sort()
         expected = list(range(1, len(numbers) + 1))
         if numbers != expected:
             self.warnings.append(f"Non-sequential slide numbering: {numbers}")
         
+        # Folders only list in slide order when every number has the same width
+        if len(widths) > 1:
+            self.warnings.append(
+                f"Mixed-width slide numbers ({', '.join(str(w) for w in sorted(widths))} digits); "
+                f"regenerate or renumber so folder names sort in slide order"
+            )
+        
         # Check each folder has page.md
         for folder in slide_folders:
             page_file = folder / "page.md"
@@ -111,8 +200,7 @@ class SlideValidator:
     
     def validate_individual_slides(self):
         """Validate individual slide files."""
-        folders = [f for f in self.presentation_dir.iterdir() if f.is_dir()]
-        slide_folders = [f for f in folders if re.match(r'^\d{2}-', f.name)]
+        slide_folders = self._slide_folders()
         
         for folder in slide_folders:
             page_file = folder / "page.md"
@@ -129,7 +217,7 @@ class SlideValidator:
     
     def validate_code_blocks(self):
         """Validate code blocks in all slides."""
-        all_md_files = list(self.presentation_dir.rglob("*.md"))
+        all_md_files = self._markdown_files()
         
         for md_file in all_md_files:
             content = md_file.read_text(encoding='utf-8')
@@ -141,7 +229,7 @@ class SlideValidator:
     
     def validate_mermaid_diagrams(self):
         """Validate Mermaid diagram syntax."""
-        all_md_files = list(self.presentation_dir.rglob("*.md"))
+        all_md_files = self._markdown_files()
         
         for md_file in all_md_files:
             content = md_file.read_text(encoding='utf-8')
@@ -162,19 +250,7 @@ class SlideValidator:
     
     def validate_slide_lengths(self):
         """Check if slides are within reasonable length limits."""
-        # More realistic limits for Marp slides
-        MAX_LINES = 20  # Typical Marp slide shows ~15-20 lines comfortably
-        MAX_CONTENT_LINES = 15  # Content lines (excluding code blocks)
-        MAX_CHARS = 1000  # Reduced character limit
-        
-        # Weight factors for different content types
-        CODE_BLOCK_WEIGHT = 1.5  # Code blocks take more vertical space
-        TABLE_WEIGHT = 1.3       # Tables take more space
-        IMAGE_WEIGHT = 3.0       # Images take significant space
-        HEADING_WEIGHT = 1.2     # Headings have larger font
-        
-        folders = [f for f in self.presentation_dir.iterdir() if f.is_dir()]
-        slide_folders = [f for f in folders if re.match(r'^\d{2}-', f.name)]
+        slide_folders = self._slide_folders()
         
         for folder in slide_folders:
             page_file = folder / "page.md"
@@ -203,10 +279,11 @@ class SlideValidator:
                             weighted_lines += TABLE_WEIGHT
                         # Check for headings
                         elif re.match(r'^#+\s', line):
-                            weighted_lines += HEADING_WEIGHT
+                            weighted_lines += HEADING_WEIGHT * self._wraps(line)
                         else:
-                            weighted_lines += 1
-                            content_lines += 1
+                            wraps = self._wraps(line)
+                            weighted_lines += wraps
+                            content_lines += wraps
                 
                 # Count specific elements for detailed reporting
                 code_blocks = len(re.findall(r'```', content)) // 2
@@ -231,32 +308,43 @@ class SlideValidator:
                         f"{content_lines} lines (recommended: {MAX_CONTENT_LINES})"
                     )
                 
-                if len(content) > MAX_CHARS:
-                    self.warnings.append(
-                        f"Slide has too many characters ({len(content)}): {folder.name}"
-                    )
+                if self.layout is None:
+                    if len(content) > MAX_CHARS:
+                        self.warnings.append(
+                            f"Slide has too many characters ({len(content)}): {folder.name}"
+                        )
+                else:
+                    text_width = self.layout.text_width(content)
+                    if text_width > MAX_CHARS:
+                        self.warnings.append(
+                            f"Slide text is too wide ({text_width} cells): {folder.name}"
+                        )
                 
                 # Specific warnings for heavy elements
                 if code_blocks > 1:
                     self.warnings.append(
                         f"Multiple code blocks ({code_blocks}) in {folder.name} may cause overflow"
                     )
-                    
+                
                 if images > 1:
                     self.warnings.append(
                         f"Multiple images ({images}) in {folder.name} may cause overflow"
                     )
-                    
+                
                 # Check for slides that are likely to overflow
-                if code_blocks >= 1 and content_lines > 10:
+                if code_blocks >= 1 and content_lines > MAX_CODE_CONTENT_LINES:
                     self.errors.append(
                         f"Slide likely to overflow in {folder.name}: "
                         f"code block with {content_lines} content lines"
                     )
     
+    def _wraps(self, line: str) -> int:
+        """Rendered lines a source line takes up (always 1 without a layout)."""
+        return self.layout.wrapped_lines(line) if self.layout else 1
+    
     def validate_markdown_syntax(self):
         """Basic markdown syntax validation."""
-        all_md_files = list(self.presentation_dir.rglob("*.md"))
+        all_md_files = self._markdown_files()
         
         for md_file in all_md_files:
             content = md_file.read_text(encoding='utf-8')
@@ -285,7 +373,7 @@ class SlideValidator:
         """Check for unused or missing assets."""
         # Find all asset references in markdown files
         referenced_assets = set()
-        all_md_files = list(self.presentation_dir.rglob("*.md"))
+        all_md_files = self._markdown_files()
         
         for md_file in all_md_files:
             content = md_file.read_text(encoding='utf-8')
@@ -296,14 +384,18 @@ class SlideValidator:
                 if img.startswith('assets/'):
                     referenced_assets.add(img)
         
-        # Find all actual asset files
-        asset_files = set()
-        for assets_dir in self.presentation_dir.rglob("assets"):
-            if assets_dir.is_dir():
-                for asset_file in assets_dir.iterdir():
-                    if asset_file.is_file():
-                        relative_path = asset_file.relative_to(assets_dir.parent)
-                        asset_files.add(str(relative_path).replace('\\', '/'))
+        # Find all actual asset files, through the asset store index if there is one
+        store = AssetStore.open(self.presentation_dir)
+        if store is not None:
+            asset_files = store.asset_names()
+        else:
+            asset_files = set()
+            for assets_dir in self.presentation_dir.rglob("assets"):
+                if assets_dir.is_dir():
+                    for asset_file in assets_dir.iterdir():
+                        if asset_file.is_file():
+                            relative_path = asset_file.relative_to(assets_dir.parent)
+                            asset_files.add(str(relative_path).replace('\\', '/'))
         
         # Check for missing assets
         missing = referenced_assets - asset_files
@@ -322,8 +414,7 @@ class SlideValidator:
         master_file = self.presentation_dir / "master_slide.md"
         
         # Count slides in folders
-        folders = [f for f in self.presentation_dir.iterdir() if f.is_dir()]
-        slide_folders = [f for f in folders if re.match(r'^\d{2}-', f.name)]
+        slide_folders = self._slide_folders()
         folder_count = len(slide_folders)
         
         # Count slides in index
@@ -333,8 +424,11 @@ class SlideValidator:
         else:
             index_entries = 0
         
-        # Count slides in master
-        if master_file.exists():
+        # Count slides in master, from the offset index when it is up to date
+        index = self._open_master_index()
+        if index is not None:
+            master_slides = len(index)
+        elif master_file.exists():
             master_content = master_file.read_text(encoding='utf-8')
             # Remove frontmatter
             if master_content.startswith('---'):
@@ -349,11 +443,37 @@ class SlideValidator:
         
         if folder_count != master_slides:
             self.errors.append(f"Mismatch: {folder_count} folders but {master_slides} slides in master")
+        
+        if index is not None:
+            folder_names = {relative_folder(f, self.presentation_dir) for f in slide_folders}
+            for entry in index.entries:
+                if entry.folder not in folder_names and not (self.presentation_dir / entry.folder).is_dir():
+                    self.errors.append(f"Master slide references missing folder: {entry.folder}")
+    
+    def validate_duplicates(self):
+        """Report clusters of near-duplicate slides."""
+        for cluster in self.duplicates.find(self.presentation_dir, self._slide_folders()):
+            others = ", ".join(f"{name} ({score:.0%})" for name, score in zip(cluster.slides[1:], cluster.similarity[1:]))
+            self.warnings.append(f"Near-duplicate slides: {cluster.slides[0]} ~ {others}")
+    
+    def _open_master_index(self) -> Optional[MasterIndex]:
+        """Load the master offset index, or None if it is missing or stale."""
+        if not (self.presentation_dir / INDEX_FILE).exists():
+            return None
+        try:
+            index = MasterIndex.open(self.presentation_dir)
+        except (ValueError, KeyError, TypeError) as e:
+            self.warnings.append(f"Unreadable {INDEX_FILE}: {e}")
+            return None
+        if not index.is_current():
+            self.warnings.append(f"{INDEX_FILE} is out of date with master_slide.md; regenerate to refresh it")
+            return None
+        return index
 
 
-def run_validation(presentation_dir: str) -> Tuple[int, int]:
+def run_validation(presentation_dir: str, validator: Optional[SlideValidator] = None) -> Tuple[int, int]:
     """Run validation and return (error_count, warning_count)."""
-    validator = SlideValidator(presentation_dir)
+    validator = validator or SlideValidator(presentation_dir)
     results = validator.validate_all()
     
     print(f"\n🔍 Validating presentation: {presentation_dir}")
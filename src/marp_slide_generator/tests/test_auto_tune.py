@@ -0,0 +1,72 @@
+"""Auto-tune predictions against the validator, and the NumPy scorer against the pure Python one."""
+
+import pytest
+
+from marp_slide_generator import SlideGenerator
+from marp_slide_generator.auto_tune import SplitterTuner, TuneResult
+from marp_slide_generator.layout import LayoutEstimator
+from marp_slide_generator.page_splitter import PageSplitter
+from marp_slide_generator.tests.slide_validator import SlideValidator
+
+LIMITS = [(12, 600), (8, 400), (20, 1000), (5, 200)]
+
+# Every construct the predictions special-case: titles and subheadings that
+# spacing pads, blank runs it collapses, tables and fences that pages cut
+# through, several images or inline fences on one line, indented edges
+SECTION = """# Section {n}
+
+## Overview
+
+
+Some text with ```inline``` code and ![one](a.png) ![two](b.png) images.
+  - indented item
+- item with a longer description that keeps going for a while to add width
+
+![diagram](diagram.png)
+
+| Name | Value |
+|------|-------|
+| alpha | 1 |
+| beta | 2 |
+| gamma | 3 |
+| delta | 4 |
+
+```python
+# a comment that looks like a title
+def handler(event):
+
+    return event
+## not a heading
+```
+## Wrap-up
+Closing words for section {n}.
+"""
+
+
+def document(sections: int = 12) -> str:
+    return "\n".join(SECTION.format(n=n) for n in range(sections))
+
+
+@pytest.mark.parametrize("layout", [None, LayoutEstimator()], ids=["chars", "layout"])
+def test_numpy_scoring_matches_python(layout):
+    pytest.importorskip("numpy")
+    tuner = SplitterTuner(document(), layout=layout)
+    for max_lines, max_chars in LIMITS:
+        spans = PageSplitter(max_lines, max_chars, layout).split_index(tuner.index)
+        python, vectorized = TuneResult(max_lines, max_chars), TuneResult(max_lines, max_chars)
+        tuner._score(spans, python)
+        tuner._score_numpy(spans, vectorized)
+        assert (python.errors, python.warnings) == (vectorized.errors, vectorized.warnings), (max_lines, max_chars)
+
+
+@pytest.mark.parametrize("max_lines, max_chars", LIMITS)
+def test_predictions_match_validator(tmp_path, max_lines, max_chars):
+    content = document()
+    predicted = SplitterTuner(content).evaluate(max_lines, max_chars)
+    generator = SlideGenerator(str(tmp_path), "deck")
+    generator.splitter = PageSplitter(max_lines, max_chars)
+    pages = generator.generate_slides(content)
+    validator = SlideValidator(str(tmp_path / "deck"))
+    validator.validate_slide_lengths()
+    assert (predicted.pages, predicted.errors, predicted.warnings) == \
+        (pages, len(validator.errors), len(validator.warnings))
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""End-to-end tests of the HTTP generation service through a local client."""
+
+import json
+import threading
+from http.client import HTTPConnection
+from typing import Optional, Tuple
+
+import pytest
+
+from marp_slide_generator.http_service import GenerationService, make_server
+
+DECK = "# Service Test\n\nFirst slide\n\n## Second\n\n- one\n- two\n"
+
+
+@pytest.fixture(scope="module")
+def server_address(tmp_path_factory):
+    """Address of a server on a free port, backed by a one-worker service"""
+    service = GenerationService(tmp_path_factory.mktemp("results"), workers=1)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def call(address, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, str, bytes]:
+    """(status, content type, body) of one request"""
+    connection = HTTPConnection(*address, timeout=60)
+    try:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        connection.close()
+
+
+def call_json(address, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, dict]:
+    status, _, body = call(address, method, path, payload)
+    return status, json.loads(body)
+
+
+def test_generate_then_cache_hit(server_address):
+    status, first = call_json(server_address, "POST", "/generate", {"content": DECK, "name": "cache-hit"})
+    assert status == 200 and first["ok"] and not first["cached"]
+    assert first["num_pages"] >= 1
+    
+    status, second = call_json(server_address, "POST", "/generate", {"content": DECK, "name": "cache-hit"})
+    assert status == 200 and second["cached"]
+    assert second["id"] == first["id"]
+
+
+def test_deck_files_and_traversal(server_address):
+    _, generated = call_json(server_address, "POST", "/generate", {"content": DECK})
+    deck_id = generated["id"]
+    
+    status, listing = call_json(server_address, "GET", f"/deck/{deck_id}")
+    assert status == 200
+    assert "master_slide.md" in listing["files"]
+    
+    status, content_type, body = call(server_address, "GET", f"/deck/{deck_id}/master_slide.md")
+    assert status == 200
+    assert content_type == "text/markdown; charset=utf-8"
+    assert b"Service Test" in body
+    
+    # Encoded so the client sends it as is; the service unquotes it
+    for path in (f"/deck/{deck_id}/..%2F..%2Fentry.json", f"/deck/{deck_id}/%2Fetc%2Fpasswd",
+                 "/deck/..%2F..%2F..%2Fetc/passwd"):
+        status, error = call_json(server_address, "GET", path)
+        assert status == 404 and not error["ok"]
+
+
+def test_validate_by_id(server_address):
+    _, generated = call_json(server_address, "POST", "/generate", {"content": DECK})
+    status, results = call_json(server_address, "POST", "/validate", {"id": generated["id"]})
+    assert status == 200
+    assert results["id"] == generated["id"]
+    assert results["errors"] == [] and results["ok"]
+    assert isinstance(results["warnings"], list)
+
+
+@pytest.mark.parametrize("payload", [
+    {"content": DECK, "name": 5},
+    {"content": DECK, "theme": ["gaia"]},
+    {"content": 5},
+    {"content": "   "},
+    {"id": 5},
+    {"content": DECK, "name": "../escape"},
+])
+def test_bad_fields_are_rejected(server_address, payload):
+    path = "/validate" if "id" in payload else "/generate"
+    status, error = call_json(server_address, "POST", path, payload)
+    assert status == 400 and not error["ok"]
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Import-time budgets for the package and the modules every run imports."""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+# Cumulative import time allowed per module (ms), best of several fresh
+# interpreters. Every CLI invocation and every worker process pays this.
+# Set MARP_IMPORT_BUDGET_SCALE to loosen all budgets on slow machines.
+BUDGETS_MS = {
+    "marp_slide_generator": 15.0,
+    "marp_slide_generator.page_splitter": 30.0,
+    "marp_slide_generator.slide_generator": 60.0,
+    "marp_slide_generator.tests.slide_validator": 65.0,
+}
+
+# Modules that only optional or async paths need; importing any of these
+# from the base path is a regression whatever the machine's speed
+FORBIDDEN = (
+    "asyncio",
+    "concurrent.futures",
+    "socket",
+    "ssl",
+    "marp_slide_generator.aio",
+    "marp_slide_generator.build_cache",
+    "marp_slide_generator.result_cache",
+)
+
+RUNS = 5
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+SRC_DIR = str(Path(__file__).resolve().parent.parent.parent)
+
+
+def measure_import_time(module: str, runs: int = RUNS) -> Tuple[float, Dict[str, float]]:
+    """Return (best cumulative ms, cumulative ms of each module it pulled in).
+
+    Each run uses a fresh interpreter with `-X importtime`; the fastest run is
+    reported to keep the number stable on noisy machines.
+    """
+    best_total = None
+    best_modules: Dict[str, float] = {}
+    
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        )
+        # Nested imports are listed before the top-level import they belong
+        # to, so collect each group until its top-level line shows up
+        group = {}
+        modules = {}
+        total = None
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative_ms = int(match.group(2)) / 1000
+            name = match.group(4)
+            group[name] = cumulative_ms
+            if len(match.group(3)) == 1:
+                if name == module:
+                    total = cumulative_ms
+                    modules = group
+                group = {}
+        if total is None:
+            raise RuntimeError(f"No import time reported for {module}")
+        if best_total is None or total < best_total:
+            best_total = total
+            best_modules = modules
+    
+    return best_total, best_modules
+
+
+def imported_modules(module: str) -> List[str]:
+    """Modules that importing module loads in a fresh interpreter."""
+    code = (f"import sys; before = set(sys.modules); import {module}; "
+            f"print('\\n'.join(sorted(set(sys.modules) - before)))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_import_time_within_budget(module):
+    budget_ms = BUDGETS_MS[module] * float(os.environ.get("MARP_IMPORT_BUDGET_SCALE", "1"))
+    total, modules = measure_import_time(module)
+    # Show the heaviest dependencies to point at the offending import
+    heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:11]
+    details = ", ".join(f"{name} {cumulative_ms:.1f} ms" for name, cumulative_ms in heaviest)
+    assert total <= budget_ms, f"import {module}: {total:.1f} ms (budget: {budget_ms:.1f} ms); heaviest: {details}"
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_no_optional_modules_imported(module):
+    loaded = set(imported_modules(module))
+    assert not loaded.intersection(FORBIDDEN), \
+        f"import {module} loads {', '.join(sorted(loaded.intersection(FORBIDDEN)))}"
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Manage the content-addressed asset store of a presentation
+"""
+
+import click
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from marp_slide_generator.asset_store import AssetStore, STORE_DIR
+
+
+@click.group()
+def main():
+    """Deduplicate and inspect slide assets"""
+
+
+@main.command()
+@click.argument('presentation_dir', required=True)
+@click.option('--store', '-s', 'store_dir',
+              help=f'Store directory, shareable between decks (default: PRESENTATION_DIR/{STORE_DIR})')
+@click.option('--dry-run', is_flag=True,
+              help='Report what would be linked without changing anything')
+def dedupe(presentation_dir: str, store_dir: str, dry_run: bool):
+    """Replace duplicate assets with hardlinks into the store
+
+    PRESENTATION_DIR: Path to the presentation directory containing slide folders
+    """
+    if not Path(presentation_dir).is_dir():
+        click.echo(f"Error: Presentation directory '{presentation_dir}' not found.", err=True)
+        sys.exit(1)
+    
+    existing = AssetStore.open(presentation_dir)
+    if existing is not None and (store_dir is None or Path(store_dir).resolve() == existing.store_dir.resolve()):
+        # Reuse indexed digests so unchanged assets are not hashed again
+        store = existing
+    else:
+        store = AssetStore(presentation_dir, store_dir)
+    report = store.dedupe(dry_run=dry_run)
+    
+    prefix = "Would link" if dry_run else "Linked"
+    click.echo(f"✓ Scanned {report.files} assets, {report.stored} new in the store")
+    click.echo(f"  - {prefix} {report.linked + report.symlinked} duplicates "
+               f"({report.bytes_saved / 1024:.1f} KiB saved)")
+    if report.symlinked:
+        click.echo(f"  - {report.symlinked} used symlinks (store on another filesystem)")
+    if report.replaced:
+        click.echo(f"⚠️  {report.replaced} stored assets had been edited in place and were replaced; "
+                   f"slides linked to them before show the edited content", err=True)
+    if not dry_run:
+        click.echo(f"  - Store: {store.store_dir}")
+
+
+@main.command()
+@click.argument('presentation_dir', required=True)
+def status(presentation_dir: str):
+    """Show what the asset index records for a presentation"""
+    store = AssetStore.open(presentation_dir)
+    if store is None:
+        click.echo(f"No asset index in '{presentation_dir}'; run 'marp-assets dedupe' first")
+        return
+    
+    digests = {entry['sha256']: entry['size'] for entry in store.assets.values()}
+    total = sum(entry['size'] for entry in store.assets.values())
+    click.echo(f"📦 {len(store.assets)} assets, {len(digests)} unique in {store.store_dir}")
+    click.echo(f"  - Logical size: {total / 1024:.1f} KiB")
+    click.echo(f"  - Stored size:  {sum(digests.values()) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
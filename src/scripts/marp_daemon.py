@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Persistent generator daemon for fast repeated marp-quick/marp-gen calls
+"""
+
+import sys
+import click
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from marp_slide_generator.daemon import SlideDaemon, default_socket_path, request
+
+
+@click.command()
+@click.option('--socket', '-s', 'socket_path', default=None,
+              help='Unix socket path (default: $MARP_DAEMON_SOCKET or a per-user temp file)')
+@click.option('--stop', is_flag=True,
+              help='Stop a running daemon')
+@click.option('--status', is_flag=True,
+              help='Report whether a daemon is running')
+def main(socket_path: str, stop: bool, status: bool):
+    """Keep the slide generator loaded and serve marp-quick/marp-gen requests"""
+    socket_path = socket_path or default_socket_path()
+    
+    if stop or status:
+        response = request({'command': 'shutdown' if stop else 'ping'}, socket_path, timeout=5.0)
+        if response is None:
+            click.echo(f"No daemon running on {socket_path}")
+            sys.exit(1)
+        if stop:
+            click.echo(f"✋ Stopped daemon on {socket_path}")
+        else:
+            click.echo(f"✓ Daemon running on {socket_path} (pid {response['pid']})")
+        return
+    
+    try:
+        daemon = SlideDaemon(socket_path)
+        click.echo(f"🚀 Listening on {socket_path}")
+        click.echo("   Press Ctrl+C to stop")
+        daemon.serve_forever()
+    except RuntimeError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        click.echo("\n✋ Stopped daemon")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Export a presentation to a standalone HTML deck
+"""
+
+import time
+import click
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@click.command()
+@click.argument('presentation_dir', required=True)
+@click.option('--html', 'as_html', is_flag=True,
+              help='Export to HTML (rendered with the markdown library)')
+@click.option('--output', '-o', 'output_path',
+              help='Output file (default: PRESENTATION_DIR.html, next to the directory)')
+@click.option('--theme', '-t', default='gaia',
+              type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
+              help='Marp theme to use (default: gaia)')
+@click.option('--jobs', '-j', type=int,
+              help='Render processes (default: number of CPUs)')
+@click.option('--no-cache', is_flag=True,
+              help='Re-render every slide instead of reusing cached HTML')
+def main(presentation_dir: str, as_html: bool, output_path: str, theme: str, jobs: int, no_cache: bool):
+    """Export PRESENTATION_DIR to a single file
+
+    Only slides whose content changed since the last export are re-rendered.
+    """
+    if not as_html:
+        click.echo("Error: choose an export format (currently only --html).", err=True)
+        sys.exit(2)
+    if not Path(presentation_dir).is_dir():
+        click.echo(f"Error: Presentation directory '{presentation_dir}' not found.", err=True)
+        sys.exit(1)
+    
+    # The markdown library is only needed once an export actually runs
+    from marp_slide_generator.html_export import HtmlExporter
+    
+    exporter = HtmlExporter(presentation_dir, theme, jobs=jobs, use_cache=not no_cache)
+    start = time.perf_counter()
+    report = exporter.export(output_path)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    click.echo(f"✓ Exported {report.slides} slides to '{report.output_path}' in {elapsed:.1f} ms")
+    click.echo(f"  - Rendered: {report.rendered}, from cache: {report.cached}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -3,6 +3,10 @@
 Marp Slide Generator CLI
 """
 
+import os
+import mmap
+import time
+import contextlib
 import click
 from pathlib import Path
 import sys
@@ -10,7 +14,9 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from marp_slide_generator import SlideGenerator
+from marp_slide_generator.daemon import format_result, generate_via_daemon
+from marp_slide_generator.cursor_export import extract_deck
+from marp_slide_generator.mmap_reader import read_input
 
 
 @click.command()
@@ -23,29 +29,133 @@ from marp_slide_generator import SlideGenerator
 @click.option('--theme', '-t', default='default',
               type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
               help='Marp theme to use')
-def main(input_file: str, output_dir: str, presentation_name: str, theme: str):
+@click.option('--from-cursor-export', is_flag=True,
+              help='Input is a Cursor chat export; use the markdown deck from its latest assistant turn')
+@click.option('--deck', 'deck_number', type=int,
+              help='With --from-cursor-export: use deck N (1-based; negative counts from the end)')
+@click.option('--shard-by', type=click.Choice(['headings', 'size']),
+              help='Group slide folders into chapter-NN/ directories, starting a chapter at each '
+                   'top-level # heading or every --chapter-size slides')
+@click.option('--chapter-size', default=100, show_default=True,
+              help='Slides per chapter with --shard-by size')
+@click.option('--pipeline', 'pipelined', is_flag=True,
+              help='Format and write pages concurrently, so formatting overlaps slow disk writes')
+@click.option('--layout-aware', is_flag=True,
+              help='Measure pages by rendered width, counting CJK characters as double width')
+@click.option('--auto-tune', is_flag=True,
+              help='Pick page limits for this input by predicting validator results over a grid')
+@click.option('--no-cache', is_flag=True,
+              help='Always rebuild, without consulting or updating the build cache')
+@click.option('--cache-size', default=16, show_default=True,
+              help='Build cache size limit in MiB; least recently used builds are forgotten')
+@click.option('--daemon/--no-daemon', 'use_daemon', default=True,
+              help='Use a running marp-daemon when available (default: on)')
+@click.option('--timings', is_flag=True,
+              help='Print per-stage timings and write statistics')
+@click.option('--profile', 'profile_path',
+              help='Run under cProfile and write the stats to this file')
+@click.option('--memory-profile', is_flag=True,
+              help='Report tracemalloc peak and retained memory per stage')
+def main(input_file: str, output_dir: str, presentation_name: str, theme: str,
+         from_cursor_export: bool, deck_number: int, shard_by: str, chapter_size: int, pipelined: bool,
+         layout_aware: bool, auto_tune: bool, no_cache: bool, cache_size: int, use_daemon: bool, timings: bool,
+         profile_path: str, memory_profile: bool):
     """Generate Marp slides from input content"""
+    if deck_number is not None and not from_cursor_export:
+        raise click.UsageError("--deck requires --from-cursor-export")
+    
+    profiler = None
+    if memory_profile:
+        from marp_slide_generator.instrumentation import MemoryProfiler
+        profiler = MemoryProfiler()
+        profiler.start()
+    
     # Read input content
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with (profiler.stage("read") if profiler else contextlib.nullcontext()):
+            if from_cursor_export:
+                deck = extract_deck(input_file, deck_number)
+                content = deck.text
+                click.echo(f"📥 Using deck from assistant turn {deck.turn} (export line {deck.line})")
+            else:
+                content = read_input(input_file)
     except FileNotFoundError:
         click.echo(f"Error: Input file '{input_file}' not found.", err=True)
         return
-        
-    # Generate slides
-    generator = SlideGenerator(output_dir, presentation_name)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        return
+    
     try:
-        num_pages = generator.generate_slides(content, theme)
-        actual_output = generator.output_dir
-        click.echo(f"✓ Successfully generated {num_pages} slides in '{actual_output}'")
-        click.echo(f"  - Master slide: {actual_output}/master_slide.md")
-        click.echo(f"  - Index: {actual_output}/index.md")
-        click.echo(f"  - Slides: {actual_output}/")
-    except Exception as e:
-        click.echo(f"Error generating slides: {e}", err=True)
-        raise
-
+        # Prefer a running marp-daemon; fall back to generating in-process.
+        # Profiling has to happen in this process, so it skips the daemon.
+        result = None
+        if use_daemon and not profile_path and not memory_profile and not auto_tune:
+            # A bytes or mmap input is only decoded if a daemon takes the job
+            result = generate_via_daemon(content, output_dir, presentation_name, theme,
+                                         layout_aware=layout_aware, use_cache=not no_cache,
+                                         cache_size=cache_size * 1024 * 1024,
+                                         shard_by=shard_by, chapter_size=chapter_size,
+                                         pipelined=pipelined)
+        if result is not None:
+            if not result['ok']:
+                click.echo(f"Error generating slides: {result['error']}", err=True)
+                return
+            click.echo(format_result(result['num_pages'], os.path.relpath(result['output_dir']),
+                                     bool(result['report']['cache_hits'])))
+            if timings:
+                from marp_slide_generator.instrumentation import GenerationReport
+                click.echo(GenerationReport(**result['report']).format_timings())
+            return
+        
+        # Generate slides
+        from marp_slide_generator import SlideGenerator
+        layout = None
+        if layout_aware:
+            from marp_slide_generator.layout import LayoutEstimator
+            layout = LayoutEstimator.for_theme(theme)
+        generator = SlideGenerator(output_dir, presentation_name, layout)
+        if shard_by:
+            from marp_slide_generator.deck_layout import Sharding
+            generator.sharding = Sharding(shard_by, chapter_size)
+        generator.pipelined = pipelined
+        if auto_tune:
+            from marp_slide_generator.auto_tune import SplitterTuner
+            from marp_slide_generator.page_splitter import PageSplitter
+            start = time.perf_counter()
+            tuner = SplitterTuner(content, theme, layout)
+            results = tuner.sweep()
+            best = tuner.best(results)
+            elapsed = (time.perf_counter() - start) * 1000
+            click.echo(f"🎯 Auto-tuned page limits: {best.max_lines_per_page} lines, "
+                       f"{best.max_chars_per_page} chars ({len(results)} candidates in {elapsed:.1f} ms)")
+            click.echo(f"  - Predicted: {best.pages} slides, {best.errors} errors, {best.warnings} warnings")
+            generator.splitter = PageSplitter(best.max_lines_per_page, best.max_chars_per_page, layout)
+        if not no_cache:
+            from marp_slide_generator.build_cache import BuildCache
+            generator.build_cache = BuildCache(max_bytes=cache_size * 1024 * 1024)
+        if profiler is not None:
+            generator.hooks.add(profiler.on_start, profiler.on_end)
+        try:
+            if profile_path:
+                from marp_slide_generator.instrumentation import run_with_profile
+                report = run_with_profile(profile_path, generator.generate_slides_report, content, theme)
+            else:
+                report = generator.generate_slides_report(content, theme)
+            click.echo(format_result(report.page_count, generator.output_dir, bool(report.cache_hits)))
+            if timings:
+                click.echo(report.format_timings())
+            if profile_path:
+                click.echo(f"  - Profile: {profile_path}")
+            if profiler is not None:
+                click.echo(profiler.format_report())
+        except Exception as e:
+            click.echo(f"Error generating slides: {e}", err=True)
+            raise
+    
+    finally:
+        if isinstance(content, mmap.mmap):
+            content.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -3,6 +3,7 @@
 Quick slide generator - generate slides from stdin or direct input
 """
 
+import os
 import sys
 import click
 from pathlib import Path
@@ -10,7 +11,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from marp_slide_generator import SlideGenerator
+from marp_slide_generator.daemon import format_result, generate_via_daemon
 
 
 @click.command()
@@ -23,7 +24,20 @@ from marp_slide_generator import SlideGenerator
               help='Marp theme to use (default: gaia)')
 @click.option('--content', '-c',
               help='Direct content input (alternative to stdin)')
-def main(output_dir: str, presentation_name: str, theme: str, content: str):
+@click.option('--layout-aware', is_flag=True,
+              help='Measure pages by rendered width, counting CJK characters as double width')
+@click.option('--no-cache', is_flag=True,
+              help='Always rebuild, without consulting or updating the build cache')
+@click.option('--cache-size', default=16, show_default=True,
+              help='Build cache size limit in MiB; least recently used builds are forgotten')
+@click.option('--daemon/--no-daemon', 'use_daemon', default=True,
+              help='Use a running marp-daemon when available (default: on)')
+@click.option('--timings', is_flag=True,
+              help='Print per-stage timings and write statistics')
+@click.option('--profile', 'profile_path',
+              help='Run under cProfile and write the stats to this file')
+def main(output_dir: str, presentation_name: str, theme: str, content: str, layout_aware: bool,
+         no_cache: bool, cache_size: int, use_daemon: bool, timings: bool, profile_path: str):
     """Generate Marp slides from stdin or direct content"""
     
     # Get content from direct input or stdin
@@ -37,15 +51,45 @@ def main(output_dir: str, presentation_name: str, theme: str, content: str):
         click.echo("Error: No content provided", err=True)
         return
     
+    # Prefer a running marp-daemon; fall back to generating in-process.
+    # Profiling has to happen in this process, so it skips the daemon.
+    result = None
+    if use_daemon and not profile_path:
+        result = generate_via_daemon(slide_content, output_dir, presentation_name, theme,
+                                     layout_aware=layout_aware, use_cache=not no_cache,
+                                     cache_size=cache_size * 1024 * 1024)
+    if result is not None:
+        if not result['ok']:
+            click.echo(f"Error generating slides: {result['error']}", err=True)
+            return
+        click.echo(format_result(result['num_pages'], os.path.relpath(result['output_dir']),
+                                 bool(result['report']['cache_hits'])))
+        if timings:
+            from marp_slide_generator.instrumentation import GenerationReport
+            click.echo(GenerationReport(**result['report']).format_timings())
+        return
+    
     # Generate slides
-    generator = SlideGenerator(output_dir, presentation_name)
+    from marp_slide_generator import SlideGenerator
+    layout = None
+    if layout_aware:
+        from marp_slide_generator.layout import LayoutEstimator
+        layout = LayoutEstimator.for_theme(theme)
+    generator = SlideGenerator(output_dir, presentation_name, layout)
+    if not no_cache:
+        from marp_slide_generator.build_cache import BuildCache
+        generator.build_cache = BuildCache(max_bytes=cache_size * 1024 * 1024)
     try:
-        num_pages = generator.generate_slides(slide_content, theme)
-        actual_output = generator.output_dir
-        click.echo(f"✓ Successfully generated {num_pages} slides in '{actual_output}'")
-        click.echo(f"  - Master slide: {actual_output}/master_slide.md")
-        click.echo(f"  - Index: {actual_output}/index.md")
-        click.echo(f"  - Slides: {actual_output}/")
+        if profile_path:
+            from marp_slide_generator.instrumentation import run_with_profile
+            report = run_with_profile(profile_path, generator.generate_slides_report, slide_content, theme)
+        else:
+            report = generator.generate_slides_report(slide_content, theme)
+        click.echo(format_result(report.page_count, generator.output_dir, bool(report.cache_hits)))
+        if timings:
+            click.echo(report.format_timings())
+        if profile_path:
+            click.echo(f"  - Profile: {profile_path}")
     except Exception as e:
         click.echo(f"Error generating slides: {e}", err=True)
         raise
@@ -13,20 +13,47 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from marp_slide_generator.regenerator import SlideRegenerator
 
 
-@click.command()
+class DefaultGroup(click.Group):
+    """Runs the regenerate command when the first argument is not a subcommand"""
+    
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ['regenerate'] + args
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup)
+def main():
+    """Regenerate a presentation, or insert, move and delete slides in it
+
+    With no subcommand, PRESENTATION_DIR is regenerated as before.
+    """
+
+
+@main.command()
 @click.argument('presentation_dir', required=True)
 @click.option('--theme', '-t', default='gaia',
               type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
               help='Marp theme to use (default: gaia)')
-def main(presentation_dir: str, theme: str):
+@click.option('--memory-profile', is_flag=True,
+              help='Report tracemalloc peak and retained memory per stage')
+def regenerate(presentation_dir: str, theme: str, memory_profile: bool):
     """Regenerate master_slide.md and index.md for an existing presentation
-    
+
     PRESENTATION_DIR: Path to the presentation directory containing slide folders
     """
     regenerator = SlideRegenerator()
+    profiler = None
+    if memory_profile:
+        from marp_slide_generator.instrumentation import MemoryProfiler
+        profiler = MemoryProfiler()
+        regenerator.hooks.add(profiler.on_start, profiler.on_end)
+        profiler.start()
     
     try:
         regenerator.regenerate_all(presentation_dir, theme)
+        if profiler is not None:
+            click.echo(profiler.format_report())
     except ValueError as e:
         click.echo(f"Error: {e}", err=True)
         return 1
@@ -35,5 +62,55 @@ def main(presentation_dir: str, theme: str):
         raise
 
 
+theme_option = click.option('--theme', '-t', default='gaia',
+                            type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
+                            help='Marp theme to use (default: gaia)')
+
+
+@main.command()
+@click.argument('presentation_dir')
+@click.argument('position', type=int)
+@click.argument('page_file', type=click.Path(exists=True, dir_okay=False))
+@theme_option
+def insert(presentation_dir: str, position: int, page_file: str, theme: str):
+    """Insert PAGE_FILE as slide POSITION, shifting the slides after it"""
+    content = Path(page_file).read_text(encoding='utf-8')
+    try:
+        name, renamed = SlideRegenerator().insert_slide(presentation_dir, position, content, theme)
+    except (ValueError, OSError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"✓ Inserted {name} ({renamed} folders renumbered)")
+
+
+@main.command()
+@click.argument('presentation_dir')
+@click.argument('source', type=int)
+@click.argument('target', type=int)
+@theme_option
+def move(presentation_dir: str, source: int, target: int, theme: str):
+    """Move slide SOURCE to position TARGET"""
+    try:
+        renamed = SlideRegenerator().move_slide(presentation_dir, source, target, theme)
+    except (ValueError, OSError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"✓ Moved slide {source} to {target} ({renamed} folders renumbered)")
+
+
+@main.command()
+@click.argument('presentation_dir')
+@click.argument('position', type=int)
+@theme_option
+def delete(presentation_dir: str, position: int, theme: str):
+    """Delete slide POSITION and its folder, shifting the slides after it"""
+    try:
+        name, renamed = SlideRegenerator().delete_slide(presentation_dir, position, theme)
+    except (ValueError, OSError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"✓ Deleted {name} ({renamed} folders renumbered)")
+
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Local live-preview server that pushes per-slide updates to the browser
+"""
+
+import json
+import sys
+import time
+import threading
+import click
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from marp_slide_generator.html_renderer import SlideRenderer
+from marp_slide_generator.regenerator import SlideRegenerator
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+{css}
+</style>
+</head>
+<body>
+<main id="deck">
+{sections}
+</main>
+<script>
+const deck = document.getElementById('deck');
+const source = new EventSource('/events');
+source.onmessage = async (event) => {{
+  const update = JSON.parse(event.data);
+  for (const id of update.changed) {{
+    const response = await fetch('/slide/' + encodeURIComponent(id));
+    const holder = document.createElement('div');
+    holder.innerHTML = await response.text();
+    const fresh = holder.firstElementChild;
+    const current = document.getElementById(id);
+    if (current) {{ current.replaceWith(fresh); }} else {{ deck.appendChild(fresh); }}
+  }}
+  const live = new Set(update.order);
+  for (const section of Array.from(deck.children)) {{
+    if (!live.has(section.id)) {{ section.remove(); }}
+  }}
+  for (const id of update.order) {{
+    const section = document.getElementById(id);
+    if (section) {{ deck.appendChild(section); }}
+  }}
+}};
+</script>
+</body>
+</html>
+"""
+
+
+class PreviewDeck:
+    """In-memory rendered view of a presentation directory
+
+    Each slide is keyed by its folder name. Pages are only re-read when
+    their mtime or size changes and only re-rendered when their content
+    hash changes, so an edit to one slide costs one read and one render.
+    """
+    
+    def __init__(self, presentation_dir: str, theme: str, renderer: SlideRenderer = None):
+        self.presentation_dir = Path(presentation_dir).resolve()
+        self.theme = theme
+        self.renderer = renderer or SlideRenderer()
+        self.regenerator = SlideRegenerator()
+        self.order = []
+        self.slides = {}      # slide id -> (content hash, section HTML)
+        self._signatures = {}
+        self.version = 0
+        self.condition = threading.Condition()
+        self.last_update = {"changed": [], "order": []}
+    
+    def refresh(self) -> list:
+        """Re-scan the presentation and return the ids of changed slides"""
+        folders = self.regenerator.get_slide_folders(self.presentation_dir)
+        order = [folder.name for folder in folders]
+        changed = []
+        slides = {}
+        
+        for folder in folders:
+            slide_id = folder.name
+            page_file = folder / "page.md"
+            stat = page_file.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            previous = self.slides.get(slide_id)
+            if previous is not None and self._signatures.get(slide_id) == signature:
+                slides[slide_id] = previous
+                continue
+            
+            body = self.regenerator.formatter.strip_front_matter(page_file.read_text(encoding='utf-8'))
+            digest, rendered = self.renderer.render(body)
+            self._signatures[slide_id] = signature
+            if previous is not None and previous[0] == digest:
+                slides[slide_id] = previous
+                continue
+            slides[slide_id] = (digest, self.renderer.section(slide_id, rendered))
+            changed.append(slide_id)
+        
+        for slide_id in [s for s in self._signatures if s not in slides]:
+            del self._signatures[slide_id]
+        self.renderer.prune(digest for digest, _ in slides.values())
+        
+        with self.condition:
+            structure_changed = order != self.order
+            self.slides = slides
+            self.order = order
+            if changed or structure_changed:
+                self.version += 1
+                self.last_update = {"changed": changed, "order": order}
+                self.condition.notify_all()
+        return changed
+    
+    def page_html(self) -> str:
+        """Full HTML document for the current deck"""
+        with self.condition:
+            sections = '\n'.join(self.slides[slide_id][1] for slide_id in self.order)
+        return PAGE_TEMPLATE.format(
+            title=self.presentation_dir.name,
+            css=self.renderer.theme_css(self.theme),
+            sections=sections
+        )
+    
+    def slide_html(self, slide_id: str):
+        with self.condition:
+            slide = self.slides.get(slide_id)
+        return slide[1] if slide else None
+    
+    def wait_for_update(self, seen_version: int, timeout: float):
+        """Block until the deck moves past seen_version; return (version, update)"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version > seen_version, timeout)
+            return self.version, self.last_update
+    
+    def poll(self, interval: float, stop: threading.Event):
+        """Refresh the deck until stop is set"""
+        while not stop.wait(interval):
+            try:
+                changed = self.refresh()
+            except OSError as e:
+                # Folders can vanish mid-scan while a regeneration is running
+                print(f"⚠️  Refresh skipped: {e}")
+                continue
+            if changed:
+                print(f"🔁 Pushed {len(changed)} changed slide(s): {', '.join(changed)}")
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """Serves the deck, individual slides and the Server-Sent Events stream"""
+    
+    deck: PreviewDeck = None
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        path = unquote(self.path.split('?', 1)[0])
+        if path in ('/', '/index.html'):
+            self._send(200, 'text/html; charset=utf-8', self.deck.page_html())
+        elif path.startswith('/slide/'):
+            body = self.deck.slide_html(path[len('/slide/'):])
+            if body is None:
+                self._send(404, 'text/plain; charset=utf-8', 'Slide not found')
+            else:
+                self._send(200, 'text/html; charset=utf-8', body)
+        elif path == '/events':
+            self._stream_events()
+        else:
+            self._send(404, 'text/plain; charset=utf-8', 'Not found')
+    
+    def _send(self, status: int, content_type: str, body: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        
+        seen = self.deck.version
+        try:
+            while True:
+                version, update = self.deck.wait_for_update(seen, timeout=15.0)
+                if version > seen:
+                    seen = version
+                    payload = json.dumps(update, ensure_ascii=False)
+                    self.wfile.write(f"data: {payload}\n\n".encode('utf-8'))
+                else:
+                    # Keep-alive comment so proxies and browsers keep the stream open
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@click.command()
+@click.argument('presentation_dir', required=True)
+@click.option('--host', default='127.0.0.1', show_default=True,
+              help='Address to bind')
+@click.option('--port', '-p', default=8000, show_default=True,
+              help='Port to listen on')
+@click.option('--theme', '-t', default='gaia',
+              type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
+              help='Marp theme to use (default: gaia)')
+@click.option('--interval', default=0.2, show_default=True,
+              help='Seconds between checks for changed slides')
+def main(presentation_dir: str, host: str, port: int, theme: str, interval: float):
+    """Serve a live HTML preview of PRESENTATION_DIR
+
+    Slides are re-rendered only when their content changes, and the
+    browser fetches just the changed slides over Server-Sent Events.
+    """
+    if not Path(presentation_dir).is_dir():
+        click.echo(f"Error: Presentation directory '{presentation_dir}' not found.", err=True)
+        return
+    
+    deck = PreviewDeck(presentation_dir, theme)
+    start = time.perf_counter()
+    deck.refresh()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"📝 Rendered {len(deck.order)} slides in {elapsed:.1f} ms")
+    
+    PreviewHandler.deck = deck
+    server = ThreadingHTTPServer((host, port), PreviewHandler)
+    server.daemon_threads = True
+    
+    stop = threading.Event()
+    poller = threading.Thread(target=deck.poll, args=(interval, stop), daemon=True)
+    poller.start()
+    
+    print(f"\n🌐 Serving '{presentation_dir}' at http://{host}:{port}/")
+    print("   Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✋ Stopped serving")
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Local HTTP generation service for tools that should not spawn a CLI per request
+"""
+
+import time
+import click
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from marp_slide_generator.http_service import GenerationService, make_server
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', show_default=True,
+              help='Address to bind')
+@click.option('--port', '-p', default=8765, show_default=True,
+              help='Port to listen on')
+@click.option('--workers', '-w', type=int,
+              help='Worker processes (default: number of CPUs)')
+@click.option('--cache-dir', default=str(Path.home() / '.cache' / 'marp-server'), show_default=True,
+              help='Directory for cached decks')
+@click.option('--cache-size', default=256, show_default=True,
+              help='Cache size limit in MiB; least recently used decks are evicted')
+def main(host: str, port: int, workers: int, cache_dir: str, cache_size: int):
+    """Serve POST /generate, POST /validate and GET /deck/<id>/... over HTTP
+
+    Decks are generated by pre-warmed worker processes and cached by the
+    SHA-256 of their input, theme, splitter settings and package version.
+    """
+    service = GenerationService(cache_dir, workers, cache_size * 1024 * 1024)
+    start = time.perf_counter()
+    running = service.warm()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔥 Started {running} worker processes in {elapsed:.1f} ms")
+    
+    server = make_server(service, host, port)
+    print(f"\n🌐 Serving on http://{host}:{port}/ (cache: {cache_dir})")
+    print("   Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✋ Stopped serving")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
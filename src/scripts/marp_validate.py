@@ -8,7 +8,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from marp_slide_generator.tests.slide_validator import run_validation
+from marp_slide_generator.tests.slide_validator import SlideValidator, run_validation
 
 
 def main():
@@ -22,11 +22,51 @@ def main():
         action="store_true",
         help="Exit with error code if warnings are found"
     )
+    parser.add_argument(
+        "--layout-aware",
+        action="store_true",
+        help="Measure slide length by rendered width, counting CJK characters as double width"
+    )
+    parser.add_argument(
+        "--theme",
+        default="gaia",
+        choices=["default", "gaia", "uncover"],
+        help="Theme whose column width --layout-aware assumes (default: gaia)"
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Warn about near-duplicate slides (SimHash fingerprints, cached per deck)"
+    )
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Report tracemalloc peak and retained memory per check"
+    )
     
     args = parser.parse_args()
     
+    layout = None
+    if args.layout_aware:
+        from marp_slide_generator.layout import LayoutEstimator
+        layout = LayoutEstimator.for_theme(args.theme)
+    validator = SlideValidator(args.presentation_dir, layout)
+    if args.duplicates:
+        from marp_slide_generator.duplicates import DuplicateFinder
+        validator.duplicates = DuplicateFinder()
+    profiler = None
+    if args.memory_profile:
+        from marp_slide_generator.instrumentation import MemoryProfiler
+        profiler = MemoryProfiler()
+        validator.hooks.add(profiler.on_start, profiler.on_end)
+        profiler.start()
+    
     # Run validation
-    error_count, warning_count = run_validation(args.presentation_dir)
+    error_count, warning_count = run_validation(args.presentation_dir, validator)
+    
+    if profiler is not None:
+        print(profiler.format_report())
+        profiler.stop()
     
     # Determine exit code
     if error_count > 0:
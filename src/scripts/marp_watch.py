@@ -6,96 +6,449 @@ Watch for changes and automatically regenerate slides
 import os
 import sys
 import time
+import fnmatch
+import threading
 import click
-import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from marp_slide_generator import SlideGenerator
 
+def is_inside(path, directory: str) -> bool:
+    """Whether path is under directory, a real path; symlinks are resolved first"""
+    return (os.path.realpath(path) + os.sep).startswith(directory + os.sep)
 
-class SlideChangeHandler(FileSystemEventHandler):
-    """Handler for file changes"""
+
+class BuildSuperseded(Exception):
+    """Raised inside a build once a newer change to its deck has arrived"""
+
+
+class Deck:
+    """A watched input file and where its slides are generated"""
     
     def __init__(self, input_file, output_dir, presentation_name, theme):
-        self.input_file = input_file
+        self.input_file = os.path.abspath(input_file)
         self.output_dir = output_dir
         self.presentation_name = presentation_name
         self.theme = theme
-        self.last_run = 0
-        self.debounce_time = 1.0  # 1 second debounce
+        self.last_event = 0.0
+        self.running = False
+        self.generation = 0
+    
+    def build(self, is_stale=None) -> str:
+        """Regenerate slides from the input file and return a summary line
+
+        is_stale() is polled before each generation stage; once it returns
+        True the build stops with BuildSuperseded.
+        """
+        with open(self.input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
         
-    def on_modified(self, event):
-        if event.src_path == self.input_file:
-            current_time = time.time()
-            if current_time - self.last_run > self.debounce_time:
-                self.last_run = current_time
-                self.regenerate()
-                
-    def regenerate(self):
-        """Regenerate slides from input file"""
-        print(f"\n🔄 File changed, regenerating slides...")
+        from marp_slide_generator import SlideGenerator
+        generator = SlideGenerator(self.output_dir, self.presentation_name)
+        if is_stale is not None:
+            def check_stale(stage: str):
+                if is_stale():
+                    raise BuildSuperseded(stage)
+            generator.hooks.add(on_start=check_stale)
+        num_pages = generator.generate_slides(content, self.theme)
+        return f"Generated {num_pages} slides in '{generator.output_dir}'"
+
+
+class PresentationDeck:
+    """A presentation folder whose master and index follow page.md edits"""
+    
+    def __init__(self, presentation_dir, theme):
+        self.presentation_dir = Path(presentation_dir).resolve()
+        self.input_file = str(self.presentation_dir)
+        self.theme = theme
+        self.last_event = 0.0
+        self.running = False
+        self.generation = 0
+        from marp_slide_generator.regenerator import SlideRegenerator
+        self.regenerator = SlideRegenerator()
+        self._changed = set()
+        self._lock = threading.Lock()
+    
+    def mark_changed(self, folder: Path):
+        """Record a slide folder whose page.md needs re-reading"""
+        with self._lock:
+            self._changed.add(folder)
+    
+    def build(self, is_stale=None) -> str:
+        """Patch master_slide.md and index.md from the changed pages
+
+        The patch is a single pass, so is_stale() is only checked before it.
+        """
+        if is_stale is not None and is_stale():
+            raise BuildSuperseded("start")
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        
+        start = time.perf_counter()
+        try:
+            num_slides, reread = self.regenerator.regenerate_incremental(
+                self.presentation_dir, self.theme, changed)
+        except BaseException:
+            # Keep the folders for the next build instead of losing them
+            with self._lock:
+                self._changed |= changed
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        return (f"Updated master_slide.md and index.md: {num_slides} slides, "
+                f"{reread} re-read in {elapsed:.1f} ms")
+
+
+class BuildScheduler(threading.Thread):
+    """Long-lived dispatcher that coalesces change events into rebuilds
+
+    Each deck has at most one build in flight and one pending. A deck is
+    dispatched to the bounded pool once it has been quiet for
+    debounce_time, in the order decks became pending, so a deck that keeps
+    changing cannot starve the others. The input is read at build time so
+    the latest save always wins.
+
+    Every change bumps the deck's generation. A build whose generation is
+    no longer current stops at its next stage boundary (before splitting,
+    formatting, writing, ...) and the deck is rebuilt. A change that
+    arrives during the last stage cannot stop it: that build completes
+    and is followed by another.
+    """
+    
+    def __init__(self, jobs: int = 1, debounce_time: float = 0.3):
+        super().__init__(name="marp-scheduler", daemon=True)
+        self.jobs = max(1, jobs)
+        self.debounce_time = debounce_time
+        self.decks = {}
+        self.pending = OrderedDict()
+        self.active = 0
+        self.condition = threading.Condition()
+        self.pool = ThreadPoolExecutor(max_workers=self.jobs,
+                                       thread_name_prefix="marp-build")
+        self._stopping = False
+    
+    def add_deck(self, deck: Deck):
+        with self.condition:
+            self.decks[deck.input_file] = deck
+    
+    def remove_deck(self, path):
+        with self.condition:
+            deck = self.decks.pop(os.path.abspath(path), None)
+            if deck is not None:
+                self.pending.pop(deck.input_file, None)
+    
+    def has_deck(self, path) -> bool:
+        return os.path.abspath(path) in self.decks
+    
+    def request_rebuild(self, path) -> bool:
+        """Mark the deck for path as changed (called from the observer thread)"""
+        with self.condition:
+            deck = self.decks.get(os.path.abspath(path))
+            if deck is None:
+                return False
+            deck.last_event = time.monotonic()
+            deck.generation += 1
+            if deck.input_file not in self.pending:
+                self.pending[deck.input_file] = deck
+            self.condition.notify()
+            return True
+    
+    def stop(self):
+        """Stop dispatching and wait for in-flight builds"""
+        with self.condition:
+            self._stopping = True
+            self.condition.notify()
+        self.join()
+        self.pool.shutdown(wait=True)
+    
+    def run(self):
+        with self.condition:
+            while not self._stopping:
+                timeout = self._dispatch_ready()
+                self.condition.wait(timeout)
+    
+    def _dispatch_ready(self):
+        """Submit quiet decks to the pool; return seconds until the next one is due"""
+        now = time.monotonic()
+        next_due = None
+        for key, deck in list(self.pending.items()):
+            if self.active >= self.jobs:
+                break
+            if deck.running:
+                continue
+            wait = deck.last_event + self.debounce_time - now
+            if wait > 0:
+                next_due = wait if next_due is None else min(next_due, wait)
+                continue
+            del self.pending[key]
+            deck.running = True
+            self.active += 1
+            self.pool.submit(self._build, deck, deck.generation)
+        return next_due
+    
+    def _build(self, deck: Deck, generation: int):
+        name = os.path.basename(deck.input_file)
+        print(f"\n🔄 '{name}' changed, regenerating slides...")
+        
+        def is_stale() -> bool:
+            with self.condition:
+                return deck.generation != generation
         
         try:
-            with open(self.input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            generator = SlideGenerator(self.output_dir, self.presentation_name)
-            num_pages = generator.generate_slides(content, self.theme)
-            
-            print(f"✓ Generated {num_pages} slides successfully")
-            print(f"  Output: {generator.output_dir}")
-            
+            summary = deck.build(is_stale)
+        except BuildSuperseded as e:
+            # The partial output is overwritten by the rebuild already queued
+            print(f"⏭  '{name}' superseded by a newer change before '{e}', rebuilding...")
         except Exception as e:
-            print(f"❌ Error generating slides: {e}")
+            print(f"❌ Error generating slides for '{name}': {e}")
+        else:
+            with self.condition:
+                superseded = deck.input_file in self.pending
+            if superseded:
+                # A newer change arrived during the last stage: this result
+                # is already stale and the deck is queued again
+                print(f"⏭  '{name}' changed again while finishing, rebuilding...")
+            else:
+                print(f"✓ {summary}")
+        finally:
+            with self.condition:
+                deck.running = False
+                self.active -= 1
+                self.condition.notify()
+
+
+class EventRouter:
+    """Minimal watchdog event handler
+
+    Observer only needs a dispatch(event) method, so handlers don't have to
+    subclass FileSystemEventHandler and watchdog is imported only once a
+    watch actually starts.
+    """
+    
+    def dispatch(self, event):
+        self.on_any_event(event)
+        method = getattr(self, f"on_{event.event_type}", None)
+        if method is not None:
+            method(event)
+    
+    def on_any_event(self, event):
+        pass
+
+
+class SlideChangeHandler(EventRouter):
+    """Routes file events to the deck they belong to"""
+    
+    def __init__(self, scheduler: BuildScheduler, deck_factory=None,
+                 pattern: str = '*.md', ignore_dir: str = None):
+        self.scheduler = scheduler
+        self.deck_factory = deck_factory
+        self.pattern = pattern
+        self.ignore_dir = os.path.realpath(ignore_dir) if ignore_dir else None
+    
+    def _is_source(self, path) -> bool:
+        if self.deck_factory is None:
+            return False
+        if self.ignore_dir and is_inside(path, self.ignore_dir):
+            return False
+        return fnmatch.fnmatch(os.path.basename(path), self.pattern)
+    
+    def _touch(self, path):
+        if not self.scheduler.has_deck(path) and self._is_source(path):
+            self.scheduler.add_deck(self.deck_factory(path))
+        self.scheduler.request_rebuild(path)
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
+    
+    def on_created(self, event):
+        self.on_modified(event)
+    
+    def on_moved(self, event):
+        # Editors that save atomically write a temp file and rename it over
+        # the original
+        if event.is_directory:
+            return
+        if self.deck_factory is not None:
+            self.scheduler.remove_deck(event.src_path)
+        self._touch(event.dest_path)
+    
+    def on_deleted(self, event):
+        if not event.is_directory and self.deck_factory is not None:
+            self.scheduler.remove_deck(event.src_path)
+
+
+class PresentationChangeHandler(EventRouter):
+    """Routes page.md edits and slide folder changes to a PresentationDeck"""
+    
+    def __init__(self, scheduler: BuildScheduler, deck: PresentationDeck):
+        self.scheduler = scheduler
+        self.deck = deck
+    
+    def _route(self, path, is_directory: bool, event_type: str):
+        from marp_slide_generator.deck_layout import CHAPTER_FOLDER
+        
+        try:
+            parts = Path(path).resolve().relative_to(self.deck.presentation_dir).parts
+        except ValueError:
+            return
+        if len(parts) == 1 or (len(parts) == 2 and CHAPTER_FOLDER.match(parts[0])):
+            # Slide folders (or chapters) added, removed or renamed; top-level
+            # files are our own master_slide.md and index.md
+            if not is_directory or event_type == 'modified':
+                return
+        elif len(parts) in (2, 3) and parts[-1] == 'page.md' and not is_directory:
+            self.deck.mark_changed(self.deck.presentation_dir.joinpath(*parts[:-1]))
+        else:
+            return
+        self.scheduler.request_rebuild(self.deck.input_file)
+    
+    def on_any_event(self, event):
+        if event.event_type not in ('modified', 'created', 'deleted', 'moved'):
+            return
+        self._route(event.src_path, event.is_directory, event.event_type)
+        if event.event_type == 'moved':
+            self._route(event.dest_path, event.is_directory, event.event_type)
+
+
+def _initial_build(deck) -> bool:
+    try:
+        summary = deck.build()
+    except Exception as e:
+        click.echo(f"Error generating slides from '{deck.input_file}': {e}", err=True)
+        return False
+    print(f"✓ {summary}")
+    return True
 
 
 @click.command()
-@click.option('--input', '-i', 'input_file', required=True,
-              help='Input file to watch')
+@click.option('--input', '-i', 'input_files', multiple=True,
+              help='Input file to watch (repeatable)')
+@click.option('--dir', '-d', 'watch_dir',
+              help='Directory of deck sources to watch recursively')
+@click.option('--presentation', '-p', 'presentation_dir',
+              help='Presentation directory whose page.md edits update master and index')
+@click.option('--pattern', default='*.md', show_default=True,
+              help='Filename pattern for deck sources in --dir')
+@click.option('--jobs', '-j', default=min(4, os.cpu_count() or 1), show_default=True,
+              help='Maximum number of decks built concurrently')
 @click.option('--output', '-o', 'output_dir', default='output',
               help='Output directory for generated slides')
 @click.option('--name', '-n', 'presentation_name',
-              help='Presentation name')
+              help='Presentation name (single --input only)')
 @click.option('--theme', '-t', default='default',
               type=click.Choice(['default', 'gaia', 'uncover'], case_sensitive=False),
               help='Marp theme to use')
-def main(input_file: str, output_dir: str, presentation_name: str, theme: str):
-    """Watch input file and regenerate slides on changes"""
+@click.option('--debounce', 'debounce_time', default=0.3, show_default=True,
+              help='Seconds of quiet after the last change before rebuilding')
+def main(input_files, watch_dir: str, presentation_dir: str, pattern: str, jobs: int,
+         output_dir: str, presentation_name: str, theme: str, debounce_time: float):
+    """Watch input files or a directory of decks and regenerate slides on changes"""
     
-    # Check if input file exists
-    if not os.path.exists(input_file):
-        click.echo(f"Error: Input file '{input_file}' not found.", err=True)
+    if presentation_dir:
+        if input_files or watch_dir:
+            click.echo("Error: --presentation cannot be combined with --input or --dir.", err=True)
+            return
+        watch_presentation(presentation_dir, theme, debounce_time)
         return
-        
-    # Initial generation
-    print(f"📝 Generating initial slides from '{input_file}'...")
     
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        generator = SlideGenerator(output_dir, presentation_name)
-        num_pages = generator.generate_slides(content, theme)
+    if not input_files and not watch_dir:
+        click.echo("Error: Provide --input, --dir or --presentation.", err=True)
+        return
+    if presentation_name and (watch_dir or len(input_files) > 1):
+        click.echo("Error: --name can only be used with a single --input.", err=True)
+        return
+    
+    # Check if input files exist
+    for input_file in input_files:
+        if not os.path.exists(input_file):
+            click.echo(f"Error: Input file '{input_file}' not found.", err=True)
+            return
+    if watch_dir and not os.path.isdir(watch_dir):
+        click.echo(f"Error: Directory '{watch_dir}' not found.", err=True)
+        return
+    
+    scheduler = BuildScheduler(jobs=jobs, debounce_time=debounce_time)
+    decks = []
+    
+    if len(input_files) == 1:
+        decks.append(Deck(input_files[0], output_dir, presentation_name, theme))
+    else:
+        # Several decks: name each after its file so titles cannot collide
+        for input_file in input_files:
+            decks.append(Deck(input_file, output_dir, Path(input_file).stem, theme))
+    
+    deck_factory = None
+    if watch_dir:
+        root = Path(watch_dir).resolve()
         
-        print(f"✓ Generated {num_pages} slides in '{generator.output_dir}'")
+        def deck_factory(path):
+            relative = Path(path).resolve().relative_to(root).with_suffix('')
+            return Deck(path, output_dir, relative.as_posix(), theme)
         
-    except Exception as e:
-        click.echo(f"Error generating slides: {e}", err=True)
+        # Real paths on both sides, as SlideChangeHandler compares them, so a
+        # symlinked output directory is never taken for an input
+        ignore = os.path.realpath(output_dir)
+        for path in sorted(root.rglob(pattern)):
+            if path.is_file() and not is_inside(path, ignore):
+                decks.append(deck_factory(str(path)))
+    
+    # Initial generation
+    print(f"📝 Generating initial slides for {len(decks)} deck(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(_initial_build, decks))
+    if input_files and not all(results[:len(input_files)]):
         return
-        
-    # Set up file watcher
-    event_handler = SlideChangeHandler(input_file, output_dir, presentation_name, theme)
+    
+    for deck in decks:
+        scheduler.add_deck(deck)
+    
+    # One observer for everything; builds run on the pool, not the observer thread
+    from watchdog.observers import Observer
+    event_handler = SlideChangeHandler(scheduler, deck_factory, pattern, ignore_dir=output_dir)
     observer = Observer()
-    observer.schedule(event_handler, path=os.path.dirname(input_file) or '.', recursive=False)
+    watched = set()
+    for input_file in input_files:
+        parent = os.path.dirname(os.path.abspath(input_file))
+        if parent not in watched:
+            watched.add(parent)
+            observer.schedule(event_handler, path=parent, recursive=False)
+    if watch_dir:
+        observer.schedule(event_handler, path=watch_dir, recursive=True)
     
-    print(f"\n👀 Watching '{input_file}' for changes...")
+    print(f"\n👀 Watching {len(decks)} deck(s) for changes with {scheduler.jobs} job(s)...")
+    _run(observer, scheduler)
+
+
+def watch_presentation(presentation_dir: str, theme: str, debounce_time: float):
+    """Keep master_slide.md and index.md in sync with edited slide folders"""
+    if not os.path.isdir(presentation_dir):
+        click.echo(f"Error: Presentation directory '{presentation_dir}' not found.", err=True)
+        return
+    
+    deck = PresentationDeck(presentation_dir, theme)
+    print(f"📝 Reading slides from '{presentation_dir}'...")
+    if not _initial_build(deck):
+        return
+    
+    from watchdog.observers import Observer
+    scheduler = BuildScheduler(jobs=1, debounce_time=debounce_time)
+    scheduler.add_deck(deck)
+    observer = Observer()
+    observer.schedule(PresentationChangeHandler(scheduler, deck),
+                      path=str(deck.presentation_dir), recursive=True)
+    
+    print(f"\n👀 Watching slide folders in '{presentation_dir}' for changes...")
+    _run(observer, scheduler)
+
+
+def _run(observer, scheduler: BuildScheduler):
     print("   Press Ctrl+C to stop")
     
+    scheduler.start()
     observer.start()
     try:
         while True:
@@ -104,7 +457,8 @@ def main(input_file: str, output_dir: str, presentation_name: str, theme: str):
         observer.stop()
         print("\n✋ Stopped watching")
     observer.join()
+    scheduler.stop()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file